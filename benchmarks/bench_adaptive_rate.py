@@ -0,0 +1,63 @@
+import time
+
+from benchmarks.stub_server import StubServer
+from scraping import http_cache, http_client
+from scraping.fetcher import ConcurrentFetcher
+from scraping.rate_limit import AdaptiveRateLimiter
+
+
+### Benchmark: fixed sleep vs unpaced vs adaptive (AIMD) pacing against a server that throttles above MAX_RATE
+### Run from the repository root: python -m benchmarks.bench_adaptive_rate
+
+LATENCY = 0.05  # Simulated per-request latency in seconds
+MAX_RATE = 10  # Requests per second the stub server accepts before answering 429
+N_REQUESTS = 300  # Detail pages fetched by the concurrent runs
+N_FIXED = 5  # Detail pages fetched with the fixed sleep (at 2s per request the full run would take minutes)
+FIXED_SLEEP = 2  # The sleep goodreads.py used between requests
+
+
+def fetch_status(url):
+    return http_client.get(url).status_code
+
+
+def run(label, stub, urls, fetch):
+    throttled_before = stub.throttled_count
+    start = time.perf_counter()
+    statuses = fetch(urls)
+    elapsed = time.perf_counter() - start
+    failed = sum(status != 200 for status in statuses)
+    print(f"{label}: {len(urls) / elapsed:.2f} pages/s, {stub.throttled_count - throttled_before} responses throttled (429), "
+          f"{failed} pages failed")
+
+
+def fetch_with_fixed_sleep(urls):
+    statuses = []
+    for i, url in enumerate(urls):
+        if i:
+            time.sleep(FIXED_SLEEP)
+        statuses.append(fetch_status(url))
+    return statuses
+
+
+def main():
+    http_cache.configure(enabled=False)  # Every run has to go to the stub server
+
+    with StubServer(latency=LATENCY, max_rate=MAX_RATE) as stub:
+        urls = [stub.base_url + f"/book/show/{book_id}" for book_id in range(1, N_REQUESTS + 1)]
+        fetcher = ConcurrentFetcher(max_workers=8, per_host=8)
+
+        run(f"fixed {FIXED_SLEEP}s sleep, sequential", stub, urls[:N_FIXED], fetch_with_fixed_sleep)
+        time.sleep(1)  # Let the server's rate window empty between runs
+
+        run("unpaced, 8 workers", stub, urls, lambda urls: fetcher.map(fetch_status, urls))
+        time.sleep(1)
+
+        scheduler = AdaptiveRateLimiter(start_rate=1.0, max_rate=2 * MAX_RATE, increase=0.2)
+        http_client.set_scheduler(scheduler)
+        run("adaptive (AIMD), 8 workers", stub, urls, lambda urls: fetcher.map(fetch_status, urls))
+        http_client.set_scheduler(None)
+        print(f"Adaptive limiter final rates: {scheduler.get_rates()}")
+
+
+if __name__ == "__main__":
+    main()
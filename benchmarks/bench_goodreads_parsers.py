@@ -0,0 +1,38 @@
+import time
+
+from benchmarks import goodreads_fixtures
+from goodreads import page_parsers
+from scraping import extract
+
+
+### Benchmark: pages/sec of each Goodreads parser backend on the fixture pages
+### (saved pages from benchmarks/fixtures/ when present, synthetic 100-row pages otherwise).
+### Every backend must return exactly the same output as the BeautifulSoup reference.
+### Run from the repository root: python -m benchmarks.bench_goodreads_parsers
+
+ROUNDS = 20  # Number of times each page is parsed per backend
+
+
+def bench(label, parse_func, page_content, backend):
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        result = parse_func(page_content, backend=backend)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<12} {backend:<11} {ROUNDS / elapsed:8.1f} pages/sec")
+    return result
+
+
+def main():
+    list_page = goodreads_fixtures.list_page(n_books=100)
+    book_page = goodreads_fixtures.book_page()
+
+    for label, parse_func, page_content in [('list page', page_parsers.parse_list_rows, list_page),
+                                            ('book page', page_parsers.parse_book_page, book_page)]:
+        reference = bench(label, parse_func, page_content, 'bs4')
+        for backend in extract.available_backends()[1:]:
+            result = bench(label, parse_func, page_content, backend)
+            assert result == reference, f"{backend} output differs from bs4 on the {label}"
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+import re
+import time
+
+from bs4 import BeautifulSoup
+
+from benchmarks import gurufocus_fixtures
+from investing import gf_page_parser
+from scraping import extract
+
+
+### Benchmark: per-ticker parse time of a GuruFocus summary page,
+### the original six separate searches (BeautifulSoup) vs the single-pass extractor with each backend.
+### Every backend must return the same data as the original code (scores converted to numbers).
+### Run from the repository root: python -m benchmarks.bench_gurufocus_parsers
+
+ROUNDS = 20  # Number of times the page is parsed per variant
+
+
+############# Reference: the original one-search-per-field extraction of investing/gf_analyze_ticker.py
+
+# General function to extract rank scores
+def extract_rank_score(soup, rank_name, identifier):
+    rank_section = soup.find('a', href=lambda href: href and identifier in href)
+
+    if rank_section:
+        score_div = rank_section.find_next('div', class_='indicator-progress-bar-header')
+
+        if score_div:
+            style_attr = score_div.div.get('style')
+            if style_attr:
+                score_percentage = style_attr.split('width:')[1].split('%')[0].strip()
+                score = int(float(score_percentage) / 10)
+                return f"{score}/10"
+
+    return f"{rank_name} score not found."
+
+
+def extract_gf_score(html_content):
+    # Regex pattern to find gf_score: followed by a number
+    pattern = r'gf_score:(\d+)'
+
+    # Search for the pattern in the HTML content
+    match = re.search(pattern, html_content)
+
+    if match:
+        gf = int(match.group(1))
+        return f"{gf}/100" # Return the score (first captured group) as a string (out of 100)
+    else:
+        return "GF Score not found."
+
+
+# Function to parse and extract other financial data from tables
+def extract_financial_data(soup):
+    financial_data = {}
+
+    # Extracting data from rows with financial metrics
+    rows = soup.find_all('tr', class_='stock-indicators-table-row')
+    for row in rows:
+        metric_name_tag = row.find('td', class_='t-caption p-v-sm semi-bold')
+        metric_value_tag = row.find('span', class_='p-l-sm')
+
+        if metric_name_tag and metric_value_tag:
+            metric_name = metric_name_tag.get_text(strip=True)
+            metric_value = metric_value_tag.get_text(strip=True)
+            financial_data[metric_name] = metric_value
+
+    return financial_data
+
+
+def _score_number(score_text):
+    # "8/10" -> 8, "... score not found." -> None
+    try:
+        return int(score_text.split('/')[0])
+    except ValueError:
+        return None
+
+
+def original_extraction(html_content):
+    soup = BeautifulSoup(html_content, 'html.parser')
+    main_scores = {
+        'financial_str': extract_rank_score(soup, "Financial Strength", 'rank-balancesheet'),
+        'profit': extract_rank_score(soup, "Profitability Rank", 'rank-profitability'),
+        'growth': extract_rank_score(soup, "Growth Rank", 'rank-growth'),
+        'gf_value': extract_rank_score(soup, "GF Value Rank", 'rank-gf-value'),
+        'momentum': extract_rank_score(soup, "Momentum Rank", 'rank-momentum'),
+        'GF_score': extract_gf_score(html_content),
+    }
+    all_data = extract_financial_data(soup)
+    return {key: _score_number(value) for key, value in main_scores.items()}, all_data
+
+
+def bench(label, parse_func, html_content):
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        result = parse_func(html_content)
+    per_ticker = (time.perf_counter() - start) / ROUNDS
+    print(f"{label:<32} {per_ticker * 1000:8.2f} ms/ticker")
+    return result, per_ticker
+
+
+def main():
+    html_content = gurufocus_fixtures.summary_page()
+    print(f"Page size: {len(html_content) / 1024:.0f} KB")
+
+    reference, reference_time = bench("original (6 searches, bs4)", original_extraction, html_content)
+    for backend in extract.available_backends():
+        result, per_ticker = bench(f"single pass ({backend})",
+                                   lambda page: gf_page_parser.parse_summary(page, backend=backend), html_content)
+        assert result == reference, f"{backend} output differs from the original extraction"
+        print(f"{'':<32} {reference_time / per_ticker:8.1f}x faster")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+import os
+import time
+from functools import partial
+
+from benchmarks import gurufocus_fixtures
+from benchmarks.stub_server import StubServer
+from investing import gf_page_parser
+from scraping import http_cache
+from scraping.pipeline import Pipeline
+from scraping.scraper import fetch_html
+
+
+### Benchmark: fetch + parse of GuruFocus-like summary pages (BeautifulSoup parsing, served with network latency),
+### fetching and parsing in strict alternation vs the staged Pipeline (fetch threads -> bounded queue ->
+### parser processes -> writer). Both must give the same results.
+### Run from the repository root: python -m benchmarks.bench_pipeline
+
+LATENCY = 0.1  # Simulated per-request latency in seconds
+N_PAGES = 40  # Summary pages fetched and parsed per run
+parse_page = partial(gf_page_parser.parse_summary, backend='bs4')  # Picklable, for the parser processes
+
+
+def alternating(urls):
+    # Fetch a page, parse it, then fetch the next one (the CPU waits for the network and the other way around)
+    return {url: parse_page(fetch_html(url)) for url in urls}
+
+
+def pipelined(urls):
+    results = {}
+    Pipeline(fetch_html, parse_page, results.__setitem__, fetch_workers=16, per_host=16, queue_size=16).run(urls)
+    return results
+
+
+def main():
+    http_cache.configure(enabled=False)  # Every page has to go to the stub server
+
+    with StubServer(latency=LATENCY, pages={'/summary/': gurufocus_fixtures.summary_page()}) as stub:
+        urls = [f"{stub.base_url}/summary/T{i}" for i in range(N_PAGES)]
+
+        start = time.perf_counter()
+        reference = alternating(urls)
+        alternating_time = time.perf_counter() - start
+        print(f"{'fetch, parse, fetch, parse, ...':<36} {N_PAGES / alternating_time:6.1f} pages/sec")
+
+        start = time.perf_counter()
+        results = pipelined(urls)
+        pipeline_time = time.perf_counter() - start
+        print(f"{f'pipeline ({os.cpu_count()} parser processes)':<36} {N_PAGES / pipeline_time:6.1f} pages/sec"
+              f"  ({alternating_time / pipeline_time:.1f}x)")
+
+    assert results == reference, "The pipeline results differ from the alternating run"
+
+
+if __name__ == "__main__":
+    main()
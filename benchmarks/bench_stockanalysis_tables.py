@@ -0,0 +1,54 @@
+import time
+
+import pandas as pd
+
+from benchmarks import stockanalysis_fixtures
+from investing import stockanalysis_tables
+from scraping import http_cache
+
+
+### Benchmark: stockanalysis table page -> DataFrame, the BeautifulSoup rows path vs table_to_df (the declarative
+### TABLE_SPEC). Both must give the same DataFrame (the rows path's market cap / price columns converted to numbers).
+### Run from the repository root: python -m benchmarks.bench_stockanalysis_tables
+
+ROUNDS = 5  # Number of times each page is converted per path
+
+
+def rows_to_df(headers, table_data):
+    headers, cleaned = stockanalysis_tables.clean_headers(headers)
+    df = pd.DataFrame(table_data, columns=headers)
+    for column in stockanalysis_tables.NUMERIC_COLUMNS:
+        if column in df.columns:
+            df[column] = stockanalysis_tables.to_numeric_column(df[column])
+    df.rename(columns={'Company Name': 'Company'}, inplace=True)
+    return df
+
+
+def bs4_table_to_df(html_content):
+    # The original path: BeautifulSoup rows -> list of lists -> DataFrame of strings
+    return rows_to_df(*stockanalysis_tables.parse_table_data(html_content))
+
+
+def bench(label, func, html_content):
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        result = func(html_content)
+    per_page = (time.perf_counter() - start) / ROUNDS
+    print(f"{label:<40} {per_page * 1000:9.1f} ms/page")
+    return result, per_page
+
+
+def main():
+    http_cache.configure(enabled=False)  # Parse every round (no memoized results)
+
+    pages = [('list page (3000 rows)', stockanalysis_fixtures.list_page()),
+             ('statement page', stockanalysis_fixtures.statement_page())]
+    for label, html_content in pages:
+        reference, reference_time = bench(f"{label}, bs4 rows", bs4_table_to_df, html_content)
+        result, fast_time = bench(f"{label}, spec", stockanalysis_tables.table_to_df, html_content)
+        pd.testing.assert_frame_equal(result, reference, check_dtype=False)
+        print(f"{'':<40} {reference_time / fast_time:9.1f}x faster")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+import time
+
+from bs4 import BeautifulSoup
+
+from benchmarks import weather_fixtures
+from scraping import extract, http_cache
+from weather import time_and_date, weather_page_parser
+
+
+### Benchmark: per-page parse time of a timeanddate.com weather page,
+### the original six separate searches (BeautifulSoup) vs the single-pass extractor with each backend.
+### Every backend must return the same record as the original code on every fixture page.
+### Run from the repository root: python -m benchmarks.bench_weather_parsers
+
+ROUNDS = 20  # Number of times each page is parsed per variant
+
+
+def original_extraction(html_content):
+    soup = BeautifulSoup(html_content, 'html.parser')
+    wind_speed, wind_direction = time_and_date.extract_wind_info(soup)
+    return {
+        'temperature': time_and_date.extract_temperature(soup),
+        'description': time_and_date.extract_weather_description(soup),
+        'feels_like': time_and_date.extract_feels_like(soup),
+        'forecast': time_and_date.extract_forecast(soup),
+        'wind_speed': wind_speed,
+        'wind_direction': wind_direction,
+        'humidity': time_and_date.extract_humidity(soup),
+    }
+
+
+def bench(label, parse_func, pages):
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        results = [parse_func(html_content) for _, html_content in pages]
+    per_page = (time.perf_counter() - start) / (ROUNDS * len(pages))
+    print(f"{label:<32} {per_page * 1000:8.2f} ms/page")
+    return results, per_page
+
+
+def main():
+    http_cache.configure(enabled=False)  # Parse every round (no memoized results)
+
+    pages = weather_fixtures.weather_pages()
+    print(f"{len(pages)} pages, {sum(len(page) for _, page in pages) / len(pages) / 1024:.0f} KB on average")
+
+    reference, reference_time = bench("original (6 searches, bs4)", original_extraction, pages)
+    for backend in extract.available_backends():
+        results, per_page = bench(f"single pass ({backend})",
+                                  lambda page: weather_page_parser.parse_weather(page, backend=backend), pages)
+        for (name, _), result, expected in zip(pages, results, reference):
+            assert result == expected, f"{backend} output differs from the original extraction on {name}"
+        print(f"{'':<32} {reference_time / per_page:8.1f}x faster")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+import os
+
+
+### Goodreads fixture pages for the benchmarks.
+### Saved Goodreads pages can be dropped into benchmarks/fixtures/ (goodreads_list.html, goodreads_book.html),
+### otherwise synthetic pages with the same markup as the real site are generated.
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+
+def _read_fixture(name):
+    path = os.path.join(FIXTURES_DIR, name)
+    if os.path.exists(path):
+        with open(path, encoding='utf-8') as f:
+            return f.read()
+    return None
+
+
+def make_list_page(n_books=100, first_book_id=1, n_pages=1):
+    """
+    Builds a Goodreads list page with n_books book rows.
+
+    Args:
+    - n_books (int): Number of book rows on the page.
+    - first_book_id (int): Goodreads book ID of the first row.
+    - n_pages (int): Number of pages of the list (adds a pagination block when more than 1).
+
+    Returns:
+    - str: The HTML content of the page.
+    """
+    rows = []
+    for i in range(n_books):
+        book_id = first_book_id + i
+        rating = 3.5 + (i % 15) / 10  # Ratings between 3.50 and 4.90
+        num_ratings = 1000 + 137 * i
+        rows.append(f"""
+<tr itemscope itemtype="http://schema.org/Book">
+  <td valign="top" class="number">{i + 1}</td>
+  <td width="100%" valign="top">
+    <a class="bookTitle" itemprop="url" href="/book/show/{book_id}-book-{book_id}">
+      <span itemprop="name" role="heading" aria-level="4">Book {book_id}</span>
+    </a>
+    <br/>
+    <span class="by">by</span>
+    <span itemprop="author" itemscope itemtype="http://schema.org/Person">
+      <div class="authorName__container">
+        <a class="authorName" itemprop="url" href="/author/show/{book_id}.Author"><span itemprop="name">Author {book_id}</span></a>
+      </div>
+    </span>
+    <br/>
+    <div>
+      <span class="greyText smallText uitext">
+        <span class="minirating"><span class="stars staticStars notranslate"></span> {rating:.2f} avg rating &mdash; {num_ratings:,} ratings</span>
+      </span>
+    </div>
+  </td>
+</tr>""")
+
+    pagination = ''
+    if n_pages > 1:
+        links = ' '.join(f'<a href="/list/show/1.Best_Fantasy?page={page}">{page}</a>' for page in range(2, n_pages + 1))
+        pagination = (f'<div class="pagination"><span class="previous_page disabled">&laquo; previous</span> '
+                      f'<em class="current">1</em> {links} '
+                      f'<a class="next_page" rel="next" href="/list/show/1.Best_Fantasy?page=2">next &raquo;</a></div>')
+
+    return f"""<!DOCTYPE html>
+<html><head><title>Best Fantasy</title></head>
+<body>
+<div class="mainContent">
+<table class="tableList js-dataTooltip">
+{''.join(rows)}
+</table>
+{pagination}
+</div>
+</body></html>"""
+
+
+def make_book_page(book_id=1):
+    """
+    Builds a Goodreads book detail page with a rating histogram.
+
+    Args:
+    - book_id (int): Goodreads book ID.
+
+    Returns:
+    - str: The HTML content of the page.
+    """
+    counts = [5000 + book_id, 3000, 1000, 300, 100]
+    bars = ''.join(
+        f'<div class="ratingGraph"><span class="bar"></span><span class="value">{count:,}</span></div>'
+        for count in counts
+    )
+    return f"""<!DOCTYPE html>
+<html><head><title>Book {book_id}</title></head>
+<body>
+<h1 id="bookTitle">Book {book_id}</h1>
+<div id="bookAuthors"><a class="authorName" href="/author/show/{book_id}"><span itemprop="name">Author {book_id}</span></a></div>
+<div id="reviewControls">{bars}</div>
+</body></html>"""
+
+
+def list_page(n_books=100, n_pages=1):
+    """
+    Returns the saved list fixture if there is one, a synthetic list page otherwise.
+    """
+    return _read_fixture('goodreads_list.html') or make_list_page(n_books, n_pages=n_pages)
+
+
+def book_page(book_id=1):
+    """
+    Returns the saved book fixture if there is one, a synthetic book page otherwise.
+    """
+    return _read_fixture('goodreads_book.html') or make_book_page(book_id)
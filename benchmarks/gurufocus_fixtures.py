@@ -0,0 +1,85 @@
+import os
+
+from investing import data_dict
+
+
+### GuruFocus fixture pages for the benchmarks.
+### A saved summary page can be dropped into benchmarks/fixtures/ (gurufocus_summary.html),
+### otherwise a synthetic page with the same markup as the real site is generated.
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+RANKS = [
+    ('Financial Strength', 'rank-balancesheet', 80),
+    ('Profitability Rank', 'rank-profitability', 90),
+    ('Growth Rank', 'rank-growth', 60),
+    ('GF Value Rank', 'rank-gf-value', 40),
+    ('Momentum Rank', 'rank-momentum', 70),
+]
+
+
+def _indicator_value(i):
+    # A mix of the value formats found on the site
+    formats = ['{:.2f}', '{:.1f}%', '{:,.0f}', '${:.2f}B', 'N/A']
+    value = 0.37 + i * 1.13
+    fmt = formats[i % len(formats)]
+    return fmt if fmt == 'N/A' else fmt.format(value)
+
+
+def make_summary_page(ticker='AAPL', gf_score=85, n_extra_indicators=150, n_nav_links=400):
+    """
+    Builds a GuruFocus summary page.
+
+    Args:
+    - ticker (str): The ticker in the links.
+    - gf_score (int): GF Score embedded in the page state script.
+    - n_extra_indicators (int): Indicator rows added after the data_dict ones.
+    - n_nav_links (int): Navigation links (the real pages have hundreds of links before the data).
+
+    Returns:
+    - str: The HTML content of the page.
+    """
+    nav = ''.join(f'<li><a href="/term/menu-{i}" class="nav-link">Menu item {i}</a></li>' for i in range(n_nav_links))
+
+    # Progress bars of other widgets come before the rank links, only the bar after each link is its rank
+    bars = ['<div class="indicator-progress-bar-header"><div style="width: 33%;" class="bar"></div></div>']
+    for label, identifier, width in RANKS:
+        bars.append(f"""
+<div class="flex flex-center">
+  <a href="/term/{identifier}/{ticker}" class="t-default">{label}</a>
+  <span class="t-caption">
+    <div class="indicator-progress-bar-header el-progress">
+      <div style="width: {width}%; background-color: #5fb65f;" class="el-progress-bar__inner"></div>
+    </div>
+  </span>
+</div>""")
+
+    names = [name for names in (data_dict.financial_data, data_dict.profitability_data) for name in names]
+    names += [f'Indicator {i}' for i in range(n_extra_indicators)]
+    rows = ''.join(f"""
+<tr class="stock-indicators-table-row">
+  <td class="t-caption p-v-sm semi-bold"><a href="/term/indicator-{i}/{ticker}" class="t-default">{name}</a></td>
+  <td class="t-caption p-v-sm"><span class="p-l-sm"> {_indicator_value(i)} </span></td>
+  <td class="t-caption p-v-sm"><div class="indicator-progress-bar"><div style="width: {i % 100}%;"></div></div></td>
+</tr>""" for i, name in enumerate(names))
+
+    state = ','.join(f'k{i}:{i}' for i in range(2000))
+    return f"""<!DOCTYPE html>
+<html><head><title>{ticker} summary</title></head>
+<body>
+<nav><ul>{nav}</ul></nav>
+<section class="stock-summary">{''.join(bars)}</section>
+<table class="stock-indicators-table"><tbody>{rows}</tbody></table>
+<script>window.__NUXT__={{data:[{{{state},gf_score:{gf_score},ticker:"{ticker}"}}]}}</script>
+</body></html>"""
+
+
+def summary_page(ticker='AAPL'):
+    """
+    Returns the saved GuruFocus summary page if there is one, a synthetic page otherwise.
+    """
+    path = os.path.join(FIXTURES_DIR, 'gurufocus_summary.html')
+    if os.path.exists(path):
+        with open(path, encoding='utf-8') as f:
+            return f.read()
+    return make_summary_page(ticker)
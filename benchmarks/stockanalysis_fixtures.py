@@ -0,0 +1,69 @@
+import os
+
+
+### stockanalysis.com fixture pages for the benchmarks.
+### Saved pages can be dropped into benchmarks/fixtures/ (stockanalysis_list.html, stockanalysis_statement.html),
+### otherwise synthetic pages with the same markup as the real site are generated.
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+
+def _read_fixture(name):
+    path = os.path.join(FIXTURES_DIR, name)
+    if os.path.exists(path):
+        with open(path, encoding='utf-8') as f:
+            return f.read()
+    return None
+
+
+def make_list_page(n_rows=3000):
+    """
+    Builds a stock list page (like the NYSE/NASDAQ lists) with n_rows companies.
+    """
+    rows = []
+    for i in range(n_rows):
+        market_cap = f"{(n_rows - i) * 1.37:,.2f}{'BMB'[i % 3]}"
+        change = f"{((i * 37) % 900 - 450) / 100:.2f}%"
+        revenue = '-' if i % 11 == 0 else f"{(i % 500) * 0.91:.2f}M"
+        rows.append(
+            f'<tr class="svelte-eurwtr"><td class="sym">{i + 1}</td>'
+            f'<td class="sym svelte-eurwtr"><a href="/stocks/t{i}/">T{i}</a></td>'
+            f'<td class="slw svelte-eurwtr">Company {i} Holdings Inc.</td>'
+            f'<td class="svelte-eurwtr">{market_cap}</td>'
+            f'<td class="svelte-eurwtr">{10 + (i % 4000) / 7:,.2f}</td>'
+            f'<td class="rg svelte-eurwtr">{change}</td>'
+            f'<td class="svelte-eurwtr">{revenue}</td></tr>'
+        )
+    headers = ''.join(f'<th class="svelte-1ro3niy"><div>{name}</div></th>'
+                      for name in ['No.', 'Symbol', 'Company Name', 'Market Cap', 'Stock Price', '% Change', 'Revenue'])
+    return f"""<!DOCTYPE html>
+<html><head><title>NYSE stocks</title></head>
+<body><main><div class="overflow-x-auto">
+<table class="symbol-table svelte-eurwtr"><thead><tr>{headers}</tr></thead>
+<tbody>{''.join(rows)}</tbody></table>
+</div></main></body></html>"""
+
+
+def make_statement_page(n_metrics=60, n_periods=10):
+    """
+    Builds a financial statement page (metric rows x fiscal year columns, with the 'Period Ending' header row).
+    """
+    years = ['TTM'] + [f'FY {2024 - i}' for i in range(n_periods - 1)]
+    period_ends = ['Sep 28, 2024'] + [f'Sep 30, {2024 - i}' for i in range(n_periods - 1)]
+    header_row = '<tr><th>Fiscal Year</th>' + ''.join(f'<th>{year}</th>' for year in years) + '</tr>'
+    period_row = '<tr><th>Period Ending</th>' + ''.join(f'<th>{end}</th>' for end in period_ends) + '</tr>'
+    rows = []
+    for m in range(n_metrics):
+        cells = ''.join(f'<td>{(m + 1) * (p + 3) * 101:,}</td>' for p in range(n_periods))
+        rows.append(f'<tr><td><a href="/metric/{m}">Metric {m}</a></td>{cells}</tr>')
+    return f"""<!DOCTYPE html>
+<html><body><table data-test="financials"><thead>{header_row}{period_row}</thead>
+<tbody>{''.join(rows)}</tbody></table></body></html>"""
+
+
+def list_page(n_rows=3000):
+    return _read_fixture('stockanalysis_list.html') or make_list_page(n_rows)
+
+
+def statement_page():
+    return _read_fixture('stockanalysis_statement.html') or make_statement_page()
@@ -0,0 +1,115 @@
+import re
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from benchmarks import goodreads_fixtures
+
+
+### Local HTTP stub that serves Goodreads-like pages, used to benchmark the scrapers without hitting the real site
+
+
+class StubServer:
+    """
+    Threaded local HTTP server serving list pages on /list/show/<id> and book pages on /book/show/<id>,
+    plus any extra pages given by path prefix.
+
+    Args:
+    - latency (float): Seconds to wait before answering each request (simulates network round trips).
+    - n_books (int): Number of books on each generated list page.
+    - n_pages (int): Number of pages advertised in the list pagination block.
+    - max_rate (float, optional): Simulated throttling: requests beyond max_rate per second get a 429 with Retry-After.
+    - retry_after (int): Seconds sent in the Retry-After header of throttled responses.
+    - port (int): Port to listen on (0 picks a free port).
+    - pages (dict, optional): Path prefix -> HTML content of other pages to serve (e.g. {'/summary/': html}).
+    """
+
+    def __init__(self, latency=0.2, n_books=100, n_pages=1, max_rate=None, retry_after=1, port=0, pages=None):
+        self.latency = latency
+        self.list_html = goodreads_fixtures.list_page(n_books, n_pages).encode('utf-8')
+        self.pages = {prefix: html.encode('utf-8') for prefix, html in (pages or {}).items()}
+        self.max_rate = max_rate
+        self.retry_after = retry_after
+        self.request_count = 0
+        self.throttled_count = 0
+        self._recent = deque()  # Times of the requests served in the last second
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(('127.0.0.1', port), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _make_handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'  # Keep-alive, like the real site
+
+            def do_GET(self):
+                if stub._throttle():
+                    self.send_response(429)
+                    self.send_header('Retry-After', str(stub.retry_after))
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                    return
+                time.sleep(stub.latency)
+
+                book_match = re.match(r'/book/show/(\d+)', self.path)
+                extra_page = next((html for prefix, html in stub.pages.items() if self.path.startswith(prefix)), None)
+                if extra_page is not None:
+                    body = extra_page
+                elif self.path.startswith('/list/show/'):
+                    body = stub.list_html
+                elif book_match:
+                    body = goodreads_fixtures.book_page(int(book_match.group(1))).encode('utf-8')
+                else:
+                    self.send_response(404)
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                    return
+
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/html; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass  # Keep the benchmark output clean
+
+        return Handler
+
+    def _throttle(self):
+        # Counts the request and tells whether it goes over max_rate requests in the last second
+        with self._lock:
+            self.request_count += 1
+            if self.max_rate is None:
+                return False
+            now = time.monotonic()
+            while self._recent and now - self._recent[0] > 1:
+                self._recent.popleft()
+            if len(self._recent) >= self.max_rate:
+                self.throttled_count += 1
+                return True
+            self._recent.append(now)
+            return False
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
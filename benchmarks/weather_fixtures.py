@@ -0,0 +1,95 @@
+import glob
+import os
+
+
+### timeanddate.com weather fixture pages for the benchmarks.
+### Saved weather pages can be dropped into benchmarks/fixtures/ (weather_*.html),
+### otherwise synthetic pages with the same markup as the real site are generated.
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+# (city, temperature, description, feels like, forecast high / low, wind speed, wind direction, humidity)
+CITIES = [
+    ('tel-aviv', 24, 'Passing clouds.', 25, (31, 22), 13, 'Northwest', 61),
+    ('petah-tikva', 23, 'Sunny.', 23, (32, 20), 9, 'West', 55),
+    ('reykjavik', -3, 'Light snow. Overcast.', -9, (0, -5), 31, 'North-northeast', 86),
+    ('singapore', 30, 'Scattered showers. Mostly cloudy.', 36, (32, 26), 0, 'South', 84),
+]
+
+
+def make_weather_page(city='tel-aviv', temperature=24, description='Passing clouds.', feels_like=25,
+                      forecast=(31, 22), wind_speed=13, wind_direction='Northwest', humidity=61,
+                      n_nav_links=300, n_hours=24, n_days=14):
+    """
+    Builds a timeanddate.com weather page.
+
+    Args:
+    - city (str): The city slug (last part of the URL).
+    - temperature, description, feels_like, forecast, wind_speed, wind_direction, humidity: The current weather.
+    - n_nav_links (int): Navigation links before the weather (the real pages have hundreds).
+    - n_hours (int): Rows of the hourly forecast table after the current weather.
+    - n_days (int): Rows of the daily forecast table.
+
+    Returns:
+    - str: The HTML content of the page.
+    """
+    nav = ''.join(f'<li class="site-nav__item"><a href="/menu/{i}/">Menu item {i}</a></li>' for i in range(n_nav_links))
+    hours = ''.join(f"""
+<tr><th>{h:02d}:00</th><td class="wt-ic"><img src="/img/wt/{h % 9}.png" alt="Clouds" title="Clouds"></td>
+<td>{temperature + (h % 5) - 2}&nbsp;°C</td><td class="small">Partly cloudy.</td><td>{feels_like + (h % 3)}&nbsp;°C</td>
+<td>{wind_speed + h % 4} km/h</td><td><span class="comp sa{h % 24}" title="Wind blowing from {h * 15}°">↑</span></td>
+<td>{humidity - h % 7}%</td></tr>""" for h in range(n_hours))
+    days = ''.join(f"""
+<tr><th>Day {d}<br><span class="smaller soft">Oct {d + 1}</span></th><td><img src="/img/wt/{d % 9}.png" title="Sunny"></td>
+<td>{forecast[0] + d % 3} / {forecast[1] - d % 2}&nbsp;°C</td><td class="small">Sunny.</td>
+<td>{wind_speed + d % 6} km/h</td><td>{humidity - d % 9}%</td></tr>""" for d in range(n_days))
+
+    return f"""<!DOCTYPE html>
+<html lang="en"><head><title>Weather for {city}</title>
+<script>var TAD={{"city":"{city}","units":"C"}};</script></head>
+<body>
+<header class="site-header"><nav><ul class="site-nav">{nav}</ul></nav></header>
+<main class="tpl-banner">
+<section class="bk-focus">
+<div id="qlook" class="bk-focus__qlook">
+<div class="h1">Now:</div>
+<img id="cur-weather" class="mtt" title="{description}" src="/img/wt/wt-1.svg">
+<div class="h2">{temperature}&nbsp;°C</div>
+<p>{description}</p>
+<br class="clear">
+<p>Feels Like: {feels_like}&nbsp;°C<br>Forecast: <span title="High and low forecasted temperature today">{forecast[0]} / {forecast[1]}&nbsp;°C</span><br>Wind: {wind_speed} km/h <span class="comp sa20" title="Wind blowing from 300°">↑</span> from {wind_direction}</p>
+</div>
+<div class="bk-focus__info">
+<table class="table table--left table--inner-borders-rows"><tbody>
+<tr><th>Location: </th><td>{city}</td></tr>
+<tr><th>Current Time: </th><td id="wtct">Oct 18, 2026, 2:12:01 pm</td></tr>
+<tr><th>Latest Report: </th><td>Oct 18, 2026, 1:50 pm</td></tr>
+<tr><th>Visibility: </th><td>10&nbsp;km</td></tr>
+<tr><th>Pressure: </th><td>1013 mbar</td></tr>
+<tr><th>Humidity: </th><td>{humidity}%</td></tr>
+<tr><th>Dew Point: </th><td>{temperature - 6}&nbsp;°C</td></tr>
+</tbody></table>
+</div>
+</section>
+<section><h2>Hour-by-Hour Forecast</h2><table id="wt-hbh" class="zebra tb-wt">{hours}</table></section>
+<section><h2>14 Day Forecast</h2><table id="wt-ext" class="zebra tb-wt">{days}</table></section>
+</main>
+<footer><p>© Time and Date AS 1995–2026</p></footer>
+</body></html>"""
+
+
+def weather_pages():
+    """
+    Returns the saved weather pages if there are any, synthetic pages of a few cities otherwise.
+
+    Returns:
+    - list of tuple: (name, html_content).
+    """
+    paths = sorted(glob.glob(os.path.join(FIXTURES_DIR, 'weather_*.html')))
+    if paths:
+        pages = []
+        for path in paths:
+            with open(path, encoding='utf-8') as f:
+                pages.append((os.path.basename(path), f.read()))
+        return pages
+    return [(city[0], make_weather_page(*city)) for city in CITIES]
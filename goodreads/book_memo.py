@@ -0,0 +1,130 @@
+import json
+import os
+import re
+import threading
+from concurrent.futures import Future
+
+
+### Memoization of book detail results keyed on the canonical Goodreads book ID (/book/show/<id>),
+### so a book that appears on several lists has its detail page fetched and parsed once per run.
+### Optionally the results are persisted to a JSON-lines file and reused by later runs.
+
+BOOK_ID_RE = re.compile(r'/book/show/(\d+)')
+
+
+def book_id_from_link(link):
+    """
+    Extracts the Goodreads book ID from a book link.
+
+    Args:
+    - link (str): A book URL or href (e.g., "/book/show/12345-the-name-of-the-wind").
+
+    Returns:
+    - str: The book ID ("12345"), or None if the link is not a book link.
+    """
+    match = BOOK_ID_RE.search(link)
+    return match.group(1) if match else None
+
+
+class BookDetailsMemo:
+    """
+    Thread-safe memo of book detail results. Concurrent requests for the same book share a single fetch.
+
+    Args:
+    - path (str, optional): JSON-lines file to persist results across runs (None keeps them in memory only).
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        self.fetches = 0  # Detail fetches actually made
+        self.fetches_saved = 0  # Detail fetches avoided thanks to the memo
+        self._results = {}  # book ID -> Future holding the result
+        self._lock = threading.Lock()
+        self._file = None
+        if path and os.path.exists(path):
+            self._load()
+
+    def _load(self):
+        with open(self.path, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue  # Partially written last line
+                future = Future()
+                future.set_result(tuple(entry['details']))
+                self._results[entry['id']] = future
+
+    def _persist(self, book_id, result):
+        with self._lock:
+            if self._file is None:
+                self._file = open(self.path, 'a', encoding='utf-8')
+            self._file.write(json.dumps({'id': book_id, 'details': result}) + '\n')
+            self._file.flush()
+
+    def peek(self, link):
+        """
+        Returns the memoized result of a book if it was already fetched, None otherwise (never waits or fetches).
+        Callers check the memo with peek first, so only the books it doesn't know go through the rate limits.
+        """
+        book_id = book_id_from_link(link)
+        if book_id is None:
+            return None
+        with self._lock:
+            future = self._results.get(book_id)
+            if future is None or not future.done():
+                return None  # Unknown, or still being fetched by another thread (get waits for it)
+            self.fetches_saved += 1
+        return future.result()
+
+    def get(self, link, fetch_func, cache_if=None):
+        """
+        Returns the details of a book, calling fetch_func(link) only the first time the book ID is seen.
+
+        Args:
+        - link (str): The book's detail page URL.
+        - fetch_func (callable): Function fetching the details from the link (e.g., fetch_book_details).
+        - cache_if (callable, optional): Predicate on the result; results for which it is False (failed fetches)
+          are not memoized, so the next request for the book tries again.
+
+        Returns:
+        - The result of fetch_func for this book.
+        """
+        book_id = book_id_from_link(link)
+        if book_id is None:
+            return fetch_func(link)  # Not a book link, nothing to key on
+
+        with self._lock:
+            future = self._results.get(book_id)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._results[book_id] = future
+                self.fetches += 1
+            else:
+                self.fetches_saved += 1
+
+        if not owner:
+            return future.result()  # Waits if another thread is still fetching this book
+
+        try:
+            result = fetch_func(link)
+        except BaseException as e:
+            with self._lock:
+                del self._results[book_id]
+            future.set_exception(e)
+            raise
+
+        if cache_if is not None and not cache_if(result):
+            with self._lock:
+                del self._results[book_id]
+        elif self.path:
+            self._persist(book_id, result)
+        future.set_result(result)
+        return result
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
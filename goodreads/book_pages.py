@@ -0,0 +1,108 @@
+from goodreads import minirating, page_parsers
+from scraping import http_cache
+from scraping.scraper import Scraper
+
+
+### List and book pages to book data, shared by all the goodreads scripts (each one only reshapes the result):
+### the list rows are filtered on their minirating, and the book pages give the rating distribution and author.
+
+SITE_URL = "https://www.goodreads.com"  # Book links of a list page are relative to it
+
+# A book is kept when its average rating is above MIN_RATING and it has more than MIN_NUM_RATINGS ratings
+MIN_RATING = 3.00
+MIN_NUM_RATINGS = 100
+
+STARS = ['5', '4', '3', '2', '1']  # The rating bars of a book page, top to bottom
+
+
+@http_cache.memoize_parse(params=lambda: (MIN_RATING, MIN_NUM_RATINGS))
+def filter_list_books(page_content, base_url=SITE_URL, max_books=None):
+    """
+    Extracts and filters book data (title, author, rating, number of ratings and detail page link)
+    from a Goodreads list page.
+
+    Args:
+    - page_content (str): The HTML content of the page.
+    - base_url (str): Site root the detail page links are built from.
+    - max_books (int, optional): Only process the first max_books books on the page (None for all of them).
+
+    Returns:
+    - list of dict: The books with a rating above MIN_RATING and more than MIN_NUM_RATINGS ratings
+      (title, author, rating, num_ratings, link), in page order.
+    """
+    books = page_parsers.parse_list_rows(page_content)  # Parse all book rows on the page
+    if max_books is not None:
+        books = books[:max_books]
+
+    # Parse the minirating texts of all rows at once (e.g., "4.00 avg rating — 10,000 ratings")
+    book_ratings = minirating.parse_miniratings([book['rating_text'] for book in books])
+
+    filtered_books = []
+    for book, book_rating in zip(books, book_ratings):
+        if book['title'] is None or book_rating is None or book_rating.num_ratings is None:
+            continue  # Skip rows without a title, a valid rating or a valid number of ratings
+        if book_rating.avg_rating > MIN_RATING and book_rating.num_ratings > MIN_NUM_RATINGS:
+            filtered_books.append({
+                'title': book['title'],
+                'author': book['author'] if book['author'] is not None else "Unknown",
+                'rating': book_rating.avg_rating,
+                'num_ratings': book_rating.num_ratings,
+                'link': base_url + book['href'],
+            })
+    return filtered_books
+
+
+def parse_rating_distribution(rating_counts):
+    """
+    Maps the rating bar counts of a book page, top (5 stars) to bottom, to their star rating.
+
+    Args:
+    - rating_counts (list of str): The count text of each bar (e.g., "12,345"), None or non-numeric texts are skipped.
+
+    Returns:
+    - dict: Number of ratings for each star rating ('5' to '1', 0 when missing).
+    """
+    rating_distribution = dict.fromkeys(STARS, 0)
+    for star_rating, rating_count in zip(STARS, rating_counts):
+        rating_count = (rating_count or '').replace(',', '')
+        if rating_count.isdigit():
+            rating_distribution[star_rating] = int(rating_count)
+    return rating_distribution
+
+
+@http_cache.memoize_parse
+def parse_book_details(page_content):
+    """
+    Extracts the rating distribution and author name from the HTML content of a book's detail page.
+    The distribution is read from the rating graph, or from the static star counts on older page layouts.
+
+    Args:
+    - page_content (str): The HTML content of the page.
+
+    Returns:
+    - dict: A dictionary of rating distribution (number of ratings for each star rating).
+    - str: The author's name ("Unknown" when not found).
+    """
+    page = page_parsers.parse_book_page(page_content)  # Parse the rating bars and author name
+    rating_counts = page['rating_graph_values'] or page['static_stars_values']
+    author_name = page['author'] if page['author'] is not None else "Unknown"
+    return parse_rating_distribution(rating_counts), author_name
+
+
+# Book detail pages go through the shared HTTP cache and are parsed with parse_book_details
+detail_pages = Scraper(parse_book_details)
+
+
+def fetch_book_details(book_url):
+    """
+    Fetches the rating distribution and author name of a book from its detail page.
+
+    Args:
+    - book_url (str): The URL of the book's detail page.
+
+    Returns:
+    - tuple: The rating distribution and the author's name (an empty dict and "Unknown" if the page could not
+      be fetched).
+    """
+    details = detail_pages.scrape_url(book_url)
+    return details if details is not None else ({}, "Unknown")
@@ -0,0 +1,124 @@
+import csv
+import os
+
+
+### Streaming sink for scraped books: records are appended as each page arrives and flushed every batch_size rows,
+### so a crash keeps everything written so far and memory stays flat however long the lists are.
+### Titles are deduplicated on the fly with a seen-set (instead of drop_duplicates on the full DataFrame).
+### The output format follows the file extension: .csv, or .parquet (row group per batch, needs pyarrow).
+
+
+class BookSink:
+    """
+    Incremental CSV/Parquet writer with on-the-fly deduplication.
+
+    Args:
+    - path (str): Output file (.csv or .parquet).
+    - dedupe_key (str, optional): Column used to drop duplicates (None to keep every record).
+    - batch_size (int): Number of buffered records that triggers a flush (a Parquet row group).
+    - append (bool): Append to an existing CSV instead of overwriting it (its keys are loaded into the seen-set).
+    """
+
+    def __init__(self, path, dedupe_key='title', batch_size=500, append=False):
+        self.path = path
+        self.dedupe_key = dedupe_key
+        self.batch_size = batch_size
+        self.format = 'parquet' if path.endswith('.parquet') else 'csv'
+        self.count = 0  # Number of unique records written (or buffered)
+        self.duplicates = 0  # Number of records dropped as duplicates
+
+        self._buffer = []
+        self._seen = set()
+        self._csv_file = None
+        self._csv_writer = None
+        self._parquet_writer = None
+
+        if append and self.format == 'parquet':
+            raise ValueError("Parquet files can't be appended to, write to a new file instead")
+        if append and os.path.exists(path):
+            self._load_existing()
+        elif os.path.exists(path):
+            os.remove(path)  # Start a fresh file, like DataFrame.to_csv would
+
+    def _load_existing(self):
+        # Resume an existing CSV: keep its header and remember the keys that were already written
+        with open(self.path, newline='', encoding='utf-8') as f:
+            reader = csv.DictReader(f)
+            for row in reader:
+                self.count += 1
+                if self.dedupe_key:
+                    self._seen.add(row[self.dedupe_key])
+            fieldnames = reader.fieldnames
+
+        if fieldnames:
+            self._csv_file = open(self.path, 'a', newline='', encoding='utf-8')
+            self._csv_writer = csv.DictWriter(self._csv_file, fieldnames=fieldnames)
+
+    def write(self, records):
+        """
+        Adds records (dicts) to the sink, skipping the ones whose dedupe_key was already seen.
+
+        Args:
+        - records (list of dict): The records of one page.
+        """
+        for record in records:
+            if self.dedupe_key:
+                key = record[self.dedupe_key]
+                if key in self._seen:
+                    self.duplicates += 1
+                    continue
+                self._seen.add(key)
+            self._buffer.append(record)
+            self.count += 1
+
+            if len(self._buffer) >= self.batch_size:
+                self.flush()
+
+    def flush(self):
+        """
+        Writes the buffered records to the file.
+        """
+        if not self._buffer:
+            return
+        if self.format == 'parquet':
+            self._flush_parquet()
+        else:
+            self._flush_csv()
+        self._buffer = []
+
+    def _flush_csv(self):
+        if self._csv_writer is None:
+            self._csv_file = open(self.path, 'w', newline='', encoding='utf-8')
+            self._csv_writer = csv.DictWriter(self._csv_file, fieldnames=list(self._buffer[0].keys()))
+            self._csv_writer.writeheader()
+        self._csv_writer.writerows(self._buffer)
+        self._csv_file.flush()
+
+    def _flush_parquet(self):
+        import pyarrow as pa  # pip install pyarrow
+        import pyarrow.parquet as pq
+
+        if self._parquet_writer is None:
+            table = pa.Table.from_pylist(self._buffer)
+            self._parquet_writer = pq.ParquetWriter(self.path, table.schema)
+        else:
+            table = pa.Table.from_pylist(self._buffer, schema=self._parquet_writer.schema)
+        self._parquet_writer.write_table(table)  # One row group per batch
+
+    def close(self):
+        """
+        Flushes the remaining records and closes the file.
+        """
+        self.flush()
+        if self._csv_file is not None:
+            self._csv_file.close()
+            self._csv_file = None
+        if self._parquet_writer is not None:
+            self._parquet_writer.close()
+            self._parquet_writer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,92 @@
+import json
+import os
+
+
+### Append-only checkpoint journal for multi-list Goodreads crawls.
+### Every finished unit of work is one JSON line: the page count of a list, a finished (list, page)
+### and a finished book detail link. A restarted run loads the journal and skips what is already done.
+### A line cut short by a crash is ignored, so at worst the last unit is redone.
+
+
+class CrawlCheckpoint:
+    """
+    Journal of completed (list, page) and book-link units.
+
+    Args:
+    - path (str): Path of the journal file (JSON lines, created on first write).
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._page_counts = {}
+        self._done_pages = set()
+        self._done_books = set()
+        self._load()
+        self._file = None
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue  # Partially written last line
+                if entry['type'] == 'list':
+                    self._page_counts[entry['list']] = entry['pages']
+                elif entry['type'] == 'page':
+                    self._done_pages.add((entry['list'], entry['page']))
+                elif entry['type'] == 'book':
+                    self._done_books.add(entry['link'])
+
+    def _append(self, entries):
+        if self._file is None:
+            self._file = open(self.path, 'a', encoding='utf-8')
+        self._file.writelines(json.dumps(entry) + '\n' for entry in entries)
+        self._file.flush()
+
+    @property
+    def resumed(self):
+        """
+        True if the journal already had finished work in it (the run is a restart).
+        """
+        return bool(self._page_counts or self._done_pages or self._done_books)
+
+    def get_page_count(self, list_url):
+        return self._page_counts.get(list_url)
+
+    def set_page_count(self, list_url, page_count):
+        self._page_counts[list_url] = page_count
+        self._append([{'type': 'list', 'list': list_url, 'pages': page_count}])
+
+    def is_page_done(self, list_url, page_num):
+        return (list_url, page_num) in self._done_pages
+
+    def mark_page_done(self, list_url, page_num):
+        self._done_pages.add((list_url, page_num))
+        self._append([{'type': 'page', 'list': list_url, 'page': page_num}])
+
+    def is_book_done(self, link):
+        return link in self._done_books
+
+    def mark_books_done(self, links):
+        links = [link for link in links if link not in self._done_books]
+        self._done_books.update(links)
+        self._append([{'type': 'book', 'link': link} for link in links])
+
+    def clear(self):
+        """
+        Deletes the journal (called once a run finishes, so the next run starts from scratch).
+        """
+        self.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
+        self._page_counts.clear()
+        self._done_pages.clear()
+        self._done_books.clear()
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
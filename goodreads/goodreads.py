@@ -1,9 +1,13 @@
 import requests
-from bs4 import BeautifulSoup
 import pandas as pd
-import time
 import re  # Import regex module for text processing
 
+from goodreads import book_pages
+from goodreads.book_sink import BookSink
+from goodreads.crawl_checkpoint import CrawlCheckpoint
+from scraping import http_cache, http_client
+from scraping.rate_limit import AdaptiveRateLimiter
+
 
 # List of Goodreads URLs to check and scrape
 urls = [
@@ -19,35 +23,23 @@ urls = [
     # "https://www.goodreads.com/list/show/50" # The Best Epic Fantasy (fiction)
 ]
 
-# Set up headers to mimic a browser request to avoid blocking
-headers = {
-    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-}
-
+# Output file (.csv, or .parquet for row-group batched Parquet) and number of books buffered before each write
+OUTPUT_FILE = 'filtered_fantasy_books.csv'
+SINK_BATCH_SIZE = 500
 
-def check_valid_url(url):
-    """
-    Checks if a given URL is valid by making an HTTP GET request.
+# Journal of finished pages, kept until a run completes so an interrupted run can resume
+CHECKPOINT_FILE = 'filtered_fantasy_books.checkpoint.jsonl'
 
-    Args:
-    - url (str): The URL to check.
-
-    Returns:
-    - bool: True if the URL returns a status code of 200 (OK), False otherwise.
-    """
-    try:
-        response = requests.get(url, headers=headers)
-        return response.status_code == 200  # Return True if status code is 200
-    except requests.exceptions.RequestException as e:
-        print(f"Failed to reach the URL: {url}")
-        print(f"Error: {e}")
-        return False  # Return False if there was an exception
+# Pagination block of a list page and the page numbers linked from it (e.g. "?page=2")
+PAGINATION_RE = re.compile(r'<div[^>]*class="pagination"[^>]*>.*?</div>', re.DOTALL)
+PAGE_PARAM_RE = re.compile(r'[?&](?:amp;)?page=(\d+)')
 
 
 # Function to fetch books from a page, apply filtering, and return a list of filtered books with their authors
 def fetch_books_from_page(page_content):
     """
-    Extracts and filters book data (title, rating, number of ratings, author) from a Goodreads list page.
+    Extracts and filters book data (title, rating, number of ratings, author) from a Goodreads list page
+    (see book_pages.filter_list_books: rating > 3.00 and more than 100 ratings).
 
     Args:
     - page_content (str): The HTML content of the page.
@@ -55,121 +47,138 @@ def fetch_books_from_page(page_content):
     Returns:
     - tuple: Four lists containing filtered book titles, ratings, number of ratings, and authors.
     """
-    # Parse the HTML content with BeautifulSoup
-    soup = BeautifulSoup(page_content, 'html.parser')
-
-    # Lists to hold the filtered data from this page
-    titles = []
-    ratings = []
-    num_ratings_list = []
-    authors = []
-
-    # Find all book containers on the page
-    books = soup.find_all('tr', itemtype='http://schema.org/Book')
-
-    # Iterate over each book found on the page
-    for book in books:
-        # Extract the book title from the <a> tag with the class 'bookTitle'
-        title_tag = book.find('a', class_='bookTitle')
-        title = title_tag.get_text(strip=True)  # Remove any leading/trailing whitespace from the title
-
-        # Extract the rating and number of ratings from the <span> tag with the class 'minirating'
-        rating_tag = book.find('span', class_='minirating')
-        rating_text = rating_tag.get_text(
-            strip=True)  # Get the full rating text (e.g., "4.00 avg rating — 10,000 ratings")
-
-        # Use regex to extract the numeric rating from the text (e.g., "4.00")
-        rating_match = re.search(r"(\d+\.\d+)", rating_text)  # Look for patterns like "4.00", "3.75", etc.
-        if rating_match:
-            rating = float(rating_match.group(1))  # Convert the matched rating string to a float
-        else:
-            continue  # If no valid rating is found, skip this book and move to the next one
-
-        # Use regex to extract the number of ratings from the text (e.g., "10,000 ratings")
-        num_ratings_match = re.search(r"(\d+(?:,\d+)*) ratings", rating_text)  # Look for patterns like "1,234 ratings"
-        if num_ratings_match:
-            num_ratings = int(num_ratings_match.group(1).replace(",", ""))  # Remove commas and convert to integer
-        else:
-            continue  # If no valid number of ratings is found, skip this book and move to the next one
-
-        # Extract the author name from the <a> tag with the class 'authorName'
-        author_tag = book.find('a', class_='authorName')
-        if author_tag:
-            author = author_tag.get_text(strip=True)  # Remove any leading/trailing whitespace from the author name
-        else:
-            author = "Unknown"  # Default to "Unknown" if no author name is found
-
-        # Apply the filtering conditions: rating > 3.00 and more than 100 ratings
-        if rating > 3.00 and num_ratings > 100:
-            titles.append(title)  # Add the title to the list
-            ratings.append(rating)  # Add the rating to the list
-            num_ratings_list.append(num_ratings)  # Add the number of ratings to the list
-            authors.append(author)  # Add the author to the list
-
+    page_books = book_pages.filter_list_books(page_content)
+    titles = [book['title'] for book in page_books]
+    ratings = [book['rating'] for book in page_books]
+    num_ratings_list = [book['num_ratings'] for book in page_books]
+    authors = [book['author'] for book in page_books]
     return titles, ratings, num_ratings_list, authors
 
 
-# Lists to hold the filtered data from all pages
-all_titles = []
-all_ratings = []
-all_number_of_ratings = []
-all_authors = []
-
-# Loop through each URL, check if it's valid, and scrape the data if it is
-for base_url in urls:
-    if not check_valid_url(base_url):
-        print(f"Skipping invalid URL: {base_url}")
-        continue
-
-    page_num = 1  # Start with the first page of each list
-    while True:
-        print(f"Fetching page {page_num} from {base_url}...")
-        # Make the request to fetch the current page of books
-        response = requests.get(base_url + f"?page={page_num}", headers=headers)
+def parse_page_count(page_content):
+    """
+    Reads the number of pages of a Goodreads list from the pagination links of one of its pages.
 
-        # Check if the request was successful (status code 200)
-        if response.status_code != 200:
-            print(f"Error fetching the page: {response.status_code}")
-            break  # Exit the loop if the request fails
+    Args:
+    - page_content (str): The HTML content of a list page.
 
-        # Fetch and filter books from the current page
-        titles, ratings, num_ratings_list, authors = fetch_books_from_page(response.text)
+    Returns:
+    - int: The highest page number linked from the pagination block (1 if the list has a single page).
+    """
+    # Only the small pagination block is searched, so the page is not parsed a second time
+    pagination = PAGINATION_RE.search(page_content)
+    if not pagination:
+        return 1
 
-        # If no books were found on the current page, exit the loop
-        if not titles:
-            print(f"No more books found on page {page_num}. Moving to next URL.")
-            break
+    page_numbers = [int(page) for page in PAGE_PARAM_RE.findall(pagination.group(0))]
+    return max(page_numbers + [1])
 
-        # Append the filtered data from this page to the overall lists
-        all_titles.extend(titles)
-        all_ratings.extend(ratings)
-        all_number_of_ratings.extend(num_ratings_list)
-        all_authors.extend(authors)
 
-        # Move to the next page
-        page_num += 1
+def iter_list_pages(base_url, checkpoint=None, failed=None):
+    """
+    Iterates over all pages of a Goodreads list.
+    The first page fetch also validates the list, and its pagination links give the number of pages,
+    so the remaining pages are known up front instead of probing until an empty page.
 
-        # Sleep for 2 seconds between requests to avoid overwhelming the server and reduce the risk of being blocked
-        time.sleep(2)
+    Args:
+    - base_url (str): The base URL of the Goodreads list.
+    - checkpoint (CrawlCheckpoint, optional): Journal of a previous run; pages it marks as done are not fetched again.
+    - failed (list, optional): Collects the (list, page) pairs that could not be fetched. A failed page is
+      skipped and the next one is fetched; if the first page fails, the page count is unknown and the list stops.
 
-# After scraping all pages, create a DataFrame to store the filtered data
-data = {
-    'Title': all_titles,
-    'Author': all_authors,
-    'Rating': all_ratings,
-    'Number of Ratings': all_number_of_ratings
-}
-df = pd.DataFrame(data)  # Convert the data into a Pandas DataFrame
+    Yields:
+    - tuple: The page number and the HTML content of the page.
+    """
+    page_count = checkpoint.get_page_count(base_url) if checkpoint else None  # Known when resuming a list
+    page_num = 1
+    while page_count is None or page_num <= page_count:
+        if checkpoint and checkpoint.is_page_done(base_url, page_num):
+            page_num += 1  # Finished in a previous run
+            continue
 
-# Remove duplicates by title to ensure there are no duplicate entries
-df.drop_duplicates(subset='Title', inplace=True)
+        print(f"Fetching page {page_num} from {base_url}...")
+        page_url = base_url + f"?page={page_num}"
+        try:
+            response = http_cache.get(page_url)
+        except requests.exceptions.RequestException as e:
+            print(f"Failed to reach the URL: {page_url}")
+            print(f"Error: {e}")
+            response = None
 
-# Save the filtered and deduplicated data to a CSV file for further analysis or review
-df.to_csv('filtered_fantasy_books.csv', index=False)
-print("Data saved to filtered_fantasy_books.csv")
+        # Check if the request was successful (status code 200)
+        if response is None or response.status_code != 200:
+            if response is not None and page_count is None and response.status_code == 404:
+                print(f"Skipping invalid URL: {base_url}")
+                return
+            if response is not None:
+                print(f"Error fetching the page: {response.status_code}")
+            if failed is not None:
+                failed.append((base_url, page_num))
+            if page_count is None:
+                return
+            page_num += 1  # Left for the next run (the page is not marked as done)
+            continue
+
+        if page_count is None:
+            # Schedule the remaining pages of the list
+            page_count = parse_page_count(response.text)
+            if checkpoint:
+                checkpoint.set_page_count(base_url, page_count)
+
+        yield page_num, response.text
+        page_num += 1
 
-# Display the first few rows of the DataFrame to verify the data
-print(df.head())
 
-# Print the total number of books that met the filtering criteria
-print(f"Total number of unique books found: {len(df)}")
\ No newline at end of file
+def main():
+    """
+    Scrapes every page of every list in urls and streams the filtered books to OUTPUT_FILE.
+    """
+    # Requests to goodreads.com start at one every 2 seconds and speed up while the site answers normally,
+    # backing off automatically on 429/503 (and waiting for Retry-After when the site sends it)
+    scheduler = AdaptiveRateLimiter(start_rate=0.5, min_rate=0.1, max_rate=5.0, increase=0.1, decrease_factor=0.5)
+    http_client.set_scheduler(scheduler)
+
+    # Journal of finished pages: a restarted run skips them and appends to the existing output file
+    checkpoint = CrawlCheckpoint(CHECKPOINT_FILE)
+    if checkpoint.resumed:
+        print(f"Resuming the previous run from {CHECKPOINT_FILE}")
+
+    # Stream the filtered books to the CSV file page by page (duplicate titles are dropped as they arrive)
+    failed_pages = []
+    with BookSink(OUTPUT_FILE, dedupe_key='Title', batch_size=SINK_BATCH_SIZE, append=checkpoint.resumed) as sink:
+        # Loop through each URL and scrape all of its pages (invalid lists are skipped by iter_list_pages)
+        for base_url in urls:
+            for page_num, page_content in iter_list_pages(base_url, checkpoint, failed_pages):
+                # Fetch and filter books from the current page
+                titles, ratings, num_ratings_list, authors = fetch_books_from_page(page_content)
+
+                # Append the filtered data from this page to the output file
+                sink.write([
+                    {'Title': title, 'Author': author, 'Rating': rating, 'Number of Ratings': num_ratings}
+                    for title, rating, num_ratings, author in zip(titles, ratings, num_ratings_list, authors)
+                ])
+
+                # The page only counts as done once its books are on disk
+                sink.flush()
+                checkpoint.mark_page_done(base_url, page_num)
+
+    if failed_pages:
+        print(f"{len(failed_pages)} pages could not be fetched, keeping {CHECKPOINT_FILE} - run again to retry them")
+    else:
+        checkpoint.clear()  # The run is complete, the next one starts from scratch
+
+    print(f"Data saved to {OUTPUT_FILE}")
+
+    # Display the first few rows of the file to verify the data
+    if sink.count:
+        print(pd.read_parquet(OUTPUT_FILE).head() if OUTPUT_FILE.endswith('.parquet') else pd.read_csv(OUTPUT_FILE, nrows=5))
+
+    # Print the total number of books that met the filtering criteria
+    print(f"Total number of unique books found: {sink.count}")
+    http_client.print_stats()
+    http_cache.print_stats()
+    print(f"Throttled responses: {scheduler.throttled} - final request rates: {scheduler.get_rates()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,12 @@
 import requests
-from bs4 import BeautifulSoup
-import pandas as pd
-import re
+
+from goodreads import book_pages
+from goodreads.book_memo import BookDetailsMemo
+from goodreads.book_sink import BookSink
+from goodreads.crawl_checkpoint import CrawlCheckpoint
+from scraping import http_cache, http_client
+from scraping.fetcher import ConcurrentFetcher
+from scraping.scraper import fetch_html
 
 urls = [
     "https://www.goodreads.com/list/show/146629", # Best Fantasy of the 2020s
@@ -15,15 +20,32 @@ urls = [
     # "https://www.goodreads.com/list/show/51", # The Best Urban Fantasy
     # "https://www.goodreads.com/list/show/50" # The Best Epic Fantasy (fiction)
 ]
-# Set up headers to mimic a browser request to avoid blocking
-headers = {
-    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-}
+# Site root used to build book detail links (can be pointed at a local stub server for benchmarking)
+BASE_URL = "https://www.goodreads.com"
+
+# Concurrency settings for fetching book detail pages
+MAX_WORKERS = 16  # Total number of detail pages fetched in parallel
+PER_HOST_LIMIT = 8  # Maximum number of requests in flight to goodreads.com at once
+REQUESTS_PER_SECOND = 5  # Token-bucket rate limit per host (None to disable)
+BURST = 5  # Number of requests allowed to go out back-to-back
+
+# Output file (.csv or .parquet) and number of books buffered before each write
+OUTPUT_FILE = 'filtered_first_5_books_with_ratings_and_authors.csv'
+SINK_BATCH_SIZE = 500
+
+# Journal of finished work, kept until a run completes so an interrupted run can resume
+CHECKPOINT_FILE = 'filtered_first_5_books_with_ratings_and_authors.checkpoint.jsonl'
+CHECKPOINT_CHUNK = 20  # Books written and marked as done together
+
+# Book details are memoized on the Goodreads book ID, so a book on several lists is fetched once per run.
+# Set a file path to also reuse the details across runs.
+BOOK_MEMO_FILE = None
+book_details_memo = BookDetailsMemo(BOOK_MEMO_FILE)
 
 
 def fetch_page_content(url):
     """
-    Fetches the content of a webpage.
+    Fetches the content of a webpage (through the shared HTTP cache, see scraping.scraper.fetch_html).
 
     Args:
     - url (str): The URL of the page to fetch.
@@ -32,150 +54,118 @@ def fetch_page_content(url):
     - str: The HTML content of the page if successful, None otherwise.
     """
     try:
-        response = requests.get(url, headers=headers)
-        if response.status_code == 200:
-            return response.text  # Return the HTML content if the request is successful
-        else:
-            print(f"Error fetching page content: {response.status_code}")
-            return None  # Return None if the request fails
+        return fetch_html(url)  # None if the request fails
     except requests.exceptions.RequestException as e:
         print(f"Failed to fetch page content: {e}")
         return None  # Handle any network-related exceptions and return None
 
 
-def fetch_books_from_page(page_content):
+def fetch_books_from_page(page_content, max_books=5):
     """
     Extracts and filters book data (title, rating, number of ratings, author, and detail page link)
-    from a Goodreads list page.
+    from a Goodreads list page (see book_pages.filter_list_books), with the links built from BASE_URL.
 
     Args:
     - page_content (str): The HTML content of the page.
+    - max_books (int, optional): Only process the first max_books books on the page (None for all of them).
 
     Returns:
     - list of dict: A list of dictionaries containing the book data (title, rating, number of ratings, author, link).
     """
-    soup = BeautifulSoup(page_content, 'html.parser')  # Parse the page content using BeautifulSoup
-    books = soup.find_all('tr', itemtype='http://schema.org/Book')  # Find all book containers on the page
-
-    filtered_books = []  # List to hold filtered book data
-
-    # Iterate through each book found on the page, stop after processing 5 books
-    for i, book in enumerate(books):
-        if i >= 5:  # Only process the first 5 books
-            break
-
-        # Extract the book title and detail page link
-        title_tag = book.find('a', class_='bookTitle')
-        title = title_tag.get_text(strip=True)  # Clean up the title text
-        book_link = "https://www.goodreads.com" + title_tag['href']  # Build the full URL for the book detail page
-
-        # Extract the author name from the <a> tag with the class 'authorName'
-        author_tag = book.find('a', class_='authorName')
-        author = author_tag.get_text(strip=True) if author_tag else "Unknown"  # Extract and clean the author name
-
-        # Extract the rating and number of ratings from the 'minirating' span tag
-        rating_tag = book.find('span', class_='minirating')
-        rating_text = rating_tag.get_text(strip=True)
-
-        # Use regex to extract numeric rating (e.g., "4.00")
-        rating_match = re.search(r"(\d+\.\d+)", rating_text)
-        if rating_match:
-            rating = float(rating_match.group(1))  # Convert the matched rating string to a float
-        else:
-            continue  # Skip the book if no valid rating is found
-
-        # Use regex to extract the number of ratings (e.g., "10,000 ratings")
-        num_ratings_match = re.search(r"(\d+(?:,\d+)*) ratings", rating_text)
-        if num_ratings_match:
-            num_ratings = int(num_ratings_match.group(1).replace(",", ""))  # Convert to integer and remove commas
-        else:
-            continue  # Skip the book if no valid number of ratings is found
-
-        # Apply filtering conditions: rating > 3.00 and more than 100 ratings
-        if rating > 3.00 and num_ratings > 100:
-            # Append the book details to the filtered_books list
-            filtered_books.append({
-                'title': title,
-                'author': author,
-                'rating': rating,
-                'num_ratings': num_ratings,
-                'link': book_link
-            })
-
-    return filtered_books  # Return the list of filtered books
-
-
-def fetch_book_details(book_url):
-    """
-    Fetches the rating distribution for a book from its detail page.
+    return book_pages.filter_list_books(page_content, base_url=BASE_URL, max_books=max_books)
 
-    Args:
-    - book_url (str): The URL of the book's detail page.
 
-    Returns:
-    - dict: A dictionary of rating distribution (number of ratings for each star rating).
-    - str: The author's name.
+def fetch_book_details_memoized(book_url):
     """
-    page_content = fetch_page_content(book_url)  # Fetch the HTML content of the book's detail page
-    if page_content is None:
-        return {}, "Unknown"  # Return empty data if page fetch fails
-
-    soup = BeautifulSoup(page_content, 'html.parser')  # Parse the page content using BeautifulSoup
-
-    # Improved Fetching of rating distribution
-    rating_distribution = {'5': 0, '4': 0, '3': 0, '2': 0, '1': 0}
-
-    # Look for rating distribution in the review stats section (this can change based on Goodreads page structure)
-    rating_histogram = soup.find_all('div', class_='ratingGraph')  # This div contains the rating distribution bars
-
-    if rating_histogram:
-        # The bars for each star rating are usually in the ratingGraph div, and within each bar, there should be a value showing the number of ratings
-        for i, bar in enumerate(rating_histogram):
-            star_rating = str(5 - i)  # Convert index to star rating (5 stars, 4 stars, ..., 1 star)
-            rating_count = bar.find('span', class_='value').get_text(strip=True).replace(',',
-                                                                                         '')  # Find the count within the bar
-            if rating_count.isdigit():
-                rating_distribution[star_rating] = int(rating_count)  # Store the count in the dictionary
-
-    # Fetching the author name
-    author_tag = soup.find('a', class_='authorName')  # Find the author name tag
-    author_name = author_tag.get_text(strip=True) if author_tag else "Unknown"  # Extract and clean the author name
-
-    return rating_distribution, author_name  # Return the rating distribution and author name
+    Fetches the rating distribution and author name of a book (see book_pages.fetch_book_details),
+    each book ID only once (see book_details_memo). Failed fetches are not memoized.
+    """
+    return book_details_memo.get(book_url, book_pages.fetch_book_details, cache_if=lambda details: bool(details[0]))
 
 
-def process_books_from_url(base_url):
+def process_books_from_url(base_url, max_books=5, fetcher=None, checkpoint=None, sink=None, failed=None):
     """
-    Processes the first 5 books from page 1 of a given Goodreads list URL, fetching detailed data for each book.
+    Processes the first books from page 1 of a given Goodreads list URL, fetching detailed data for each book.
+    The detail pages are fetched in parallel (bounded per host and rate limited), and the original list order is kept.
+
+    With a checkpoint, books finished in a previous run are skipped, and the books are written to the sink and
+    marked as done every CHECKPOINT_CHUNK books, so an interrupted run only redoes the chunk it was working on.
+    Books whose detail page could not be fetched are not written nor marked as done (and neither is the page),
+    so the next run tries them again.
 
     Args:
     - base_url (str): The base URL of the Goodreads list page.
+    - max_books (int, optional): Number of books to process from the page (None for the whole page).
+    - fetcher (ConcurrentFetcher, optional): The fetch engine to use (a default one is created if not given).
+    - checkpoint (CrawlCheckpoint, optional): Journal of finished (list, page) and book-link units.
+    - sink (BookSink, optional): Where finished books are written before they are marked as done.
+    - failed (list, optional): Collects the URLs (list page or book links) that could not be fetched.
 
     Returns:
-    - list of dict: A list of dictionaries containing data for each book (title, rating, number of ratings, author, rating distribution).
+    - list of dict: A list of dictionaries containing data for each book processed in this run (title, rating, number of ratings, author, rating distribution).
     """
     page_num = 1  # We only want to process the first page
-    all_books = []  # List to hold all books
+
+    if checkpoint and checkpoint.is_page_done(base_url, page_num):
+        print(f"Page {page_num} from {base_url} was finished in a previous run, skipping it.")
+        return []
 
     print(f"Fetching page {page_num} from {base_url}...")
     page_content = fetch_page_content(base_url + f"?page={page_num}")  # Fetch the content of page 1
 
     if not page_content:
+        if failed is not None:
+            failed.append(base_url)
         return []  # Stop fetching if no content is returned
 
-    books = fetch_books_from_page(page_content)  # Extract book data from the first 5 books on the page
+    books = fetch_books_from_page(page_content, max_books=max_books)  # Extract book data from the page
     if not books:
         print(f"No more books found on page {page_num}. Moving to next URL.")
         return []  # Stop fetching if no more books are found
 
-    # Loop through each of the first 5 books and fetch additional details
-    for book in books:
-        rating_distribution = fetch_book_details(book['link'])  # Fetch additional details for the book
-        # Add the additional details to the book data
-        book['rating_distribution'] = rating_distribution
-        all_books.append(book)  # Append the book data to the all_books list
+    if checkpoint:
+        books = [book for book in books if not checkpoint.is_book_done(book['link'])]  # Finished in a previous run
+
+    if fetcher is None:
+        fetcher = ConcurrentFetcher(max_workers=MAX_WORKERS, per_host=PER_HOST_LIMIT,
+                                    rate=REQUESTS_PER_SECOND, burst=BURST)
+
+    chunk_size = CHECKPOINT_CHUNK if checkpoint else max(len(books), 1)
+    failed_books = 0
+    for start in range(0, len(books), chunk_size):
+        chunk = books[start:start + chunk_size]
+
+        # Books already in the memo are not sent to the fetcher, so they don't wait for the rate limits
+        links = [book['link'] for book in chunk]
+        details = [book_details_memo.peek(link) for link in links]
+        missing = [i for i, result in enumerate(details) if result is None]
 
-    return all_books  # Return the list of all books
+        # Fetch the other detail pages concurrently (results come back in the same order as the links)
+        fetched = fetcher.map(fetch_book_details_memoized, [links[i] for i in missing])
+        for i, result in zip(missing, fetched):
+            details[i] = result
+
+        # Add the additional details to the book data (an empty distribution means the fetch failed)
+        for book, (rating_distribution, _) in zip(chunk, details):
+            book['rating_distribution'] = rating_distribution
+        failed_links = [book['link'] for book in chunk if not book['rating_distribution']]
+        failed_books += len(failed_links)
+        if failed is not None:
+            failed.extend(failed_links)
+
+        # With a checkpoint the failed books are left for the next run, which would find their titles already
+        # written (and drop them as duplicates) if they were written now
+        finished = [book for book in chunk if book['rating_distribution']] if checkpoint else chunk
+        if sink:
+            sink.write(finished)
+            sink.flush()  # The books are on disk before they are marked as done
+        if checkpoint:
+            checkpoint.mark_books_done([book['link'] for book in finished])
+
+    if checkpoint and not failed_books:
+        checkpoint.mark_page_done(base_url, page_num)
+
+    return books  # Return the list of all books
 
 
 def save_books_to_csv(books, filename):
@@ -186,28 +176,44 @@ def save_books_to_csv(books, filename):
     - books (list of dict): The list of dictionaries containing book data.
     - filename (str): The name of the CSV file to save the data to.
     """
-    df = pd.DataFrame(books)  # Convert the list of books to a pandas DataFrame
-    df.drop_duplicates(subset='title', inplace=True)  # Remove duplicates by title
-    df.to_csv(filename, index=False)  # Save the DataFrame to CSV
+    with BookSink(filename, dedupe_key='title') as sink:  # Duplicates by title are removed while writing
+        sink.write(books)
     print(f"Data saved to {filename}")
 
 
 def main():
     """
-    Main function to process all URLs, fetch book data, and save it to a CSV file.
+    Main function to process all URLs, fetch book data, and stream it to a CSV file list by list.
     """
-    all_books = []  # Initialize an empty list to hold all books
-
-    # Loop through each URL in the list
-    for base_url in urls:
-        books = process_books_from_url(base_url)  # Process the first 5 books from page 1 of the current URL
-        all_books.extend(books)  # Append the fetched books to the master list
-
-    # Save the data to a CSV file
-    save_books_to_csv(all_books, 'filtered_first_5_books_with_ratings_and_authors.csv')
+    # One fetch engine for the whole run, so the per-host limits apply across all lists
+    fetcher = ConcurrentFetcher(max_workers=MAX_WORKERS, per_host=PER_HOST_LIMIT,
+                                rate=REQUESTS_PER_SECOND, burst=BURST)
+
+    # Journal of finished lists and books: a restarted run skips them and appends to the existing output file
+    checkpoint = CrawlCheckpoint(CHECKPOINT_FILE)
+    if checkpoint.resumed:
+        print(f"Resuming the previous run from {CHECKPOINT_FILE}")
+
+    # Books are written as soon as they are processed (duplicates by title are dropped on the fly)
+    failed = []
+    with BookSink(OUTPUT_FILE, dedupe_key='title', batch_size=SINK_BATCH_SIZE, append=checkpoint.resumed) as sink:
+        # Loop through each URL in the list
+        for base_url in urls:
+            # Process the first 5 books from page 1 of the current URL, writing them to the output file
+            process_books_from_url(base_url, fetcher=fetcher, checkpoint=checkpoint, sink=sink, failed=failed)
+
+    if failed:
+        print(f"{len(failed)} pages could not be fetched, keeping {CHECKPOINT_FILE} - run again to retry them")
+    else:
+        checkpoint.clear()  # The run is complete, the next one starts from scratch
+    print(f"Data saved to {OUTPUT_FILE}")
 
     # Print the total number of books found
-    print(f"Total number of unique books found: {len(all_books)}")
+    print(f"Total number of unique books found: {sink.count}")
+    print(f"Book detail fetches: {book_details_memo.fetches} - saved by the book ID memo: {book_details_memo.fetches_saved}")
+    book_details_memo.close()
+    http_client.print_stats()
+    http_cache.print_stats()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,80 @@
+import re
+from bisect import bisect_right
+from collections import namedtuple
+
+
+### Parser for the Goodreads "minirating" text of a list row, shared by all the goodreads scripts.
+### Examples of minirating texts (as returned by get_text(strip=True)):
+###   "4.32 avg rating — 12,345 ratings"
+###   "it was amazing4.32 avg rating — 12,345 ratings"   (the reader's own rating label comes first when logged in)
+### The list row score ("score: 12,345, and 123 people voted") is picked up too when it is part of the text.
+
+MiniRating = namedtuple('MiniRating', ['label', 'avg_rating', 'num_ratings', 'score', 'voters'])
+
+_NUMBER = r"\d+(?:,\d+)*"  # e.g. "10,000"
+
+# One precompiled pattern pulls every field in a single match. Fields are searched within one line,
+# so the same pattern also runs over all the texts of a page joined with newlines (batch mode).
+MINIRATING_RE = re.compile(
+    r"^(?P<label>[^\n]*?)(?P<avg>\d+\.\d+)"  # The first decimal number is the average rating
+    rf"(?:[^\n]*?(?P<count>{_NUMBER}) ratings?)?"  # e.g. "10,000 ratings"
+    rf"(?:[^\n]*?score:?\s*(?P<score>{_NUMBER}))?"  # e.g. "score: 12,345"
+    rf"(?:[^\n]*?(?P<voters>{_NUMBER}) people voted)?",  # e.g. "123 people voted"
+    re.MULTILINE,
+)
+
+
+def _to_int(number_text):
+    return int(number_text.replace(",", "")) if number_text else None
+
+
+def _from_match(match):
+    return MiniRating(
+        label=match.group('label').strip() or None,
+        avg_rating=float(match.group('avg')),
+        num_ratings=_to_int(match.group('count')),
+        score=_to_int(match.group('score')),
+        voters=_to_int(match.group('voters')),
+    )
+
+
+def parse_minirating(rating_text):
+    """
+    Parses one minirating text.
+
+    Args:
+    - rating_text (str): The minirating text (e.g., "4.00 avg rating — 10,000 ratings").
+
+    Returns:
+    - MiniRating: label (str or None), avg_rating (float), num_ratings, score and voters (int or None),
+      or None if the text has no average rating.
+    """
+    if not rating_text:
+        return None
+    match = MINIRATING_RE.match(rating_text.replace("\n", " "))
+    return _from_match(match) if match else None
+
+
+def parse_miniratings(rating_texts):
+    """
+    Parses all the minirating texts of a page with a single regex pass over the joined texts.
+
+    Args:
+    - rating_texts (list of str): The minirating texts (None entries are allowed).
+
+    Returns:
+    - list: One MiniRating (or None when the text has no average rating) per input text, in the same order.
+    """
+    lines = [(text or "").replace("\n", " ") for text in rating_texts]
+    results = [None] * len(lines)
+
+    # Offset of the start of each line in the joined text, to map every match back to its text
+    line_starts = []
+    offset = 0
+    for line in lines:
+        line_starts.append(offset)
+        offset += len(line) + 1
+
+    for match in MINIRATING_RE.finditer("\n".join(lines)):
+        results[bisect_right(line_starts, match.start()) - 1] = _from_match(match)
+    return results
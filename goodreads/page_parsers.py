@@ -0,0 +1,193 @@
+from bs4 import BeautifulSoup
+
+from scraping.extract import (DEFAULT_BACKEND, Field, HTMLParser, Spec, element_text, get_backend,
+                              has_class, lxml_html, selectolax_text)
+
+
+### Parser backends for Goodreads list and book pages.
+### Every backend returns exactly the same raw fields as the BeautifulSoup one (text is extracted like
+### get_text(strip=True)), book_pages then filters the books for the scripts.
+### The spec is the default backend (see scraping.extract).
+
+BOOK_ITEMTYPE = 'http://schema.org/Book'
+
+
+############# BeautifulSoup (reference implementation)
+
+def _bs4_list_rows(page_content):
+    soup = BeautifulSoup(page_content, 'html.parser')
+    rows = []
+    for book in soup.find_all('tr', itemtype=BOOK_ITEMTYPE):
+        title_tag = book.find('a', class_='bookTitle')
+        author_tag = book.find('a', class_='authorName')
+        rating_tag = book.find('span', class_='minirating')
+        rows.append({
+            'title': title_tag.get_text(strip=True) if title_tag else None,
+            'href': title_tag.get('href') if title_tag else None,
+            'author': author_tag.get_text(strip=True) if author_tag else None,
+            'rating_text': rating_tag.get_text(strip=True) if rating_tag else None,
+        })
+    return rows
+
+
+def _bs4_book_page(page_content):
+    soup = BeautifulSoup(page_content, 'html.parser')
+    rating_graph_values = []
+    for bar in soup.find_all('div', class_='ratingGraph'):
+        value_tag = bar.find('span', class_='value')
+        rating_graph_values.append(value_tag.get_text(strip=True) if value_tag else None)
+    author_tag = soup.find('a', class_='authorName')
+    return {
+        'rating_graph_values': rating_graph_values,
+        'static_stars_values': [tag.get_text(strip=True) for tag in soup.find_all('span', class_='greyText staticStars')],
+        'author': author_tag.get_text(strip=True) if author_tag else None,
+    }
+
+
+############# lxml: one walk over the tree (lxml's tag-filtered iteration runs in C)
+
+def _lxml_classes(element):
+    return (element.get('class') or '').split()
+
+
+def _lxml_list_rows(page_content):
+    root = lxml_html.fromstring(page_content)
+    rows = []
+    for book in root.iter('tr'):
+        if book.get('itemtype') != BOOK_ITEMTYPE:
+            continue
+
+        row = {'title': None, 'href': None, 'author': None, 'rating_text': None}
+        found = set()  # Like find(), only the first matching tag of each kind in a row is used
+        for element in book.iter('a', 'span'):
+            classes = _lxml_classes(element)
+            if element.tag == 'a' and 'bookTitle' in classes and 'title' not in found:
+                row['title'] = element_text(element, 'nodes')
+                row['href'] = element.get('href')
+                found.add('title')
+            elif element.tag == 'a' and 'authorName' in classes and 'author' not in found:
+                row['author'] = element_text(element, 'nodes')
+                found.add('author')
+            elif element.tag == 'span' and 'minirating' in classes and 'rating' not in found:
+                row['rating_text'] = element_text(element, 'nodes')
+                found.add('rating')
+        rows.append(row)
+    return rows
+
+
+def _lxml_book_page(page_content):
+    root = lxml_html.fromstring(page_content)
+    result = {'rating_graph_values': [], 'static_stars_values': [], 'author': None}
+    author_found = False
+    for element in root.iter('div', 'span', 'a'):
+        classes = _lxml_classes(element)
+        if element.tag == 'div' and 'ratingGraph' in classes:
+            # The count is the first span.value inside the bar
+            value_tag = next((span for span in element.iter('span') if 'value' in _lxml_classes(span)), None)
+            result['rating_graph_values'].append(element_text(value_tag, 'nodes') if value_tag is not None else None)
+        elif element.tag == 'span' and ' '.join(classes) == 'greyText staticStars':
+            result['static_stars_values'].append(element_text(element, 'nodes'))
+        elif element.tag == 'a' and 'authorName' in classes and not author_found:
+            result['author'] = element_text(element, 'nodes')
+            author_found = True
+    return result
+
+
+############# selectolax (lexbor): CSS selectors
+
+def _selectolax_list_rows(page_content):
+    tree = HTMLParser(page_content)
+    rows = []
+    for book in tree.css(f'tr[itemtype="{BOOK_ITEMTYPE}"]'):
+        title_tag = book.css_first('a.bookTitle')
+        author_tag = book.css_first('a.authorName')
+        rating_tag = book.css_first('span.minirating')
+        rows.append({
+            'title': selectolax_text(title_tag) if title_tag else None,
+            'href': title_tag.attributes.get('href') if title_tag else None,
+            'author': selectolax_text(author_tag) if author_tag else None,
+            'rating_text': selectolax_text(rating_tag) if rating_tag else None,
+        })
+    return rows
+
+
+def _selectolax_book_page(page_content):
+    tree = HTMLParser(page_content)
+    rating_graph_values = []
+    for bar in tree.css('div.ratingGraph'):
+        value_tag = bar.css_first('span.value')
+        rating_graph_values.append(selectolax_text(value_tag) if value_tag else None)
+    author_tag = tree.css_first('a.authorName')
+    static_stars = [node for node in tree.css('span.greyText.staticStars')
+                    if ' '.join(node.attributes.get('class', '').split()) == 'greyText staticStars']
+    return {
+        'rating_graph_values': rating_graph_values,
+        'static_stars_values': [selectolax_text(node) for node in static_stars],
+        'author': selectolax_text(author_tag) if author_tag else None,
+    }
+
+
+############# Declarative specs (scraping.extract)
+
+_BOOK_TITLE = f"(.//a[{has_class('bookTitle')}])[1]"
+
+LIST_ROWS_SPEC = Spec(items=f"//tr[@itemtype='{BOOK_ITEMTYPE}']", fields={
+    'title': Field(_BOOK_TITLE, text='nodes'),
+    'href': Field(_BOOK_TITLE, attr='href'),
+    'author': Field(f"(.//a[{has_class('authorName')}])[1]", text='nodes'),
+    'rating_text': Field(f"(.//span[{has_class('minirating')}])[1]", text='nodes'),
+})
+
+BOOK_PAGE_SPEC = Spec({
+    'rating_graph': Spec(items=f"//div[{has_class('ratingGraph')}]", fields={
+        'value': Field(f"(.//span[{has_class('value')}])[1]", text='nodes'),
+    }),
+    'static_stars_values': Field("//span[normalize-space(@class)='greyText staticStars']", text='nodes', many=True),
+    'author': Field(f"(//a[{has_class('authorName')}])[1]", text='nodes'),
+})
+
+
+def _spec_book_page(page_content):
+    result = BOOK_PAGE_SPEC.extract(page_content)
+    return {
+        'rating_graph_values': [bar['value'] for bar in result.pop('rating_graph')],
+        'static_stars_values': result['static_stars_values'],
+        'author': result['author'],
+    }
+
+
+_BACKENDS = {
+    'bs4': (_bs4_list_rows, _bs4_book_page),
+    'lxml': (_lxml_list_rows, _lxml_book_page),
+    'selectolax': (_selectolax_list_rows, _selectolax_book_page),
+    'spec': (LIST_ROWS_SPEC.extract, _spec_book_page),
+}
+
+
+def parse_list_rows(page_content, backend=DEFAULT_BACKEND):
+    """
+    Extracts the raw data of every book row of a Goodreads list page.
+
+    Args:
+    - page_content (str): The HTML content of the page.
+    - backend (str): 'bs4', 'lxml', 'selectolax' or 'spec'.
+
+    Returns:
+    - list of dict: One dict per book row with title, href, author and rating_text (None when missing).
+    """
+    return get_backend(_BACKENDS, backend)[0](page_content)
+
+
+def parse_book_page(page_content, backend=DEFAULT_BACKEND):
+    """
+    Extracts the raw rating data and author name from a Goodreads book detail page.
+
+    Args:
+    - page_content (str): The HTML content of the page.
+    - backend (str): 'bs4', 'lxml', 'selectolax' or 'spec'.
+
+    Returns:
+    - dict: rating_graph_values (text of each ratingGraph bar value, None when missing),
+      static_stars_values (text of each 'greyText staticStars' span) and author (None when missing).
+    """
+    return get_backend(_BACKENDS, backend)[1](page_content)
@@ -0,0 +1,260 @@
+import os
+import sqlite3
+import threading
+import time
+
+import pandas as pd
+
+from investing.value_parser import parse_value
+
+
+### Local fundamentals warehouse (SQLite): StockAnalysis financial statements and GuruFocus scores/indicators
+### of every ticker, with the time each ticker was fetched.
+### - a ticker is refetched only when its data is older than the TTL, or when its latest fiscal period
+###   differs from the one the caller expects (a new report is out)
+### - statements are stored long (ticker, statement, metric, period, value), so whole-universe reads are one query
+
+STORE_PATH = os.path.join(os.path.expanduser('~'), '.cache', 'web_stuff', 'fundamentals.sqlite')
+DEFAULT_TTL = 7 * 24 * 3600  # Seconds the data of a ticker is used without refetching
+
+SOURCE_STOCKANALYSIS = 'stockanalysis'
+SOURCE_GURUFOCUS = 'gurufocus'
+
+METRIC_COLUMN = 'Fiscal Year'  # Name of the metric column of the statement tables
+GF_SCORE_COLUMNS = ['financial_str', 'profit', 'growth', 'gf_value', 'momentum', 'GF_score']
+CURRENT_PERIODS = ('TTM', 'Current')  # Columns that are not a fiscal period
+
+
+def latest_period(comp_df):
+    """
+    Returns the latest fiscal period of a company's statements (e.g. 'FY 2024'), None if unknown.
+    """
+    for statement_df in comp_df.values():
+        if statement_df is None:
+            continue
+        periods = [column for column in statement_df.columns[1:] if column not in CURRENT_PERIODS]
+        if periods:
+            return periods[0]  # Periods are listed newest first
+    return None
+
+
+def _or_none(value):
+    # NaN -> None (stored as NULL)
+    return None if value is None or value != value else value
+
+
+def _or_nan(value):
+    # NULL -> NaN, like the missing cells of the parsed tables
+    return float('nan') if value is None else value
+
+
+class FundamentalsStore:
+    """
+    SQLite-backed store of fundamentals per ticker.
+
+    Args:
+    - path (str): Path of the SQLite database file.
+    - ttl (float): Seconds the stored data of a ticker is considered fresh.
+    """
+
+    def __init__(self, path=STORE_PATH, ttl=DEFAULT_TTL):
+        self.path = path
+        self.ttl = ttl
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        gf_score_columns = ', '.join(f'{column} INTEGER' for column in GF_SCORE_COLUMNS)
+        self._conn.executescript(f"""
+            CREATE TABLE IF NOT EXISTS fetches (
+                source TEXT,
+                ticker TEXT,
+                fetched_at REAL,
+                period TEXT,
+                PRIMARY KEY (source, ticker)
+            );
+            CREATE TABLE IF NOT EXISTS statements (
+                ticker TEXT,
+                statement TEXT,
+                metric TEXT,
+                period TEXT,
+                value,
+                metric_pos INTEGER,
+                period_pos INTEGER,
+                PRIMARY KEY (ticker, statement, metric_pos, period_pos)
+            );
+            CREATE TABLE IF NOT EXISTS gf_scores (
+                ticker TEXT PRIMARY KEY,
+                {gf_score_columns}
+            );
+            CREATE TABLE IF NOT EXISTS gf_indicators (
+                ticker TEXT,
+                metric TEXT,
+                value,
+                PRIMARY KEY (ticker, metric)
+            );
+        """)
+        self._conn.commit()
+
+    ############# Freshness
+
+    def _record_fetch(self, source, ticker, period=None):
+        # Called with the lock held, commits with the data
+        self._conn.execute("INSERT OR REPLACE INTO fetches VALUES (?, ?, ?, ?)", (source, ticker, time.time(), period))
+
+    def get_fetch_info(self, source, ticker):
+        """
+        Returns (fetched_at, period) of a ticker, None if it was never stored.
+        """
+        with self._lock:
+            return self._conn.execute(
+                "SELECT fetched_at, period FROM fetches WHERE source = ? AND ticker = ?", (source, ticker)
+            ).fetchone()
+
+    def stale_tickers(self, source, ticker_list, expected_periods=None):
+        """
+        Returns the tickers that have to be fetched again: never stored, older than the TTL,
+        or stored with another latest period than expected.
+
+        Args:
+        - source (str): SOURCE_STOCKANALYSIS or SOURCE_GURUFOCUS.
+        - ticker_list (list of str): The tickers of the universe.
+        - expected_periods (dict, optional): ticker -> latest fiscal period the caller knows about (e.g. 'FY 2024').
+        """
+        with self._lock:
+            rows = dict((ticker, (fetched_at, period)) for ticker, fetched_at, period in self._conn.execute(
+                "SELECT ticker, fetched_at, period FROM fetches WHERE source = ?", (source,)
+            ))
+        now = time.time()
+        stale = []
+        for ticker in ticker_list:
+            info = rows.get(ticker)
+            if info is None or now - info[0] > self.ttl:
+                stale.append(ticker)
+            elif expected_periods and expected_periods.get(ticker) not in (None, info[1]):
+                stale.append(ticker)  # The fiscal period changed since the last fetch
+        return stale
+
+    ############# StockAnalysis statements
+
+    def put_statements(self, ticker, comp_df):
+        """
+        Stores the statements of a company (dict of statement name -> dataframe, as get_company_financials_as_df
+        returns). Statements that could not be fetched (None) are skipped and their stored copy is kept.
+        The ticker only counts as fetched (its TTL restarts) when every statement was fetched.
+        """
+        rows = []
+        fetched = [statement for statement, statement_df in comp_df.items() if statement_df is not None]
+        for statement in fetched:
+            statement_df = comp_df[statement]
+            metrics = statement_df.iloc[:, 0].tolist()
+            for period_pos, period in enumerate(statement_df.columns[1:]):
+                values = statement_df[period].tolist()
+                for metric_pos, (metric, value) in enumerate(zip(metrics, values)):
+                    # Missing metrics and values (the 'Period Ending' row) are stored as NULL
+                    rows.append((ticker, statement, _or_none(metric), period, _or_none(value), metric_pos, period_pos))
+
+        with self._lock:
+            self._conn.executemany("DELETE FROM statements WHERE ticker = ? AND statement = ?",
+                                   [(ticker, statement) for statement in fetched])
+            self._conn.executemany("INSERT OR REPLACE INTO statements VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+            if len(fetched) == len(comp_df):
+                self._record_fetch(SOURCE_STOCKANALYSIS, ticker, latest_period(comp_df))
+            self._conn.commit()
+
+    def get_statements(self, ticker):
+        """
+        Returns the stored statements of a company in the form get_company_financials_as_df returns them
+        (metric column first, rows and periods in the original order, missing values NaN), or None if the
+        company is not stored.
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT statement, metric, period, value, metric_pos, period_pos FROM statements WHERE ticker = ? "
+                "ORDER BY rowid",
+                (ticker,),
+            ).fetchall()
+        if not rows:
+            return None
+
+        # Rows are rebuilt from their positions, so rows without a metric name (e.g. 'Period Ending') are kept
+        tables = {}
+        for statement, metric, period, value, metric_pos, period_pos in rows:
+            metrics, periods, cells = tables.setdefault(statement, ({}, {}, {}))
+            metrics[metric_pos] = metric
+            periods[period_pos] = period
+            cells[metric_pos, period_pos] = value
+
+        comp_df = {}
+        for statement, (metrics, periods, cells) in tables.items():
+            metric_positions, period_positions = sorted(metrics), sorted(periods)
+            data = {METRIC_COLUMN: [_or_nan(metrics[m]) for m in metric_positions]}
+            for p in period_positions:
+                data[periods[p]] = [_or_nan(cells.get((m, p))) for m in metric_positions]
+            comp_df[statement] = pd.DataFrame(data)
+        return comp_df
+
+    def get_statement_values(self, statement, metric, period, ticker_list=None):
+        """
+        Reads one value (e.g. 'ratios', 'Debt / Equity Ratio', 'Current') for every stored ticker in one query.
+
+        Returns:
+        - pd.Series: The values indexed by ticker.
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT ticker, value FROM statements WHERE statement = ? AND metric = ? AND period = ?",
+                (statement, metric, period),
+            ).fetchall()
+        values = pd.Series(dict(rows), name=metric, dtype=object)
+        return values if ticker_list is None else values.reindex(ticker_list)
+
+    ############# GuruFocus scores and indicators
+
+    def put_gf(self, ticker, main_scores, all_data):
+        """
+        Stores the GuruFocus scores (int or None) and indicators of a ticker.
+        The indicators are stored as floats (NaN when missing), whether they come as the text shown on the page
+        or already converted (parse_financial_data with numeric=True), so get_gf always returns floats.
+        """
+        scores = [main_scores.get(column) for column in GF_SCORE_COLUMNS]
+        indicators = [(ticker, metric, _or_none(parse_value(value))) for metric, value in all_data.items()]
+        with self._lock:
+            self._conn.execute(f"INSERT OR REPLACE INTO gf_scores VALUES ({', '.join('?' * (len(scores) + 1))})",
+                               [ticker] + scores)
+            self._conn.execute("DELETE FROM gf_indicators WHERE ticker = ?", (ticker,))
+            self._conn.executemany("INSERT INTO gf_indicators VALUES (?, ?, ?)", indicators)
+            self._record_fetch(SOURCE_GURUFOCUS, ticker)
+            self._conn.commit()
+
+    def get_gf(self, ticker):
+        """
+        Returns the stored (main_scores, all_data) of a ticker, None if it is not stored.
+        The values of all_data are floats (NaN when missing).
+        """
+        with self._lock:
+            scores = self._conn.execute(
+                f"SELECT {', '.join(GF_SCORE_COLUMNS)} FROM gf_scores WHERE ticker = ?", (ticker,)
+            ).fetchone()
+            if scores is None:
+                return None
+            indicators = self._conn.execute(
+                "SELECT metric, value FROM gf_indicators WHERE ticker = ? ORDER BY rowid", (ticker,)
+            ).fetchall()
+        return dict(zip(GF_SCORE_COLUMNS, scores)), {metric: _or_nan(value) for metric, value in indicators}
+
+    def load_gf_scores(self, ticker_list=None):
+        """
+        Returns the stored GuruFocus scores as a table (ticker + score columns, Int8) ready for screening.
+        """
+        with self._lock:
+            scores = pd.read_sql_query(f"SELECT ticker, {', '.join(GF_SCORE_COLUMNS)} FROM gf_scores", self._conn)
+        if ticker_list is not None:
+            scores = scores[scores['ticker'].isin(ticker_list)].reset_index(drop=True)
+        scores = scores.astype({column: 'Int8' for column in GF_SCORE_COLUMNS})
+        scores['ticker'] = scores['ticker'].astype('category')
+        return scores
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
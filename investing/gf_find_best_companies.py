@@ -1,7 +1,12 @@
 import pandas as pd
 import numpy as np
 
-from investing.gf_analyze_ticker import get_financial_data_for_ticker
+from functools import partial
+
+from investing.gf_analyze_ticker import get_financial_data_for_ticker, get_summary_url, parse_financial_data
+from investing.fundamentals_store import SOURCE_GURUFOCUS
+from scraping.pipeline import Pipeline
+from scraping.scraper import fetch_html
 
 
 ### The code gets a ticker_list and a dataframe (with Symbol and Company)
@@ -9,55 +14,268 @@ from investing.gf_analyze_ticker import get_financial_data_for_ticker
 
 # code for get_companies_from_wiki was here first
 
+# Parallel scan settings
+SCAN_WORKERS = 16  # GuruFocus pages fetched at the same time
+PER_HOST_LIMIT = 8  # Requests in flight to gurufocus.com
+PARSE_WORKERS = None  # Processes parsing the pages (None uses one per CPU core)
+TICKER_TIMEOUT = 30  # Seconds allowed for fetching one ticker's page
+PAGE_QUEUE_SIZE = 64  # Fetched pages waiting for a parsing process before the fetching pauses
+
 ## Make a dataframe of all best companies
 
-# Define a function to extract and handle the score
+# Define a function to extract and handle the score (scores are int, None when the page didn't have them)
 def extract_scores(main_scores, key):
-    try:
-        return int(main_scores[key].split('/')[0])
-    except (ValueError, KeyError):
-        return np.nan
+    score = main_scores.get(key)
+    return np.nan if score is None else score
+
+
+RESULT_COLUMNS = ['ticker', 'company_name', 'financial_str', 'profit', 'growth', 'gf_value', 'momentum', 'GF_score']
+SCORE_COLUMNS = RESULT_COLUMNS[2:]  # Ranks out of 10 and the GF Score out of 100 all fit in int8
+
+# Screening rule applied to the scores (a DataFrame.query expression over the SCORE_COLUMNS)
+DEFAULT_RULE = "financial_str >= 8 and profit >= 8"
+
+# Companies screened together before the passing ones are sent to the sink
+SCREEN_BATCH_SIZE = 100
+
+# Raw scores of the last scan, so new rules can be tried without scraping again
+SCORES_FILE = 'gf_scores.parquet'
+
+
+def set_score_dtypes(scores):
+    """
+    Gives a scores table its compact dtypes: categorical ticker and nullable int8 scores (missing scores are <NA>).
+    """
+    scores = scores.astype({column: 'Int8' for column in SCORE_COLUMNS})
+    scores['ticker'] = scores['ticker'].astype('category')
+    return scores
+
+
+class ScoresAccumulator:
+    """
+    Collects the scores of the scanned companies column by column and builds the DataFrame once at the end
+    (appending one-row DataFrames with pd.concat copies the whole table for every company).
+
+    Args:
+    - sink (optional): Object with a write(records) method (e.g. a BookSink with dedupe_key='ticker')
+      that receives every company as soon as it is scanned.
+    - rule (str, optional): Screening rule; when given, only the companies passing it are sent to the sink.
+      The companies are screened batch_size at a time (one query per batch), and the last batch by flush
+      or to_frame.
+    - batch_size (int): Companies screened together.
+    """
+
+    def __init__(self, sink=None, rule=None, batch_size=SCREEN_BATCH_SIZE):
+        self.sink = sink
+        self.rule = rule
+        self.batch_size = batch_size
+        self._columns = {column: [] for column in RESULT_COLUMNS}
+        self._pending = []  # Companies not screened and sent to the sink yet
+
+    def add(self, ticker, company_name, scores):
+        record = {'ticker': ticker, 'company_name': company_name}
+        record.update((column, scores[column]) for column in SCORE_COLUMNS)
+        for column, value in record.items():
+            self._columns[column].append(value)
+        if self.sink is not None:
+            self._pending.append(record)
+            if self.rule is None or len(self._pending) >= self.batch_size:
+                self.flush()
+
+    def flush(self):
+        """
+        Screens the pending companies and sends the passing ones to the sink, in the order they were added.
+        """
+        if not self._pending:
+            return
+        records = self._pending
+        if self.rule is not None:
+            passing = pd.DataFrame(records).query(self.rule).index  # A RangeIndex, so positions in records
+            records = [records[i] for i in sorted(passing)]
+        self._pending = []
+        if records:
+            self.sink.write(records)
+
+    def __len__(self):
+        return len(self._columns['ticker'])
+
+    def to_frame(self):
+        """
+        Returns the collected companies as a DataFrame (categorical ticker, nullable int8 scores).
+        The pending companies are sent to the sink first.
+        """
+        self.flush()
+        data = {
+            'ticker': pd.Categorical(self._columns['ticker']),
+            'company_name': self._columns['company_name'],
+        }
+        for column in SCORE_COLUMNS:
+            data[column] = pd.array(self._columns[column], dtype='Int8')  # Missing scores become <NA>
+        return pd.DataFrame(data, columns=RESULT_COLUMNS)
+
+
+parse_numeric = partial(parse_financial_data, numeric=True)  # Picklable, for the parsing processes
+
+
+def scan_tickers(ticker_list, max_workers=SCAN_WORKERS, per_host=PER_HOST_LIMIT, parse_workers=PARSE_WORKERS,
+                 timeout=TICKER_TIMEOUT, store=None):
+    """
+    Fetches and parses the GuruFocus summary pages of many tickers in parallel.
+    The pages go through a Pipeline: fetch threads feed a bounded queue of pages to a process pool of parsers,
+    and the parsed tickers are saved as they finish, so the network waits, the parsing (spread across the
+    CPU cores) and the store writes all overlap while only a bounded number of pages is held in memory.
+
+    Args:
+    - ticker_list (list of str): The tickers to scan.
+    - max_workers (int): Number of pages fetched at the same time.
+    - per_host (int): Maximum number of requests in flight to gurufocus.com.
+    - parse_workers (int, optional): Number of parsing processes (None for one per CPU core).
+    - timeout (float): Seconds allowed for fetching one ticker's page.
+    - store (FundamentalsStore, optional): Tickers fetched within the store's TTL are read from it,
+      the others are scanned and saved to it.
 
+    Returns:
+    - tuple: (results, failed) - results maps each scanned ticker to (main_scores, all_data), with the indicator
+      values of all_data already converted to float by the parsing processes (see IndicatorMatrix.from_results),
+      failed maps the tickers that could not be fetched or parsed to the reason.
+    """
+    results, failed = {}, {}
 
-def get_best_companies(ticker_list, df):
-    # go over all companies in Gurufocus, extracts scores
+    to_scan = ticker_list
+    if store is not None:
+        to_scan = store.stale_tickers(SOURCE_GURUFOCUS, ticker_list)
+        stale = set(to_scan)
+        results = {ticker: store.get_gf(ticker) for ticker in ticker_list if ticker not in stale}
+        print(f"GuruFocus: {len(results)} tickers read from the store, {len(to_scan)} to scan")
+    if not to_scan:
+        return results, failed
 
-    # Create a blank DataFrame with specified columns
-    df_best_companies = pd.DataFrame(
-        columns=['ticker', 'company_name', 'financial_str', 'profit', 'growth', 'gf_value', 'momentum']
-    )
+    def fetch_page(ticker):
+        return fetch_html(get_summary_url(ticker), timeout=timeout)
+
+    def save(ticker, result):
+        results[ticker] = result
+        print(f'i: {len(results)} - scanned ticker: {ticker}')
+        if store is not None:
+            store.put_gf(ticker, *result)
+
+    def fail(ticker, reason):
+        failed[ticker] = reason
+
+    pipeline = Pipeline(fetch_page, parse_numeric, save, on_error=fail, url=get_summary_url,
+                        fetch_workers=max_workers, per_host=per_host, parse_workers=parse_workers,
+                        queue_size=PAGE_QUEUE_SIZE)
+    pipeline.run(to_scan)
+
+    if failed:
+        print(f"{len(failed)} of {len(ticker_list)} tickers failed: {', '.join(sorted(failed))}")
+    return results, failed
+
+
+def collect_scores(ticker_list, df, parallel=False, max_workers=SCAN_WORKERS, parse_workers=PARSE_WORKERS,
+                   timeout=TICKER_TIMEOUT, sink=None, rule=None, store=None):
+    """
+    Scans the tickers on GuruFocus and returns the raw scores of every company (no screening).
+
+    Args:
+    - ticker_list (list of str): The tickers to scan.
+    - df (pd.DataFrame): Companies indexed by ticker, with a 'Company' column.
+    - parallel (bool): Scan with scan_tickers (tickers that fail are left out) instead of one ticker at a time.
+    - max_workers, parse_workers, timeout: Settings of the parallel scan (see scan_tickers).
+    - sink (optional): Receives the companies as they are scanned (see ScoresAccumulator).
+    - rule (str, optional): Only the companies passing this rule are sent to the sink.
+    - store (FundamentalsStore, optional): Local store, only tickers missing or older than its TTL are fetched.
+
+    Returns:
+    - pd.DataFrame: One row per scanned company with the RESULT_COLUMNS.
+    """
+    accumulator = ScoresAccumulator(sink=sink, rule=rule)
+
+    if parallel:
+        scanned, failed = scan_tickers(ticker_list, max_workers=max_workers, parse_workers=parse_workers, timeout=timeout,
+                                       store=store)
 
-    # find best companies
     for i, ticker in enumerate(ticker_list):
-        print(f'i: {i+1} - ticker: {ticker}')
-        main_scores, all_data = get_financial_data_for_ticker(ticker, print_all_data=False)
-
-        # for key in score_keys:
-        #     scores[key] = extract_score(main_scores, key)
-        scores = {key: extract_scores(main_scores, key) for key in main_scores.keys()}
-
-        if (scores['financial_str']>=8) & (scores['profit']>=8):
-
-            new_row = pd.DataFrame({
-                'ticker': [ticker],
-                'company_name': [df.loc[ticker]['Company']], # for option 1 - ticker is index
-                # 'company_name': [df[df['Symbol'] == ticker]['Security'].values[0]], # option2 after index reset
-                'financial_str': [scores['financial_str']],
-                'profit': [scores['profit']],
-                'growth': [scores['growth']],
-                'gf_value': [scores['gf_value']],
-                'momentum': [scores['momentum']],
-                'GF_score': [scores['GF_score']],
-
-            })
-            df_best_companies = pd.concat([df_best_companies, new_row], ignore_index=True) # add the current company
-
-    df_best_companies = df_best_companies.sort_values(by='GF_score', ascending=False) # Sort companies by GF Score
+        if parallel:
+            if ticker not in scanned:
+                continue
+            main_scores, all_data = scanned[ticker]
+        else:
+            print(f'i: {i+1} - ticker: {ticker}')
+            main_scores, all_data = get_financial_data_for_ticker(ticker, print_all_data=False, store=store)
+            if not main_scores:
+                continue  # The page could not be fetched
+
+        scores = {key: extract_scores(main_scores, key) for key in SCORE_COLUMNS}
+        company_name = df.loc[ticker]['Company']  # for option 1 - ticker is index
+        # company_name = df[df['Symbol'] == ticker]['Security'].values[0]  # option2 after index reset
+        accumulator.add(ticker, company_name, scores)
+
+    return accumulator.to_frame()
+
+
+def save_scores(scores, path=SCORES_FILE):
+    """
+    Stores a scores table (Parquet keeps the dtypes, any other extension is written as CSV).
+    """
+    if path.endswith('.parquet'):
+        scores.to_parquet(path, index=False)  # pip install pyarrow
+    else:
+        scores.to_csv(path, index=False)
+
+
+def load_scores(path=SCORES_FILE):
+    """
+    Loads a scores table stored by save_scores.
+    """
+    scores = pd.read_parquet(path) if path.endswith('.parquet') else pd.read_csv(path)
+    return set_score_dtypes(scores)
+
+
+def screen(scores, rule=DEFAULT_RULE):
+    """
+    Screens a scores table in one vectorized pass.
+
+    Args:
+    - scores (pd.DataFrame): Table returned by collect_scores or load_scores.
+    - rule (str): DataFrame.query expression over the score columns
+      (e.g. "financial_str >= 8 and profit >= 8", "GF_score > 80 and (growth >= 7 or momentum >= 7)").
+      Missing scores never pass a comparison.
+
+    Returns:
+    - pd.DataFrame: The companies passing the rule, sorted by GF Score.
+    """
+    passing = scores.query(rule)
+    return passing.sort_values(by='GF_score', ascending=False)  # Sort companies by GF Score
+
+
+def get_best_companies(ticker_list, df, rule=DEFAULT_RULE, parallel=False, max_workers=SCAN_WORKERS,
+                       parse_workers=PARSE_WORKERS, timeout=TICKER_TIMEOUT, sink=None, scores_path=None, store=None):
+    # go over all companies in Gurufocus, extracts scores, and screens them with rule
+    # parallel=True scans all the tickers with scan_tickers first (tickers that fail are left out)
+    # sink (e.g. BookSink("best_companies.csv", dedupe_key='ticker')) receives the passing companies as they are found
+    # scores_path stores the raw scores, so other rules can be tried later with screen(load_scores(scores_path), rule)
+    # store (a FundamentalsStore) keeps every ticker's scores on disk, repeated runs only fetch the out of date ones
+    scores = collect_scores(ticker_list, df, parallel=parallel, max_workers=max_workers, parse_workers=parse_workers,
+                            timeout=timeout, sink=sink, rule=rule, store=store)
+    if scores_path:
+        save_scores(scores, scores_path)
+
+    df_best_companies = screen(scores, rule)
     # df_best_companies.to_csv("/home/nim/best_companies.csv", index=False)
 
     return df_best_companies
 
-# df_best_companies = get_best_companies(ticker_list, df)
+# df_best_companies = get_best_companies(ticker_list, df, scores_path=SCORES_FILE)
+# Indicators of all the tickers as one ticker x metric matrix (metrics from data_dict):
+# scanned, failed = scan_tickers(ticker_list)
+# indicators = IndicatorMatrix.from_results(scanned)
+# low_debt = np.array(indicators.tickers)[indicators.column('Debt-to-Equity') < 0.5]
+# With the local fundamentals store (tickers fetched in the last week are read from disk):
+# df_best_companies = get_best_companies(ticker_list, df, parallel=True, store=FundamentalsStore())
+# screen(FundamentalsStore().load_gf_scores(ticker_list), "GF_score >= 80")
+# Trying another screen later, without scraping again:
+# df_growth = screen(load_scores(SCORES_FILE), "GF_score >= 80 and growth >= 7 and momentum >= 5")
 
 # to rename a column
 # df_best_companies.rename(columns={'financial_str_score': 'financial_str'}, inplace=True)
@@ -0,0 +1,73 @@
+import numpy as np
+import pandas as pd
+
+from investing import data_dict
+from investing.value_parser import parse_value
+
+
+### Numeric layer for GuruFocus indicator tables: the value texts ("12.5%", "-0.3", "N/A", "$2.5B", ...)
+### are converted to float once at parse time (investing.value_parser), and the indicators of many tickers are kept in one dense
+### ticker x metric float64 matrix, so ranking and screening work on whole columns.
+
+# Metrics of the matrix, named as in investing/data_dict.py
+METRICS = data_dict.financial_data + data_dict.profitability_data
+
+def parse_indicators(all_data):
+    """
+    Converts every value of an indicator dict (name -> text) to a float.
+    """
+    return {name: parse_value(value) for name, value in all_data.items()}
+
+
+class IndicatorMatrix:
+    """
+    Dense ticker x metric float64 matrix of indicator values (NaN where a ticker has no value).
+
+    Args:
+    - tickers (list of str): The row tickers.
+    - metrics (list of str): The column metric names (METRICS by default).
+    """
+
+    def __init__(self, tickers, metrics=METRICS):
+        self.tickers = list(tickers)
+        self.metrics = list(metrics)
+        self._ticker_index = {ticker: i for i, ticker in enumerate(self.tickers)}
+        self._metric_index = {metric: j for j, metric in enumerate(self.metrics)}
+        self.values = np.full((len(self.tickers), len(self.metrics)), np.nan)
+
+    @classmethod
+    def from_results(cls, results, metrics=METRICS):
+        """
+        Builds the matrix from scan results (ticker -> (main_scores, all_data), as returned by scan_tickers)
+        or from ticker -> all_data dicts.
+        """
+        matrix = cls(results.keys(), metrics)
+        for ticker, result in results.items():
+            matrix.set_row(ticker, result[1] if isinstance(result, tuple) else result)
+        return matrix
+
+    def set_row(self, ticker, indicators):
+        """
+        Fills the row of a ticker from its indicator dict (values as text or already converted floats).
+        Indicators that are not among the matrix metrics are ignored.
+        """
+        row = self.values[self._ticker_index[ticker]]
+        for name, value in indicators.items():
+            j = self._metric_index.get(name)
+            if j is not None:
+                row[j] = value if isinstance(value, float) else parse_value(value)
+
+    def column(self, metric):
+        """
+        Returns the values of a metric for all the tickers (a view on the matrix).
+        """
+        return self.values[:, self._metric_index[metric]]
+
+    def row(self, ticker):
+        return self.values[self._ticker_index[ticker]]
+
+    def to_frame(self):
+        """
+        Returns the matrix as a DataFrame (tickers as index, metrics as columns).
+        """
+        return pd.DataFrame(self.values, index=pd.Index(self.tickers, name='ticker'), columns=self.metrics)
@@ -0,0 +1,183 @@
+import re
+
+from bs4 import BeautifulSoup
+
+from investing.gf_indicators import parse_indicators
+from scraping.extract import (DEFAULT_BACKEND, Field, HTMLParser, Spec, element_text, get_backend,
+                              has_class, lxml_html, selectolax_text)
+
+
+### Single-pass extractor for GuruFocus summary pages.
+### One walk over the document in order collects the five rank bars (the first progress bar after each
+### rank link), the GF Score and the indicator table together, instead of one tree search per field.
+### Scores come back as numbers: ranks out of 10 and the GF Score out of 100 as int (None when not found).
+
+# Score key -> text that identifies the rank link (its href contains it)
+RANK_LINKS = {
+    'financial_str': 'rank-balancesheet',
+    'profit': 'rank-profitability',
+    'growth': 'rank-growth',
+    'gf_value': 'rank-gf-value',
+    'momentum': 'rank-momentum',
+}
+
+# The GF Score is only in the page's embedded state script, one precompiled search over the raw HTML finds it
+GF_SCORE_RE = re.compile(r'gf_score:(\d+)')
+
+PROGRESS_BAR_CLASS = 'indicator-progress-bar-header'
+INDICATOR_ROW_CLASS = 'stock-indicators-table-row'
+INDICATOR_NAME_CLASS = 't-caption p-v-sm semi-bold'
+INDICATOR_VALUE_CLASS = 'p-l-sm'
+
+
+def _rank_from_style(style):
+    # The bar is drawn with "width: 80%" -> rank 8 out of 10
+    if not style or 'width:' not in style:
+        return None
+    try:
+        return int(float(style.split('width:')[1].split('%')[0].strip()) / 10)
+    except ValueError:
+        return None
+
+
+def _gf_score(html_content):
+    match = GF_SCORE_RE.search(html_content)
+    return int(match.group(1)) if match else None
+
+
+class _RankCollector:
+    # Links are seen before their progress bar: a rank waits for the first bar that follows its link
+    def __init__(self):
+        self.scores = dict.fromkeys(RANK_LINKS)
+        self._seen_links = set()
+        self._waiting = []
+
+    def link(self, href):
+        if not href:
+            return
+        for key, identifier in RANK_LINKS.items():
+            if identifier in href and key not in self._seen_links:
+                self._seen_links.add(key)  # Only the first link of each rank counts
+                self._waiting.append(key)
+
+    def bar(self, style):
+        for key in self._waiting:
+            self.scores[key] = _rank_from_style(style)
+        self._waiting = []
+
+
+############# BeautifulSoup
+
+def _bs4_summary(html_content):
+    soup = BeautifulSoup(html_content, 'html.parser')
+    ranks = _RankCollector()
+    indicators = {}
+    for element in soup.find_all(['a', 'div', 'tr']):
+        classes = element.get('class') or []
+        if element.name == 'a':
+            ranks.link(element.get('href'))
+        elif element.name == 'div' and PROGRESS_BAR_CLASS in classes:
+            inner = element.div
+            ranks.bar(inner.get('style') if inner else None)
+        elif element.name == 'tr' and INDICATOR_ROW_CLASS in classes:
+            name_tag = element.find('td', class_=INDICATOR_NAME_CLASS)
+            value_tag = element.find('span', class_=INDICATOR_VALUE_CLASS)
+            if name_tag and value_tag:
+                indicators[name_tag.get_text(strip=True)] = value_tag.get_text(strip=True)
+    return ranks.scores, indicators
+
+
+############# lxml
+
+def _lxml_summary(html_content):
+    root = lxml_html.fromstring(html_content)
+    ranks = _RankCollector()
+    indicators = {}
+    for element in root.iter('a', 'div', 'tr'):
+        if element.tag == 'a':
+            ranks.link(element.get('href'))
+            continue
+        classes = (element.get('class') or '').split()
+        if element.tag == 'div' and PROGRESS_BAR_CLASS in classes:
+            inner = next(element.iterdescendants('div'), None)
+            ranks.bar(inner.get('style') if inner is not None else None)
+        elif element.tag == 'tr' and INDICATOR_ROW_CLASS in classes:
+            name_tag = next((td for td in element.iter('td')
+                             if ' '.join((td.get('class') or '').split()) == INDICATOR_NAME_CLASS), None)
+            value_tag = next((span for span in element.iter('span')
+                              if INDICATOR_VALUE_CLASS in (span.get('class') or '').split()), None)
+            if name_tag is not None and value_tag is not None:
+                indicators[element_text(name_tag, 'nodes')] = element_text(value_tag, 'nodes')
+    return ranks.scores, indicators
+
+
+############# selectolax (lexbor): one selector list, matches come back in document order
+
+def _selectolax_summary(html_content):
+    tree = HTMLParser(html_content)
+    ranks = _RankCollector()
+    indicators = {}
+    for node in tree.css(f'a[href], div.{PROGRESS_BAR_CLASS}, tr.{INDICATOR_ROW_CLASS}'):
+        if node.tag == 'a':
+            ranks.link(node.attributes.get('href'))
+        elif node.tag == 'div':
+            inner = next((child for child in node.traverse() if child.tag == 'div' and child != node), None)
+            ranks.bar(inner.attributes.get('style') if inner else None)
+        else:
+            name_tag = next((td for td in node.css('td.t-caption')
+                             if ' '.join((td.attributes.get('class') or '').split()) == INDICATOR_NAME_CLASS), None)
+            value_tag = node.css_first(f'span.{INDICATOR_VALUE_CLASS}')
+            if name_tag and value_tag:
+                indicators[selectolax_text(name_tag)] = selectolax_text(value_tag)
+    return ranks.scores, indicators
+
+
+############# Declarative spec (scraping.extract): each rank is the first progress bar following its link
+
+SUMMARY_SPEC = Spec({
+    **{key: Field(f"(//a[contains(@href, '{identifier}')])[1]"
+                  f"/following::div[{has_class(PROGRESS_BAR_CLASS)}][1]/descendant::div[1]/@style",
+                  type=_rank_from_style)
+       for key, identifier in RANK_LINKS.items()},
+    'indicators': Spec(items=f"//tr[{has_class(INDICATOR_ROW_CLASS)}]", fields={
+        'name': Field(f"(.//td[normalize-space(@class)='{INDICATOR_NAME_CLASS}'])[1]", text='nodes'),
+        'value': Field(f"(.//span[{has_class(INDICATOR_VALUE_CLASS)}])[1]", text='nodes'),
+    }),
+})
+
+
+def _spec_summary(html_content):
+    summary = SUMMARY_SPEC.extract(html_content)
+    indicators = {row['name']: row['value'] for row in summary.pop('indicators')
+                  if row['name'] is not None and row['value'] is not None}
+    return summary, indicators
+
+
+_BACKENDS = {
+    'bs4': _bs4_summary,
+    'lxml': _lxml_summary,
+    'selectolax': _selectolax_summary,
+    'spec': _spec_summary,
+}
+
+
+def parse_summary(html_content, backend=DEFAULT_BACKEND, numeric=False):
+    """
+    Extracts the rank scores, the GF Score and the indicator table of a GuruFocus summary page in one pass.
+
+    Args:
+    - html_content (str): The HTML content of the summary page.
+    - backend (str): 'bs4', 'lxml', 'selectolax' or 'spec'.
+    - numeric (bool): Convert the indicator values to float (see value_parser.parse_value).
+
+    Returns:
+    - tuple: (main_scores, all_data) - main_scores maps financial_str, profit, growth, gf_value and momentum
+      (int out of 10) and GF_score (int out of 100) to their value or None when not found,
+      all_data maps each indicator name to its value text (or float with numeric=True).
+    """
+
+    main_scores, all_data = get_backend(_BACKENDS, backend)(html_content)
+    main_scores['GF_score'] = _gf_score(html_content)
+    if numeric:
+        all_data = parse_indicators(all_data)
+    return main_scores, all_data
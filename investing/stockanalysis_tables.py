@@ -1,6 +1,12 @@
-import requests
 from bs4 import BeautifulSoup
 import pandas as pd
+from collections.abc import Mapping
+
+from investing.fundamentals_store import SOURCE_STOCKANALYSIS, FundamentalsStore
+from investing.value_parser import parse_value_column
+from scraping import http_cache
+from scraping.extract import Field, Spec, lxml_html
+from scraping.scraper import Scraper, fetch_html
 
 
 ###  The code gets a url that includes a table of companies a the table as a dataframe
@@ -15,22 +21,34 @@ nyse_url = 'https://stockanalysis.com/list/nyse-stocks/'
 israeli_us_url= 'https://stockanalysis.com/list/israeli-stocks-us/'
 ipos_url = 'https://stockanalysis.com/ipos/'
 
-# Custom headers to mimic a browser
-headers = {
-    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+# Financial statement pages of a company
+FINANCIALS_URLS = {
+    'income': "https://stockanalysis.com/stocks/{ticker}/financials/",
+    'balance_sheet': "https://stockanalysis.com/stocks/{ticker}/financials/balance-sheet/",
+    'cash_flow': "https://stockanalysis.com/stocks/{ticker}/financials/cash-flow-statement/",
+    'ratios': "https://stockanalysis.com/stocks/{ticker}/financials/ratios/",
 }
 
-# Function to fetch the HTML content of the page
-def fetch_html(url):
-    response = requests.get(url, headers=headers)
-    if response.status_code == 200:
-        return response.text
-    else:
-        print(f"Failed to retrieve data. Status code: {response.status_code}")
-        return None
+# Column shown by each statement in full_data_dict
+SUMMARY_PERIODS = {'income': 'TTM', 'balance_sheet': 'TTM', 'cash_flow': 'TTM', 'ratios': 'Current'}
 
+# Batch fetch settings
+MAX_WORKERS = 16  # Statement pages fetched at the same time
+PER_HOST_LIMIT = 8  # Requests in flight to stockanalysis.com (connections are shared through the pooled session)
+TICKER_BATCH_SIZE = 64  # Tickers whose statements are parsed and stored together (bounds the tables held in memory)
+
+# List table columns holding numbers, converted to float ("3,456.78B" -> 3.45678e12, "-1.23%" -> -1.23)
+NUMERIC_COLUMNS = ('Market Cap', 'Stock Price', 'Price', 'IPO Price', '% Change', 'Revenue')
+
+# The first table of a page as a declarative spec (scraping.extract), same texts as parse_table_data.
+# It is the table parser of table_to_df, parse_table_data is only used when lxml is not installed.
+TABLE_SPEC = Spec({
+    'headers': Field("(//table)[1]//th", many=True),
+    'rows': Spec(items="((//table)[1]//tr)[position() > 1]", fields={'cells': Field("./td", many=True)}),
+})
 
 # Function to parse the table data from HTML content
+@http_cache.memoize_parse
 def parse_table_data(html_content):
     # parse the data table
     soup = BeautifulSoup(html_content, 'html.parser')
@@ -57,6 +75,29 @@ def parse_table_data(html_content):
     return headers, rows
 
 
+@http_cache.memoize_parse
+def parse_table_columns(html_content):
+    # returns the headers and one list of cell texts per header (TABLE_SPEC, or parse_table_data without lxml)
+    if lxml_html is None:
+        headers, rows = parse_table_data(html_content)
+    else:
+        table = TABLE_SPEC.extract(html_content)
+        headers = table['headers'] or None  # No table on the page
+        rows = [row['cells'] for row in table['rows']]
+        if headers is None:
+            print("Table not found on the page.")
+    if headers is None:
+        return None, None
+    # Short rows are padded, like the DataFrame constructor does
+    return headers, [[row[j] if j < len(row) else None for row in rows] for j in range(len(headers))]
+
+
+def to_numeric_column(column):
+    # Vectorized: one regex extraction over the whole column (value_parser.parse_value_column),
+    # unparsable cells become NaN
+    return parse_value_column(column)
+
+
 def clean_headers(headers):
     # Find the index of 'Period Ending'
 
@@ -71,15 +112,24 @@ def clean_headers(headers):
 # Main function to get the S&P 500 table data
 def get_data_table(url):
     # Fetch the page content
-    html_content = fetch_html(url)
+    return table_to_df(fetch_html(url))
 
+
+def table_to_df(html_content):
+    # Converts the table of a fetched page to a dataframe (None when the page could not be fetched)
     if html_content:
         # Parse the table data
-        headers, table_data = parse_table_data(html_content)
+        headers, columns = parse_table_columns(html_content)
+        if headers is None:
+            return None
         headers, cleaned = clean_headers(headers) # throw second row of categories
 
-        # Convert the table data to a pandas DataFrame
-        df = pd.DataFrame(table_data, columns=headers)
+        # Convert the table data to a pandas DataFrame, built column by column
+        df = pd.DataFrame(dict(enumerate(columns[:len(headers)])))
+        df.columns = headers
+        for column in NUMERIC_COLUMNS:
+            if column in df.columns:
+                df[column] = to_numeric_column(df[column])
         df.rename(columns={'Company Name': 'Company'}, inplace=True)
 
         if cleaned:
@@ -94,46 +144,167 @@ def get_data_table(url):
         return None
 
 
+def get_financials_urls(ticker):
+    return {key: url.format(ticker=ticker) for key, url in FINANCIALS_URLS.items()}
+
+
+class CompanyFinancials(Mapping):
+    """
+    Read-only mapping of ticker -> financial statements (dict of statement name -> dataframe, like
+    get_company_financials_as_df returns), holding the companies parsed in this run and reading the others
+    from a FundamentalsStore the first time they are accessed.
+
+    Args:
+    - statements (dict): ticker -> statements of the companies kept in memory.
+    - store (FundamentalsStore, optional): Store holding the other companies.
+    - ticker_list (list of str, optional): All the tickers of the mapping, in order (the ones in statements by default).
+    """
+
+    def __init__(self, statements, store=None, ticker_list=None):
+        self._store = store
+        self._tickers = list(statements) if ticker_list is None else list(ticker_list)
+        self._statements = dict(statements)
+        self._indexed = {}
+
+    def __getitem__(self, ticker):
+        if ticker not in self._statements:
+            if self._store is None or ticker not in self._tickers:
+                raise KeyError(ticker)
+            # A company whose pages all failed and that was never stored has every statement None
+            self._statements[ticker] = (self._store.get_statements(ticker)
+                                        or {key: None for key in FINANCIALS_URLS})
+        return self._statements[ticker]
+
+    def __iter__(self):
+        return iter(self._tickers)
+
+    def __len__(self):
+        return len(self._tickers)
+
+    def get_indexed(self, ticker):
+        """
+        Returns the statements of a company indexed by metric (see index_statement), built once per company.
+        """
+        if ticker not in self._indexed:
+            self._indexed[ticker] = index_statements(self[ticker])
+        return self._indexed[ticker]
+
+    def get_value(self, ticker, statement, metric, period):
+        """
+        Point lookup, e.g. get_value('dov', 'ratios', 'Debt / Equity Ratio', 'Current') (None when missing).
+        """
+        return get_statement_value(self.get_indexed(ticker), statement, metric, period)
+
+
+def get_financials_for_tickers(ticker_list, max_workers=MAX_WORKERS, per_host=PER_HOST_LIMIT, store=None,
+                               expected_periods=None, batch_size=TICKER_BATCH_SIZE):
+    """
+    Fetches and parses the four financial statement pages of every ticker concurrently (a Scraper of table_to_df,
+    so each page is parsed as soon as it arrives and the raw pages are not kept).
+    The tickers go batch_size at a time: the statements of a batch are (with a store) saved before the next batch
+    is fetched, so only one batch of statements is held in memory however long the list is.
+
+    Args:
+    - ticker_list (list of str): The tickers (e.g. the Symbol column of the IPO or NASDAQ-100 table).
+    - max_workers (int): Number of pages fetched at the same time.
+    - per_host (int): Maximum number of requests in flight to stockanalysis.com.
+    - store (FundamentalsStore, optional): Only the tickers that are missing or stale in the store are fetched,
+      their statements are saved to it and every company is read back from it on access (statements that
+      could not be fetched keep their stored copy).
+    - expected_periods (dict, optional): ticker -> latest fiscal period (e.g. 'FY 2024'), a stored ticker
+      with an older period is fetched again.
+    - batch_size (int): Tickers fetched and parsed together.
+
+    Returns:
+    - CompanyFinancials: Mapping of ticker -> statements (statements whose page could not be fetched are None).
+    """
+    to_fetch = ticker_list if store is None else store.stale_tickers(SOURCE_STOCKANALYSIS, ticker_list, expected_periods)
+    scraper = Scraper(table_to_df, max_workers=max_workers, per_host=per_host)  # Shared, so are the per-host limits
+
+    statements = {}  # Kept in memory only without a store
+    for start in range(0, len(to_fetch), batch_size):
+        batch = to_fetch[start:start + batch_size]
+        jobs = [(ticker, key, url) for ticker in batch for key, url in get_financials_urls(ticker).items()]
+        tables = scraper.scrape([url for _, _, url in jobs])  # None for a page that failed, the batch goes on
+
+        batch_statements = {ticker: {} for ticker in batch}
+        for (ticker, key, _), statement_df in zip(jobs, tables):
+            batch_statements[ticker][key] = statement_df
+
+        if store is None:
+            statements.update(batch_statements)
+            continue
+        for ticker, comp_df in batch_statements.items():
+            store.put_statements(ticker, comp_df)  # Statements that failed keep their stored copy
+
+    if store is None:
+        return CompanyFinancials(statements)
+
+    print(f"Financial statements: {len(to_fetch)} tickers fetched, {len(ticker_list) - len(to_fetch)} read from the store")
+    return CompanyFinancials({}, store=store, ticker_list=ticker_list)
+
+
 # Define the function to fetch and process financial data for a specific company
-def get_company_financials_as_df(ticker):
+def get_company_financials_as_df(ticker, store=None):
     # the functions gets a company ticker and returs a dictionary of financial tables (each as a dataframe)
-    financials_urls = {
-        'income': f"https://stockanalysis.com/stocks/{ticker}/financials/",
-        'balance_sheet': f"https://stockanalysis.com/stocks/{ticker}/financials/balance-sheet/",
-        'cash_flow': f"https://stockanalysis.com/stocks/{ticker}/financials/cash-flow-statement/",
-        'ratios': f"https://stockanalysis.com/stocks/{ticker}/financials/ratios/"
-    }
+    # the four pages are fetched concurrently (or read from the store when its copy is fresh)
+    return get_financials_for_tickers([ticker], store=store)[ticker]
+
+
+def index_statement(statement_df):
+    # metric name (first column, 'Fiscal Year') as the index and the periods as columns, so a value is
+    # a hash lookup (statement.at[metric, period]) instead of a boolean scan of the whole column
+    if statement_df is None:
+        return None
+    metric_column = statement_df.columns[0]
+    indexed = statement_df.set_index(metric_column)
+    indexed = indexed[indexed.index.notna()]  # The empty row left by the 'Period Ending' header row
+    return indexed[~indexed.index.duplicated()]  # A metric listed twice keeps its first row
 
-    df = {key: get_data_table(url) for key, url in financials_urls.items()}
-    return df
+
+def index_statements(comp_df):
+    return {key: index_statement(statement_df) for key, statement_df in comp_df.items()}
+
+
+def get_statement_value(indexed_statements, statement, metric, period):
+    # O(1) lookup in indexed statements (None when the statement, metric or period is missing)
+    table = indexed_statements.get(statement)
+    if table is None or metric not in table.index or period not in table.columns:
+        return None
+    return table.at[metric, period]
 
 
 def get_full_data_from_table_dfs(comp_df):
     # retunrs data from table dataframes is a fully dictionary (then you can accesss anything using this dictionary)
+    # one pass per table: every metric with its TTM value (Current for the ratios)
 
     full_data_dict = {}
-    for key in comp_df.keys():
-        table_categories_list = list(comp_df[key]['Year Ending'].values) # categories appearing in each table
-
-        full_data_dict[key] = {}
-        if key == 'ratios':
-            for category in table_categories_list:
-                full_data_dict[key][category] = comp_df[key][comp_df[key]['Fiscal Year'] == category]['Current'].values[0]
-        else:
-            for category in table_categories_list:
-                full_data_dict[key][category] = comp_df[key][comp_df[key]['Fiscal Year'] == category]['TTM'].values[0]
+    for key, statement_df in comp_df.items():
+        table = index_statement(statement_df)
+        period = SUMMARY_PERIODS.get(key, 'TTM')
+        if table is None or period not in table.columns:
+            full_data_dict[key] = {}  # The page could not be fetched
+            continue
+        full_data_dict[key] = dict(zip(table.index, table[period].tolist()))
 
     return full_data_dict
 
-# sp500_df = get_data_table(sp500_url)
-ipos_df = get_data_table(ipos_url)
-ticker_list = list(ipos_df['Symbol'].values)
+if __name__ == "__main__":
+    # sp500_df = get_data_table(sp500_url)
+    ipos_df = get_data_table(ipos_url)
+    ticker_list = list(ipos_df['Symbol'].values)
 
+    # All the statements of the IPO list, fetched concurrently and parsed batch by batch,
+    # and kept in the local store, so the next runs only fetch the companies whose data is out of date
+    store = FundamentalsStore()
+    ipos_financials = get_financials_for_tickers(ticker_list, store=store)
 
-dov_financials_df = get_company_financials_as_df(ticker='dov')
-dov_financials_df['ratios'][dov_financials_df['ratios']['Fiscal Year'] == 'Debt / Equity Ratio']['Current'].values[0]
+    dov_financials_df = get_company_financials_as_df(ticker='dov')
+    dov_indexed = index_statements(dov_financials_df)
+    dov_debt_to_equity = get_statement_value(dov_indexed, 'ratios', 'Debt / Equity Ratio', 'Current')
 
-full_data_dict = get_full_data_from_table_dfs(dov_financials_df)
+    full_data_dict = get_full_data_from_table_dfs(dov_financials_df)
+    http_cache.print_stats()
 
 
 # Changes:
@@ -0,0 +1,68 @@
+import re
+
+import numpy as np
+import pandas as pd
+
+
+### Numbers shown on the finance pages ("12.5%", "-0.3", "(1,234)", "$2.5B", "−2.0%", "N/A") to floats.
+### One grammar for every site: GuruFocus indicators are converted one value at a time, StockAnalysis
+### table columns all at once with the same regex.
+
+MISSING_VALUES = {'', 'N/A', 'NA', 'n/a', '-', '--', 'None', 'NaN'}
+SUFFIXES = {'K': 1e3, 'M': 1e6, 'B': 1e9, 'T': 1e12}
+NEGATIVE_SIGNS = ('-', '−')  # ASCII hyphen and the unicode minus some pages use
+
+# Optional sign or parentheses (accounting negatives), optional currency, digits with thousands separators,
+# an optional K/M/B/T multiplier and an optional percent sign (percentages stay in percent units: "12.5%" -> 12.5)
+VALUE_RE = re.compile(
+    r'^(?P<open>\()?(?P<sign>[-+−])?\$?'
+    r'(?P<number>\d[\d,]*(?:\.\d+)?|\.\d+)'
+    r'\s*(?P<suffix>[KMBT])?\s*%?(?P<close>\))?$'
+)
+
+
+def parse_value(text):
+    """
+    Converts a value text to a float.
+
+    Args:
+    - text (str): The value as shown on the page (e.g., "12.5%", "-0.3", "1,234", "$2.5B", "N/A").
+
+    Returns:
+    - float: The value (percentages in percent units, suffixes applied), NaN when missing or not a number.
+    """
+    if text is None:
+        return np.nan
+    if isinstance(text, (int, float)):
+        return float(text)
+    text = text.strip()
+    if text in MISSING_VALUES:
+        return np.nan
+    match = VALUE_RE.match(text)
+    if not match or bool(match.group('open')) != bool(match.group('close')):
+        return np.nan
+
+    value = float(match.group('number').replace(',', ''))
+    if match.group('suffix'):
+        value *= SUFFIXES[match.group('suffix')]
+    if match.group('open') or match.group('sign') in NEGATIVE_SIGNS:
+        value = -value
+    return value
+
+
+def parse_value_column(column):
+    """
+    Vectorized parse_value over a column of texts: one regex extraction over the whole column, then float math.
+
+    Returns:
+    - pd.Series: float64 values, NaN where a cell is missing or not a number.
+    """
+    parts = column.astype('string').str.strip().str.extract(VALUE_RE)
+    numbers = pd.to_numeric(parts['number'].str.replace(',', '', regex=False), errors='coerce').astype(float)
+    multipliers = parts['suffix'].map(SUFFIXES).astype(float).fillna(1.0)
+    negative = (parts['open'].notna() | parts['sign'].isin(NEGATIVE_SIGNS)).to_numpy(dtype=bool)
+    unbalanced = (parts['open'].notna() != parts['close'].notna()).to_numpy(dtype=bool)
+    values = (numbers * multipliers).to_numpy()
+    values = np.where(negative, -values, values)
+    values[unbalanced] = np.nan
+    return pd.Series(values, index=column.index, name=column.name)
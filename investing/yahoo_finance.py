@@ -1,32 +1,184 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
 import yfinance as yf
 # pip install yfinance
 # https://gist.github.com/quantra-go-algo/ac5180bf164a7894f70969fa563627b2
 
-def get_company_name_from_ticker(ticker):
-    stock = yf.Ticker(ticker)
-    company_info = stock.info
+### Company metadata (the yfinance .info dict) for many tickers at once:
+### - the tickers missing from the cache are resolved together (yf.Tickers) by a pool of workers
+### - the full info dicts are kept on disk (SQLite, compressed) for INFO_TTL seconds
+### - only the requested fields (e.g. longName) are kept in the in-memory LRU, not the whole payload
 
-    # Get the company name from the 'longName' field
-    company_name = company_info.get('longName', 'Company name not found')
+INFO_CACHE_PATH = os.path.join(os.path.expanduser('~'), '.cache', 'web_stuff', 'yf_info.sqlite')
+INFO_TTL = 24 * 3600  # Seconds a stored info dict is used before it is fetched again
+INFO_WORKERS = 8  # .info requests in flight at the same time
+MEMORY_CACHE_SIZE = 4096  # Projected entries kept in memory
+
+
+class InfoCache:
+    """
+    Two-level cache of yfinance info dicts: an in-memory LRU of projected dicts over an on-disk store of full ones.
+
+    Args:
+    - path (str): Path of the SQLite database file (None keeps the cache in memory only).
+    - ttl (float): Seconds a stored info dict is considered fresh.
+    - max_items (int): Maximum number of projected dicts in the memory LRU.
+    """
+
+    def __init__(self, path=INFO_CACHE_PATH, ttl=INFO_TTL, max_items=MEMORY_CACHE_SIZE):
+        self.ttl = ttl
+        self.max_items = max_items
+        self._memory = OrderedDict()  # (ticker, fields) -> (stored_at, projected dict)
+        self._lock = threading.Lock()
+        self._conn = None
+        if path:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+            self._conn.execute("CREATE TABLE IF NOT EXISTS info (ticker TEXT PRIMARY KEY, data BLOB, stored_at REAL)")
+            self._conn.commit()
+
+    @staticmethod
+    def project(info, fields):
+        return dict(info) if fields is None else {field: info.get(field) for field in fields}
+
+    def _remember(self, key, stored_at, projected):
+        # Called with the lock held
+        self._memory[key] = (stored_at, projected)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_items:
+            self._memory.popitem(last=False)
+
+    def get(self, ticker, fields):
+        """
+        Returns the projected info of a ticker if a fresh copy is cached, None otherwise.
+        """
+        key = (ticker, fields)
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry and now - entry[0] < self.ttl:
+                self._memory.move_to_end(key)
+                return entry[1]
+            if self._conn is None:
+                return None
+            row = self._conn.execute("SELECT data, stored_at FROM info WHERE ticker = ?", (ticker,)).fetchone()
+            if row is None or now - row[1] >= self.ttl:
+                return None
+            projected = self.project(json.loads(zlib.decompress(row[0])), fields)
+            self._remember(key, row[1], projected)
+            return projected
+
+    def put(self, ticker, info, fields):
+        """
+        Stores the full info dict of a ticker on disk and its projection in memory, returns the projection.
+        """
+        now = time.time()
+        projected = self.project(info, fields)
+        with self._lock:
+            if self._conn is not None:
+                data = zlib.compress(json.dumps(info, default=str).encode('utf-8'))
+                self._conn.execute("INSERT OR REPLACE INTO info VALUES (?, ?, ?)", (ticker, data, now))
+                self._conn.commit()
+            self._remember((ticker, fields), now, projected)
+        return projected
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_info_cache():
+    """
+    Returns the shared InfoCache (created on first use).
+    """
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = InfoCache()
+        return _cache
 
-    return company_name
+
+def _fetch_info(ticker_obj):
+    # A ticker whose info can't be fetched gets an empty dict instead of stopping the batch
+    try:
+        return ticker_obj.info or {}
+    except Exception as e:
+        print(f"Failed to fetch the info of {ticker_obj.ticker}: {e}")
+        return {}
+
+
+def get_company_info(ticker_list, fields=('longName',), max_workers=INFO_WORKERS):
+    """
+    Returns the yfinance info of many tickers, fetching only the ones that are not cached.
+
+    Args:
+    - ticker_list (list of str): The tickers.
+    - fields (tuple of str, optional): Info fields to return (None for the full info dict).
+    - max_workers (int): Number of info requests in flight at the same time.
+
+    Returns:
+    - dict: ticker -> {field: value} (None for the fields the ticker doesn't have).
+    """
+    fields = tuple(fields) if fields is not None else None
+    cache = get_info_cache()
+
+    results = {}
+    missing = []
+    for ticker in dict.fromkeys(ticker_list):  # Each ticker once, in order
+        cached = cache.get(ticker, fields)
+        if cached is None:
+            missing.append(ticker)
+        else:
+            results[ticker] = cached
+
+    if missing:
+        batch = yf.Tickers(' '.join(missing))
+        ticker_objs = [batch.tickers.get(ticker.upper()) or yf.Ticker(ticker) for ticker in missing]
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(missing))) as executor:
+            infos = list(executor.map(_fetch_info, ticker_objs))
+        for ticker, info in zip(missing, infos):
+            results[ticker] = cache.put(ticker, info, fields) if info else cache.project(info, fields)
+
+    return {ticker: results[ticker] for ticker in ticker_list}
+
+
+def get_company_names(ticker_list, max_workers=INFO_WORKERS):
+    """
+    Returns ticker -> company name (longName) for many tickers at once.
+    """
+    infos = get_company_info(ticker_list, fields=('longName',), max_workers=max_workers)
+    return {ticker: info.get('longName') or 'Company name not found' for ticker, info in infos.items()}
+
+
+def get_company_name_from_ticker(ticker):
+    # Get the company name from the 'longName' field
+    return get_company_names([ticker])[ticker]
 
 
 def print_all_data_from_ticker(ticker):
-    stock = yf.Ticker(ticker)
-    company_info = stock.info
+    company_info = get_company_info([ticker], fields=None)[ticker]
 
     # Print all data retrieved from the ticker
     for key, value in company_info.items():
         print(f"{key}: {value}")
 
 
-# Example usage
-ticker = 'AAPL'
-company_name = get_company_name_from_ticker(ticker)
-print(f"The company name for {ticker} is: {company_name}")
+if __name__ == "__main__":
+    # Example usage
+    ticker = 'AAPL'
+    company_name = get_company_name_from_ticker(ticker)
+    print(f"The company name for {ticker} is: {company_name}")
 
+    # Names of many companies at once
+    print(get_company_names(['AAPL', 'MSFT', 'NVDA', 'DOV']))
 
-# Example usage
-ticker = 'AAPL'
-print_all_data_from_ticker(ticker)
\ No newline at end of file
+    # Example usage
+    ticker = 'AAPL'
+    print_all_data_from_ticker(ticker)
@@ -0,0 +1,212 @@
+try:
+    from lxml import etree
+    from lxml import html as lxml_html  # pip install lxml
+except ImportError:
+    lxml_html = None
+
+try:
+    from cssselect import GenericTranslator  # pip install cssselect (only needed for CSS selectors)
+except ImportError:
+    GenericTranslator = None
+
+try:
+    from selectolax.lexbor import LexborHTMLParser as HTMLParser  # pip install selectolax
+except ImportError:
+    try:
+        from selectolax.parser import HTMLParser  # Older selectolax releases
+    except ImportError:
+        HTMLParser = None
+
+
+### Declarative extractors: a site describes what it wants from a page as a Spec of named Fields
+### (an XPath or CSS selector -> text or attribute -> typed value), instead of writing its own tree walk.
+### Selectors are compiled once, on first use, and evaluated by lxml in C.
+###
+###     BOOK_ROWS = Spec(items="//tr[@itemtype='http://schema.org/Book']", fields={
+###         'title': Field(f"(.//a[{has_class('bookTitle')}])[1]", text='nodes'),
+###         'href': Field(f"(.//a[{has_class('bookTitle')}])[1]/@href"),
+###     })
+###     rows = BOOK_ROWS.extract(html_content)  # [{'title': ..., 'href': ...}, ...]
+
+
+def has_class(name):
+    """
+    XPath condition matching elements whose class attribute contains the class name (like CSS .name).
+    """
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+def element_text(element, mode='content'):
+    """
+    Text of an element.
+
+    Args:
+    - element: An lxml element.
+    - mode (str): 'content' for the whole text stripped at both ends (like BeautifulSoup's .text.strip()),
+      'nodes' for every text node stripped and joined (like get_text(strip=True)).
+    """
+    if mode == 'content':
+        return element.text_content().strip()
+    parts = []
+    if element.text:
+        parts.append(element.text.strip())
+    for node in element.iterdescendants():
+        if isinstance(node.tag, str) and node.text:  # Comments are skipped
+            parts.append(node.text.strip())
+        if node.tail:
+            parts.append(node.tail.strip())
+    return ''.join(parts)
+
+
+### Parser backends: each site parser (goodreads.page_parsers, investing.gf_page_parser,
+### weather.weather_page_parser) implements its extraction with BeautifulSoup (the reference), lxml,
+### selectolax and a Spec, all giving the same output, and picks one by name with get_backend.
+
+
+def available_backends():
+    """
+    Returns the names of the parser backends that can be used in this environment.
+    """
+    backends = ['bs4']
+    if lxml_html is not None:
+        backends.append('lxml')
+    if HTMLParser is not None:
+        backends.append('selectolax')
+    if lxml_html is not None:
+        backends.append('spec')
+    return backends
+
+
+# The site specs are the default parsers, BeautifulSoup when lxml is not installed
+DEFAULT_BACKEND = 'spec' if lxml_html is not None else 'bs4'
+
+
+def get_backend(backends, backend):
+    """
+    Looks up a parser backend of a site.
+
+    Args:
+    - backends (dict): Backend name -> the site's parse function(s) for it.
+    - backend (str): 'bs4', 'lxml', 'selectolax' or 'spec'.
+
+    Raises:
+    - ValueError: If the backend name is unknown.
+    - ImportError: If the library of the backend is not installed.
+    """
+    if backend not in backends:
+        raise ValueError(f"Unknown parser backend: {backend} (choose from {', '.join(backends)})")
+    if backend not in available_backends():
+        library = 'lxml' if backend == 'spec' else backend  # Specs are evaluated by lxml
+        raise ImportError(f"Parser backend {backend} is not installed (pip install {library})")
+    return backends[backend]
+
+
+def selectolax_text(node):
+    """
+    Text of a selectolax node, like element_text(mode='nodes') (BeautifulSoup's get_text(strip=True)).
+    """
+    return node.text(deep=True, separator='', strip=True)
+
+
+def _compile(xpath=None, css=None):
+    if css is not None:
+        if GenericTranslator is None:
+            raise ImportError("CSS selectors need cssselect (pip install cssselect), or use an XPath")
+        xpath = GenericTranslator().css_to_xpath(css, prefix='descendant-or-self::')
+    return etree.XPath(xpath)
+
+
+class Field:
+    """
+    One value of a page.
+
+    Args:
+    - xpath (str, optional): XPath of the element(s), attribute(s) (.../@href) or text node(s) (.../text()),
+      relative to the page or to the item of the Spec (has_class builds class conditions).
+    - css (str, optional): CSS selector instead of an XPath (needs cssselect).
+    - attr (str, optional): Attribute of the matched element to return instead of its text.
+    - text (str): How the text of a matched element is read, 'content' or 'nodes' (see element_text).
+    - type (callable, optional): Converts the text (e.g. int, float, a parse function). A value that
+      can't be converted becomes the default.
+    - many (bool): Return the list of all the matches instead of the first one.
+    - default: Value when nothing matches (or the conversion fails).
+    """
+
+    def __init__(self, xpath=None, css=None, attr=None, text='content', type=None, many=False, default=None):
+        if (xpath is None) == (css is None):
+            raise ValueError("A Field needs exactly one of xpath and css")
+        self.xpath = xpath
+        self.css = css
+        self.attr = attr
+        self.text = text
+        self.type = type
+        self.many = many
+        self.default = default
+        self._compiled = None
+
+    def _value(self, match):
+        if isinstance(match, str):  # Attribute or text node result
+            raw = str(match)
+        elif self.attr is not None:
+            raw = match.get(self.attr)
+        else:
+            raw = element_text(match, self.text)
+        if raw is None:
+            return self.default
+        if self.type is None:
+            return raw
+        try:
+            return self.type(raw)
+        except (ValueError, TypeError, IndexError):
+            return self.default
+
+    def extract(self, node):
+        if self._compiled is None:
+            self._compiled = _compile(self.xpath, self.css)
+        matches = self._compiled(node)
+        if not isinstance(matches, list):  # string()/count() expressions
+            matches = [matches]
+        if self.many:
+            return [self._value(match) for match in matches]
+        return self._value(matches[0]) if matches else self.default
+
+
+class Spec:
+    """
+    Named fields of a page, or of every item of a page (list rows, table rows, ...).
+
+    Args:
+    - fields (dict): name -> Field, or a nested Spec (evaluated relative to the item).
+    - items (str, optional): XPath of the repeated items; extract then returns one dict per item.
+    - items_css (str, optional): CSS selector of the items instead of an XPath (needs cssselect).
+    """
+
+    def __init__(self, fields, items=None, items_css=None):
+        self.fields = fields
+        self.items = items
+        self.items_css = items_css
+        self._compiled_items = None
+
+    def _extract_fields(self, node):
+        return {name: field.extract(node) for name, field in self.fields.items()}
+
+    def extract(self, page):
+        """
+        Extracts the fields from a page.
+
+        Args:
+        - page (str, bytes or lxml element): The HTML content of the page, or an already parsed tree.
+
+        Returns:
+        - dict (name -> value), or list of dict when the spec has items.
+        """
+        if lxml_html is None:
+            raise ImportError("Extractor specs need lxml (pip install lxml)")
+        node = lxml_html.fromstring(page) if isinstance(page, (str, bytes)) else page
+        if self.items is None and self.items_css is None:
+            return self._extract_fields(node)
+        if self._compiled_items is None:
+            self._compiled_items = _compile(self.items, self.items_css)
+        return [self._extract_fields(item) for item in self._compiled_items(node)]
+
+    __call__ = extract  # A Spec can be used wherever a parse function (html -> data) is expected
@@ -0,0 +1,43 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from scraping.rate_limit import HostLimiter
+
+
+### Bounded-concurrency fetch engine: runs many blocking fetches in a thread pool
+### while respecting a per-host concurrency cap and a token-bucket rate limit
+
+
+class ConcurrentFetcher:
+    """
+    Fetches many URLs in parallel with a bounded thread pool.
+
+    Args:
+    - max_workers (int): Total number of worker threads (requests in flight across all hosts).
+    - per_host (int): Maximum number of concurrent requests to a single host.
+    - rate (float, optional): Requests per second allowed per host (None for no rate limit).
+    - burst (int): Number of requests allowed to go out back-to-back before the rate limit applies.
+    """
+
+    def __init__(self, max_workers=16, per_host=8, rate=None, burst=1):
+        self.max_workers = max_workers
+        self.limiter = HostLimiter(per_host=per_host, rate=rate, burst=burst)
+
+    def map(self, func, urls):
+        """
+        Calls func(url) for every url concurrently.
+
+        Args:
+        - func (callable): A blocking function taking a URL (e.g. fetch_page_content or fetch_book_details).
+        - urls (list of str): The URLs to process.
+
+        Returns:
+        - list: The results of func, in the same order as urls.
+        """
+        urls = list(urls)
+        if not urls:
+            return []
+
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(urls))) as executor:
+            # executor.map yields results in submission order, so the original list order is kept
+            return list(executor.map(lambda url: self.limiter.run(url, func), urls))
+
@@ -0,0 +1,352 @@
+import functools
+import hashlib
+import os
+import pickle
+import sqlite3
+import threading
+import time
+import types
+import zlib
+
+from scraping import http_client
+
+
+### Persistent on-disk HTTP response cache (SQLite, zlib-compressed bodies)
+### - fresh entries (younger than the TTL) are served without touching the network
+### - stale entries are revalidated with If-None-Match / If-Modified-Since, a 304 only refreshes the entry
+### - memoize_parse remembers parse results per page content, so an unchanged page is not parsed again
+### - the least recently used entries are evicted once the cache grows past max_bytes
+
+CACHE_PATH = os.path.join(os.path.expanduser('~'), '.cache', 'web_stuff', 'http_cache.sqlite')
+DEFAULT_TTL = 12 * 3600  # Seconds an entry is served without revalidation
+DEFAULT_MAX_BYTES = 500 * 1024 * 1024  # Size of the stored (compressed) bodies and parse results before eviction
+EVICT_TO = 0.9  # Eviction frees space down to this fraction of max_bytes, so it doesn't run again on every write
+ACCESS_FLUSH_SIZE = 200  # Reads whose last_access is written to the database in one batch
+ACCESS_FLUSH_INTERVAL = 30  # Seconds after which the pending last_access updates are written anyway
+
+
+class CachedResponse:
+    """
+    Minimal response object returned by the cache (same attributes the scrapers read from requests.Response).
+
+    Args:
+    - url (str): The requested URL.
+    - status_code (int): The HTTP status code (200 for anything served from the cache).
+    - text (str): The body of the response.
+    - source (str): 'hit', 'revalidated' or 'miss'.
+    """
+
+    def __init__(self, url, status_code, text, source):
+        self.url = url
+        self.status_code = status_code
+        self.text = text
+        self.source = source
+
+
+class ResponseCache:
+    """
+    SQLite-backed response cache keyed by URL.
+
+    Args:
+    - path (str): Path of the SQLite database file.
+    - ttl (float): Seconds an entry is considered fresh.
+    - max_bytes (int): Maximum total size of the stored data before least recently used entries are evicted.
+    """
+
+    def __init__(self, path=CACHE_PATH, ttl=DEFAULT_TTL, max_bytes=DEFAULT_MAX_BYTES):
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.stats = {'hits': 0, 'misses': 0, 'revalidated': 0, 'parse_hits': 0, 'parse_misses': 0}
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS responses (
+                url TEXT PRIMARY KEY,
+                etag TEXT,
+                last_modified TEXT,
+                body BLOB,
+                size INTEGER,
+                stored_at REAL,
+                last_access REAL
+            );
+            CREATE TABLE IF NOT EXISTS parsed (
+                key TEXT PRIMARY KEY,
+                result BLOB,
+                size INTEGER,
+                last_access REAL
+            );
+        """)
+        self._conn.commit()
+
+        # Running total of the stored sizes (summed once here, then updated by every write and eviction)
+        self._total_bytes = self._conn.execute(
+            "SELECT (SELECT COALESCE(SUM(size), 0) FROM responses) + (SELECT COALESCE(SUM(size), 0) FROM parsed)"
+        ).fetchone()[0]
+        # Reads only record their access time here, it is written to the database in batches
+        self._pending_access = {}  # (table, key) -> last access time
+        self._access_flushed_at = time.time()
+
+    def _count(self, key):
+        with self._lock:
+            self.stats[key] += 1
+
+    def _lookup(self, url):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT etag, last_modified, body, stored_at FROM responses WHERE url = ?", (url,)
+            ).fetchone()
+            if row:
+                self._record_access('responses', url)
+        return row
+
+    def _record_access(self, table, key):
+        # Called with the lock held
+        now = time.time()
+        self._pending_access[table, key] = now
+        if len(self._pending_access) >= ACCESS_FLUSH_SIZE or now - self._access_flushed_at > ACCESS_FLUSH_INTERVAL:
+            self._flush_access()
+
+    def _flush_access(self):
+        # Called with the lock held: writes the pending last_access times in one transaction
+        for table, column in (('responses', 'url'), ('parsed', 'key')):
+            updates = [(accessed_at, key) for (t, key), accessed_at in self._pending_access.items() if t == table]
+            if updates:
+                self._conn.executemany(f"UPDATE {table} SET last_access = ? WHERE {column} = ?", updates)
+        self._conn.commit()
+        self._pending_access.clear()
+        self._access_flushed_at = time.time()
+
+    def _write(self, table, column, key, size, row):
+        # Called with the lock held: inserts or replaces the row of key and keeps the running total up to date
+        old = self._conn.execute(f"SELECT size FROM {table} WHERE {column} = ?", (key,)).fetchone()
+        self._conn.execute(f"INSERT OR REPLACE INTO {table} VALUES ({', '.join('?' * len(row))})", row)
+        self._conn.commit()
+        self._pending_access.pop((table, key), None)
+        self._total_bytes += size - (old[0] if old else 0)
+        if self._total_bytes > self.max_bytes:
+            self._evict()
+
+    def _store(self, url, response):
+        body = zlib.compress(response.text.encode('utf-8'))
+        now = time.time()
+        with self._lock:
+            self._write('responses', 'url', url, len(body),
+                        (url, response.headers.get('ETag'), response.headers.get('Last-Modified'), body, len(body), now, now))
+
+    def _touch(self, url):
+        now = time.time()
+        with self._lock:
+            self._conn.execute("UPDATE responses SET stored_at = ?, last_access = ? WHERE url = ?", (now, now, url))
+            self._conn.commit()
+
+    def _evict(self):
+        # Called with the lock held once the total passes max_bytes: drops least recently used rows
+        # (responses and parse results) until the total is under EVICT_TO * max_bytes
+        self._flush_access()
+        target = self.max_bytes * EVICT_TO
+        rows = self._conn.execute("""
+            SELECT 'responses', url, size, last_access FROM responses
+            UNION ALL
+            SELECT 'parsed', key, size, last_access FROM parsed
+            ORDER BY last_access
+        """).fetchall()
+        for table, key, size, _ in rows:
+            if self._total_bytes <= target:
+                break
+            column = 'url' if table == 'responses' else 'key'
+            self._conn.execute(f"DELETE FROM {table} WHERE {column} = ?", (key,))
+            self._total_bytes -= size
+        self._conn.commit()
+
+    def get(self, url, headers=None, ttl=None, timeout=None):
+        """
+        Fetches a URL through the cache.
+
+        Args:
+        - url (str): The URL to fetch.
+        - headers (dict, optional): Extra headers for the request.
+        - ttl (float, optional): Overrides the cache TTL for this request (0 always revalidates).
+        - timeout (float or tuple, optional): Overrides the client timeout for a network request.
+
+        Returns:
+        - CachedResponse or requests.Response: A CachedResponse for hits and revalidations,
+          the network response otherwise (only 200 responses are stored).
+        """
+        ttl = self.ttl if ttl is None else ttl
+        row = self._lookup(url)
+
+        request_headers = dict(headers or {})
+        if row:
+            etag, last_modified, body, stored_at = row
+            if time.time() - stored_at < ttl:
+                self._count('hits')
+                return CachedResponse(url, 200, zlib.decompress(body).decode('utf-8'), 'hit')
+
+            # Stale entry: ask the server whether it changed
+            if etag:
+                request_headers['If-None-Match'] = etag
+            if last_modified:
+                request_headers['If-Modified-Since'] = last_modified
+
+        response = http_client.get(url, headers=request_headers, timeout=timeout)
+
+        if row and response.status_code == 304:
+            self._count('revalidated')
+            self._touch(url)
+            return CachedResponse(url, 200, zlib.decompress(row[2]).decode('utf-8'), 'revalidated')
+
+        self._count('misses')
+        if response.status_code == 200:
+            self._store(url, response)
+        return response
+
+    def get_parsed(self, key):
+        with self._lock:
+            row = self._conn.execute("SELECT result FROM parsed WHERE key = ?", (key,)).fetchone()
+            if row:
+                self._record_access('parsed', key)
+        return None if row is None else pickle.loads(zlib.decompress(row[0]))
+
+    def put_parsed(self, key, result):
+        blob = zlib.compress(pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL))
+        with self._lock:
+            self._write('parsed', 'key', key, len(blob), (key, blob, len(blob), time.time()))
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.execute("DELETE FROM parsed")
+            self._conn.commit()
+            self._pending_access.clear()
+            self._total_bytes = 0
+
+    def close(self):
+        with self._lock:
+            self._flush_access()
+            self._conn.close()
+
+
+_settings = {'enabled': True, 'path': CACHE_PATH, 'ttl': DEFAULT_TTL, 'max_bytes': DEFAULT_MAX_BYTES}
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def configure(**settings):
+    """
+    Changes the settings of the shared cache (enabled, path, ttl, max_bytes) and reopens it on next use.
+    """
+    global _cache
+    unknown = set(settings) - set(_settings)
+    if unknown:
+        raise ValueError(f"Unknown cache settings: {', '.join(sorted(unknown))}")
+
+    with _cache_lock:
+        _settings.update(settings)
+        if _cache is not None:
+            _cache.close()
+        _cache = None
+
+
+def get_cache():
+    """
+    Returns the shared ResponseCache, or None if caching is disabled.
+    """
+    global _cache
+    if not _settings['enabled']:
+        return None
+    with _cache_lock:
+        if _cache is None:
+            _cache = ResponseCache(_settings['path'], _settings['ttl'], _settings['max_bytes'])
+        return _cache
+
+
+def get(url, headers=None, ttl=None, timeout=None):
+    """
+    Sends a GET request through the shared cache (falls back to a plain shared-session request when disabled).
+
+    Args:
+    - url (str): The URL to fetch.
+    - headers (dict, optional): Extra headers for the request.
+    - ttl (float, optional): Overrides the cache TTL for this request.
+    - timeout (float or tuple, optional): Overrides the client timeout for a network request.
+
+    Returns:
+    - CachedResponse or requests.Response: An object with status_code and text.
+    """
+    cache = get_cache()
+    if cache is None:
+        return http_client.get(url, headers=headers, timeout=timeout)
+    return cache.get(url, headers=headers, ttl=ttl, timeout=timeout)
+
+
+def _code_fingerprint(code):
+    # Hash of the bytecode, constants and names of a function (and of its nested functions and lambdas).
+    # Reprs of code objects (memory addresses) and frozensets (hash-seed order) differ between runs,
+    # so those are expanded instead.
+    parts = [code.co_code, repr(code.co_names).encode('utf-8')]
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            parts.append(_code_fingerprint(const).encode('utf-8'))
+        elif isinstance(const, frozenset):
+            parts.append(repr(sorted(repr(item) for item in const)).encode('utf-8'))
+        else:
+            parts.append(repr(const).encode('utf-8'))
+    return hashlib.sha1(b'\0'.join(parts)).hexdigest()[:12]
+
+
+def memoize_parse(func=None, *, version=None, params=None):
+    """
+    Decorator for parse functions whose first argument is the page content.
+    The result is stored under the hash of the content, the function's code (bytecode, constants and names),
+    its other arguments, the version and the params, so a page that was served from the cache or revalidated
+    with a 304 is not parsed again. The result must be picklable.
+
+    Only the decorated function's own code is hashed: bump the version when a parser it calls changes, and
+    pass params for the module settings its result depends on.
+
+    Args:
+    - version (str or int, optional): Changing it invalidates the stored results.
+    - params (callable, optional): Returns the (repr-able) values the result depends on besides the arguments,
+      read on every call, e.g. lambda: BASE_URL.
+
+    Can be used as @memoize_parse or @memoize_parse(version=2, params=lambda: BASE_URL).
+    """
+    if func is None:
+        return functools.partial(memoize_parse, version=version, params=params)
+
+    code_hash = _code_fingerprint(func.__code__)  # Parser changes invalidate old results
+
+    @functools.wraps(func)
+    def wrapper(page_content, *args, **kwargs):
+        cache = get_cache()
+        if cache is None or not page_content:
+            return func(page_content, *args, **kwargs)
+
+        extra = params() if params is not None else None
+        key_source = (f"{func.__module__}.{func.__qualname__}:{code_hash}:{version!r}:{extra!r}:"
+                      f"{args!r}:{sorted(kwargs.items())!r}:")
+        key = hashlib.sha1(key_source.encode('utf-8') + page_content.encode('utf-8')).hexdigest()
+
+        result = cache.get_parsed(key)
+        if result is not None:
+            cache._count('parse_hits')
+            return result
+
+        cache._count('parse_misses')
+        result = func(page_content, *args, **kwargs)
+        cache.put_parsed(key, result)
+        return result
+
+    return wrapper
+
+
+def print_stats():
+    cache = get_cache()
+    if cache is None:
+        return
+    stats = cache.stats
+    print(f"HTTP cache: {stats['hits']} hits, {stats['misses']} misses, {stats['revalidated']} revalidated (304) - "
+          f"parse results reused: {stats['parse_hits']}, parsed: {stats['parse_misses']}")
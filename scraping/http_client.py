@@ -0,0 +1,203 @@
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util.request import ACCEPT_ENCODING
+from urllib3.util.retry import Retry
+
+
+### Shared HTTP client for all the scrapers:
+### one pooled keep-alive session, compressed transfers, timeouts and retries with exponential backoff
+
+# Set up headers to mimic a browser request to avoid blocking
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+    'Accept-Encoding': ACCEPT_ENCODING,  # gzip/deflate, plus br when brotli is installed
+}
+
+DEFAULT_TIMEOUT = (5, 30)  # (connect, read) timeouts in seconds
+RETRY_STATUSES = (429, 500, 502, 503, 504)  # Statuses that are retried with exponential backoff
+
+_config = {
+    'timeout': DEFAULT_TIMEOUT,
+    'total_retries': 3,
+    'backoff_factor': 0.5,  # Sleeps 0.5s, 1s, 2s, ... between retries (Retry-After is respected for 429/503)
+    'pool_connections': 10,  # Number of hosts to keep connection pools for
+    'pool_maxsize': 16,  # Keep-alive connections kept per host
+}
+
+_session = None
+_session_lock = threading.Lock()
+
+_scheduler = None  # Optional AdaptiveRateLimiter pacing every request
+
+_stats = {'requests': 0, 'connections_opened': 0}
+_stats_lock = threading.Lock()
+
+
+def _count(key):
+    with _stats_lock:
+        _stats[key] += 1
+
+
+class _CountingPoolMixin:
+    # _get_conn is called once per request; it returns a pooled keep-alive connection when one is idle
+    # and only falls back to _new_conn (new TCP/TLS handshake) when the pool is empty
+    def _get_conn(self, timeout=None):
+        _count('requests')
+        return super()._get_conn(timeout=timeout)
+
+    def _new_conn(self):
+        _count('connections_opened')
+        return super()._new_conn()
+
+
+class _CountingHTTPConnectionPool(_CountingPoolMixin, HTTPConnectionPool):
+    pass
+
+
+class _CountingHTTPSConnectionPool(_CountingPoolMixin, HTTPSConnectionPool):
+    pass
+
+
+class _PooledAdapter(HTTPAdapter):
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': _CountingHTTPConnectionPool,
+            'https': _CountingHTTPSConnectionPool,
+        }
+
+
+def _build_session():
+    retry = Retry(
+        total=_config['total_retries'],
+        backoff_factor=_config['backoff_factor'],
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=frozenset(['GET', 'HEAD']),
+        respect_retry_after_header=True,
+        raise_on_status=False,  # Hand the last response back to the caller instead of raising
+    )
+    adapter = _PooledAdapter(
+        pool_connections=_config['pool_connections'],
+        pool_maxsize=_config['pool_maxsize'],
+        max_retries=retry,
+    )
+
+    session = requests.Session()
+    session.headers.update(DEFAULT_HEADERS)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+def get_session():
+    """
+    Returns the shared requests.Session (created on first use).
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = _build_session()
+        return _session
+
+
+def configure(**options):
+    """
+    Changes the client settings and rebuilds the shared session.
+
+    Args:
+    - options: Any of timeout, total_retries, backoff_factor, pool_connections, pool_maxsize.
+    """
+    global _session
+    unknown = set(options) - set(_config)
+    if unknown:
+        raise ValueError(f"Unknown client options: {', '.join(sorted(unknown))}")
+
+    with _session_lock:
+        _config.update(options)
+        if _session is not None:
+            _session.close()
+        _session = None
+
+
+def set_scheduler(scheduler):
+    """
+    Paces every request of the shared client with an adaptive per-host scheduler.
+
+    Args:
+    - scheduler (AdaptiveRateLimiter or None): The scheduler to use (None sends requests as fast as they come).
+    """
+    global _scheduler
+    _scheduler = scheduler
+
+
+def _parse_retry_after(value):
+    # Retry-After is either a number of seconds or an HTTP date
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def _report_to_scheduler(scheduler, url, response, sent_at):
+    # Throttled answers that urllib3 already retried only show up in the retry history
+    retries = getattr(response.raw, 'retries', None)
+    statuses = [entry.status for entry in getattr(retries, 'history', ()) or ()]
+    statuses.append(response.status_code)
+    throttled = any(status in scheduler.THROTTLE_STATUSES for status in statuses)
+
+    retry_after = None
+    if response.status_code in scheduler.THROTTLE_STATUSES:
+        retry_after = _parse_retry_after(response.headers.get('Retry-After'))
+    scheduler.feedback(url, throttled, retry_after, sent_at)
+
+
+def _send(method, url, headers, timeout, **kwargs):
+    scheduler = _scheduler
+    if scheduler is not None:
+        sent_at = scheduler.acquire(url)
+    response = get_session().request(method, url, headers=headers, timeout=timeout or _config['timeout'], **kwargs)
+    if scheduler is not None:
+        _report_to_scheduler(scheduler, url, response, sent_at)
+    return response
+
+
+def get(url, headers=None, timeout=None, **kwargs):
+    """
+    Sends a GET request through the shared session.
+
+    Args:
+    - url (str): The URL to fetch.
+    - headers (dict, optional): Extra headers for this request (merged over DEFAULT_HEADERS).
+    - timeout (float or tuple, optional): Overrides the configured timeout.
+
+    Returns:
+    - requests.Response: The response (after retries on 429/5xx).
+    """
+    return _send('GET', url, headers, timeout, **kwargs)
+
+
+def get_stats():
+    """
+    Returns the connection counters: requests sent, connections opened and connections reused.
+    """
+    with _stats_lock:
+        stats = dict(_stats)
+    stats['connections_reused'] = stats['requests'] - stats['connections_opened']
+    return stats
+
+
+def print_stats():
+    stats = get_stats()
+    print(f"HTTP requests: {stats['requests']} - connections opened: {stats['connections_opened']}, "
+          f"reused: {stats['connections_reused']}")
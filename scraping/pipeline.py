@@ -0,0 +1,146 @@
+import os
+import queue
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+from scraping.rate_limit import HostLimiter
+
+
+### Staged producer/consumer pipeline: fetching, parsing and writing run at the same time instead of in turns.
+###   fetch threads --(bounded queue of raw pages)--> dispatcher --> parser processes --> writer thread
+### - the fetch threads stop when the page queue is full, and no more than 2 pages per parser process are
+###   being parsed or waiting to be written, so memory stays bounded however many pages there are
+### - throughput approaches the slowest stage (network or cores x parse rate) instead of their sum
+
+_DONE = object()
+
+
+class Pipeline:
+    """
+    Fetches pages in threads, parses them in a process pool and hands the results to a single writer thread.
+
+    Args:
+    - fetch (callable): key -> page content (None when the page is not found). Runs in the fetch threads.
+    - parse (callable): page content -> data. Runs in the parser processes, so it has to be picklable
+      (a module-level function or a functools.partial of one).
+    - write (callable): (key, data) -> None. Runs in the writer thread, in the order the parses finish.
+    - on_error (callable, optional): (key, reason) for the keys that could not be fetched or parsed (writer thread).
+    - url (callable, optional): key -> URL, used for the per-host limits (the key is the URL by default).
+    - fetch_workers (int): Pages fetched at the same time.
+    - per_host (int): Maximum number of concurrent requests to a single host.
+    - rate (float, optional): Requests per second allowed per host (None for no rate limit).
+    - burst (int): Burst size for the rate limit.
+    - parse_workers (int, optional): Number of parser processes (None for one per CPU core).
+    - queue_size (int): Fetched pages that can wait for a parser before the fetch threads stop.
+    """
+
+    def __init__(self, fetch, parse, write, on_error=None, url=None, fetch_workers=16, per_host=8, rate=None,
+                 burst=1, parse_workers=None, queue_size=64):
+        self.fetch = fetch
+        self.parse = parse
+        self.write = write
+        self.on_error = on_error
+        self.url = url or (lambda key: key)
+        self.fetch_workers = fetch_workers
+        self.limiter = HostLimiter(per_host=per_host, rate=rate, burst=burst)
+        self.parse_workers = parse_workers or os.cpu_count() or 1
+        self.queue_size = queue_size
+        self.stats = {'fetched': 0, 'parsed': 0, 'failed': 0}
+
+    ############# Stages
+
+    def _fetch_key(self, url, key):
+        # HostLimiter.run passes the url first, fetch only takes the key
+        return self.fetch(key)
+
+    def _fetch_stage(self, keys, lock, pages):
+        while True:
+            with lock:
+                key = next(keys, _DONE)
+            if key is _DONE:
+                break
+            try:
+                content = self.limiter.run(self.url(key), self._fetch_key, key)
+            except Exception as e:  # Timeouts and connection errors only fail this key
+                pages.put((key, None, f"fetch error: {e}"))
+                continue
+            pages.put((key, content, None if content else "page not found"))
+        pages.put(_DONE)
+
+    @staticmethod
+    def _parsed(results, key, future):
+        # Called by the process pool when a parse finishes, must not block
+        try:
+            results.put((key, future.result(), None, True))
+        except Exception as e:
+            results.put((key, None, f"parse error: {e!r}", True))
+
+    def _write_stage(self, results, parse_slots, errors):
+        while True:
+            item = results.get()
+            if item is _DONE:
+                break
+            key, data, reason, parsed = item
+            try:
+                if reason is None:
+                    self.stats['parsed'] += 1
+                    self.write(key, data)
+                else:
+                    self.stats['failed'] += 1
+                    if self.on_error is not None:
+                        self.on_error(key, reason)
+            except Exception as e:  # Reported once the pipeline has stopped, the other pages still go through
+                errors.append(e)
+            finally:
+                if parsed:
+                    parse_slots.release()
+
+    def run(self, keys):
+        """
+        Runs every key through the pipeline and returns once all the results are written.
+
+        Returns:
+        - dict: Counts of pages fetched, parsed (and written) and failed.
+        """
+        keys = list(keys)
+        self.stats = {'fetched': 0, 'parsed': 0, 'failed': 0}
+        if not keys:
+            return self.stats
+
+        pages = queue.Queue(maxsize=self.queue_size)
+        results = queue.Queue()  # Bounded by parse_slots: parses in flight + results not written yet
+        parse_slots = threading.BoundedSemaphore(2 * self.parse_workers)
+        write_errors = []
+
+        key_iter, key_lock = iter(keys), threading.Lock()
+        n_fetchers = min(self.fetch_workers, len(keys))
+        fetchers = [threading.Thread(target=self._fetch_stage, args=(key_iter, key_lock, pages), daemon=True)
+                    for _ in range(n_fetchers)]
+        writer = threading.Thread(target=self._write_stage, args=(results, parse_slots, write_errors), daemon=True)
+        for thread in fetchers + [writer]:
+            thread.start()
+
+        # Dispatcher: raw pages go to the parser processes as soon as a slot is free
+        with ProcessPoolExecutor(max_workers=self.parse_workers) as parse_pool:
+            finished_fetchers = 0
+            while finished_fetchers < n_fetchers:
+                item = pages.get()
+                if item is _DONE:
+                    finished_fetchers += 1
+                    continue
+                key, content, reason = item
+                if reason is not None:
+                    results.put((key, None, reason, False))
+                    continue
+                self.stats['fetched'] += 1
+                parse_slots.acquire()  # Waits while the parsers (or the writer) are behind
+                future = parse_pool.submit(self.parse, content)
+                future.add_done_callback(partial(self._parsed, results, key))
+
+        results.put(_DONE)  # Every parse has finished (the pool was shut down), and its result was queued
+        writer.join()
+        if write_errors:
+            raise write_errors[0]
+        return self.stats
+
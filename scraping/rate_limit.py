@@ -0,0 +1,162 @@
+import threading
+import time
+from urllib.parse import urlsplit
+
+
+### Shared rate limiting helpers for the scrapers (token bucket + per-host concurrency cap)
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket rate limiter.
+
+    Args:
+    - rate (float): Tokens added per second (the sustained request rate).
+    - capacity (int): Maximum number of tokens that can be stored (the allowed burst).
+    """
+
+    def __init__(self, rate, capacity=1):
+        self.rate = float(rate)
+        self.capacity = max(1, int(capacity))
+        self._tokens = float(self.capacity)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+        self._last = now
+
+    def acquire(self):
+        """
+        Blocks until a token is available and consumes it.
+        """
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate  # Time until the next token is available
+            time.sleep(wait)
+
+
+class HostLimiter:
+    """
+    Caps the number of requests in flight per host, optionally combined with a per-host token bucket.
+
+    Args:
+    - per_host (int): Maximum number of concurrent requests to a single host.
+    - rate (float, optional): Requests per second allowed per host (None for no rate limit).
+    - burst (int): Burst size for the per-host token bucket.
+    """
+
+    def __init__(self, per_host=4, rate=None, burst=1):
+        self.per_host = per_host
+        self.rate = rate
+        self.burst = burst
+        self._semaphores = {}
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def _get_host_state(self, host):
+        with self._lock:
+            if host not in self._semaphores:
+                self._semaphores[host] = threading.BoundedSemaphore(self.per_host)
+                if self.rate:
+                    self._buckets[host] = TokenBucket(self.rate, self.burst)
+            return self._semaphores[host], self._buckets.get(host)
+
+    def run(self, url, func, *args, **kwargs):
+        """
+        Runs func(url, *args, **kwargs) once a concurrency slot and a rate token for the url's host are available.
+        """
+        semaphore, bucket = self._get_host_state(urlsplit(url).netloc)
+        with semaphore:
+            if bucket:
+                bucket.acquire()
+            return func(url, *args, **kwargs)
+
+
+class AdaptiveRateLimiter:
+    """
+    Per-host request pacing that adapts to the server (AIMD):
+    the rate grows additively while responses are healthy and is cut multiplicatively on 429/503,
+    and a Retry-After header pauses the host for the time the server asked for.
+
+    Args:
+    - start_rate (float): Initial requests per second per host.
+    - min_rate (float): Lowest rate the limiter backs off to.
+    - max_rate (float): Highest rate the limiter speeds up to.
+    - increase (float): Requests per second added after each healthy response.
+    - decrease_factor (float): Multiplier applied to the rate after a throttled response.
+    """
+
+    THROTTLE_STATUSES = (429, 503)
+
+    def __init__(self, start_rate=1.0, min_rate=0.1, max_rate=10.0, increase=0.1, decrease_factor=0.5):
+        self.start_rate = start_rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase = increase
+        self.decrease_factor = decrease_factor
+        self.throttled = 0  # Number of throttled responses seen
+        self._hosts = {}
+        self._lock = threading.Lock()
+
+    def _get_host(self, url):
+        host = urlsplit(url).netloc
+        with self._lock:
+            if host not in self._hosts:
+                self._hosts[host] = {'rate': self.start_rate, 'next_time': time.monotonic(),
+                                     'last_decrease': 0.0, 'lock': threading.Lock()}
+            return self._hosts[host]
+
+    def acquire(self, url):
+        """
+        Blocks until a request to the url's host may be sent at the host's current rate.
+
+        Returns:
+        - float: The time.monotonic() time the request is sent at (to pass back to feedback).
+        """
+        state = self._get_host(url)
+        with state['lock']:
+            now = time.monotonic()
+            start = max(now, state['next_time'])
+            state['next_time'] = start + 1 / state['rate']  # Reserve the slot, so concurrent callers queue up
+        if start > now:
+            time.sleep(start - now)
+        return start
+
+    def feedback(self, url, throttled, retry_after=None, sent_at=None):
+        """
+        Adjusts the host's rate after a response.
+
+        Args:
+        - url (str): The requested URL.
+        - throttled (bool): True if the server answered 429/503 (including responses that were retried).
+        - retry_after (float, optional): Seconds the server asked to wait (Retry-After header).
+        - sent_at (float, optional): The time returned by acquire for this request.
+        """
+        state = self._get_host(url)
+        with state['lock']:
+            now = time.monotonic()
+            if throttled:
+                # Requests already in flight when the rate was cut were sent at the old rate:
+                # cut once per throttling episode, not once per throttled response
+                if sent_at is None or sent_at >= state['last_decrease']:
+                    state['rate'] = max(self.min_rate, state['rate'] * self.decrease_factor)
+                    state['last_decrease'] = now
+                state['next_time'] = max(state['next_time'], now + (retry_after or 1 / state['rate']))
+            else:
+                state['rate'] = min(self.max_rate, state['rate'] + self.increase)
+        if throttled:
+            with self._lock:
+                self.throttled += 1
+
+    def get_rates(self):
+        """
+        Returns the current requests per second of every host seen so far.
+        """
+        with self._lock:
+            return {host: state['rate'] for host, state in self._hosts.items()}
@@ -0,0 +1,78 @@
+import requests
+
+from scraping import http_cache
+from scraping.fetcher import ConcurrentFetcher
+
+
+### One engine for every site: pages go through the shared pooled session, the HTTP cache and the per-host
+### limits of ConcurrentFetcher, and each page is handed to the site's extractor (a Spec from scraping.extract,
+### or any parse function taking the HTML content).
+
+
+def fetch_html(url, ttl=None, timeout=None, headers=None):
+    """
+    Fetches the HTML content of a page through the HTTP cache.
+
+    Args:
+    - url (str): The URL of the page.
+    - ttl (float, optional): Seconds a cached copy is used without revalidation (the cache default if None).
+    - timeout (float or tuple, optional): Request timeout (the client default if None).
+    - headers (dict, optional): Extra headers for this request.
+
+    Returns:
+    - str: The HTML content of the page if the request succeeded, None otherwise.
+    """
+    response = http_cache.get(url, headers=headers, ttl=ttl, timeout=timeout)
+    if response.status_code == 200:
+        return response.text
+    print(f"Failed to retrieve data. Status code: {response.status_code}")
+    return None
+
+
+class Scraper:
+    """
+    Fetches pages concurrently and extracts their data.
+
+    Args:
+    - extractor (Spec or callable): Turns the HTML content of a page into data.
+    - max_workers (int): Pages fetched at the same time.
+    - per_host (int): Maximum number of concurrent requests to a single host.
+    - rate (float, optional): Requests per second allowed per host (None for no rate limit).
+    - burst (int): Burst size for the rate limit.
+    - ttl (float, optional): Cache TTL of the pages (the cache default if None, 0 always revalidates).
+    - timeout (float or tuple, optional): Request timeout.
+    """
+
+    def __init__(self, extractor, max_workers=16, per_host=8, rate=None, burst=1, ttl=None, timeout=None):
+        self.extractor = extractor
+        self.ttl = ttl
+        self.timeout = timeout
+        self.fetcher = ConcurrentFetcher(max_workers=max_workers, per_host=per_host, rate=rate, burst=burst)
+
+    def scrape_url(self, url):
+        """
+        Fetches one page and extracts its data, None if the page could not be fetched or parsed.
+        """
+        try:
+            html_content = fetch_html(url, ttl=self.ttl, timeout=self.timeout)
+        except requests.RequestException as e:
+            print(f"Failed to reach the URL: {url}")
+            print(f"Error: {e}")
+            return None
+        if html_content is None:
+            return None
+        try:
+            return self.extractor(html_content)
+        except Exception as e:
+            print(f"Failed to parse {url}: {e}")
+            return None
+
+    def scrape(self, urls):
+        """
+        Scrapes many pages concurrently.
+
+        Returns:
+        - list: The data of each page (None for the pages that failed), in the same order as urls.
+        """
+        return self.fetcher.map(self.scrape_url, urls)
+
@@ -0,0 +1,268 @@
+import os
+import re
+import threading
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+### Compact time-series store of weather observations:
+### - the text records ("24 °C", "13 km/h", "from Northwest", "61%") are converted to numbers once, when stored
+### - each city is one append-only binary file of fixed-size rows (33 bytes per observation), read back as a
+###   memory-mapped NumPy structured array, so months of polling many cities cost disk, not memory
+### - downsampling (hourly/daily min/max/mean) is done with vectorized reductions over fixed, non-overlapping
+###   (tumbling) time buckets
+
+STORE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'web_stuff', 'weather')
+
+# One observation (packed, no padding). Missing values are NaN, or MISSING_HUMIDITY for the humidity.
+OBSERVATION_DTYPE = np.dtype([
+    ('time', '<i8'),  # Unix seconds (UTC)
+    ('temperature', '<f4'),  # °C
+    ('feels_like', '<f4'),  # °C
+    ('forecast_high', '<f4'),  # °C
+    ('forecast_low', '<f4'),  # °C
+    ('wind_speed', '<f4'),  # km/h
+    ('wind_direction', '<f4'),  # Degrees the wind blows from (0 = North, 90 = East)
+    ('humidity', 'u1'),  # %
+])
+MISSING_HUMIDITY = 255
+
+FREQUENCIES = {'hourly': 3600, 'daily': 24 * 3600}
+AGGREGATED_COLUMNS = ['temperature', 'feels_like', 'wind_speed', 'humidity']
+
+# The 16 compass points, 22.5 degrees apart
+COMPASS_POINTS = [
+    'North', 'North-northeast', 'Northeast', 'East-northeast', 'East', 'East-southeast', 'Southeast',
+    'South-southeast', 'South', 'South-southwest', 'Southwest', 'West-southwest', 'West', 'West-northwest',
+    'Northwest', 'North-northwest',
+]
+COMPASS_DEGREES = {name.lower(): i * 22.5 for i, name in enumerate(COMPASS_POINTS)}
+
+NUMBER_RE = re.compile(r'[-−]?\d+(?:\.\d+)?')
+KMH_PER_MPH = 1.609344
+KMH_PER_MS = 3.6
+
+
+############# Text -> numbers
+
+def _numbers(text):
+    if not isinstance(text, str):
+        return []
+    return [float(number.replace('−', '-')) for number in NUMBER_RE.findall(text)]
+
+
+def _to_celsius(value, text):
+    return (value - 32) / 1.8 if '°F' in text else value
+
+
+def parse_temperature(text):
+    """
+    "24 °C" -> 24.0, "75 °F" -> 23.9 (stored in °C), "N/A" -> NaN.
+    """
+    numbers = _numbers(text)
+    return _to_celsius(numbers[0], text) if numbers else np.nan
+
+
+def parse_forecast(text):
+    """
+    "31 / 22 °C" -> (31.0, 22.0), NaNs when missing.
+    """
+    numbers = _numbers(text)
+    if len(numbers) < 2:
+        return np.nan, np.nan
+    return _to_celsius(numbers[0], text), _to_celsius(numbers[1], text)
+
+
+def parse_wind_speed(text):
+    """
+    "13 km/h" -> 13.0, "8 mph" -> 12.9 and "5 m/s" -> 18.0 (stored in km/h), "No wind" -> 0.0, "N/A" -> NaN.
+    """
+    if isinstance(text, str) and text.strip().lower().startswith('no'):
+        return 0.0
+    numbers = _numbers(text)
+    if not numbers:
+        return np.nan
+    if 'mph' in text:
+        return numbers[0] * KMH_PER_MPH
+    if 'm/s' in text:
+        return numbers[0] * KMH_PER_MS
+    return numbers[0]
+
+
+def parse_wind_direction(text):
+    """
+    "from Northwest" -> 315.0, "from North-northeast" -> 22.5, unknown -> NaN.
+    """
+    if not isinstance(text, str):
+        return np.nan
+    name = text.strip()
+    if name.lower().startswith('from '):
+        name = name[5:]
+    return COMPASS_DEGREES.get(name.strip().lower(), np.nan)
+
+
+def parse_humidity(text):
+    """
+    "61%" -> 61, missing -> MISSING_HUMIDITY.
+    """
+    numbers = _numbers(text)
+    if not numbers or not 0 <= numbers[0] <= 100:
+        return MISSING_HUMIDITY
+    return int(round(numbers[0]))
+
+
+def _timestamp(observed_at):
+    # ISO string (as the poller writes it), datetime or Unix seconds
+    if isinstance(observed_at, str):
+        observed_at = datetime.fromisoformat(observed_at)
+    if isinstance(observed_at, datetime):
+        return int(observed_at.timestamp())
+    return int(observed_at)
+
+
+def to_observations(records):
+    """
+    Converts weather records (dicts with observed_at and the text fields of parse_weather_page) to
+    a structured array of OBSERVATION_DTYPE.
+    """
+    observations = np.zeros(len(records), dtype=OBSERVATION_DTYPE)
+    for i, record in enumerate(records):
+        forecast_high, forecast_low = parse_forecast(record.get('forecast'))
+        observations[i] = (
+            _timestamp(record['observed_at']),
+            parse_temperature(record.get('temperature')),
+            parse_temperature(record.get('feels_like')),
+            forecast_high,
+            forecast_low,
+            parse_wind_speed(record.get('wind_speed')),
+            parse_wind_direction(record.get('wind_direction')),
+            parse_humidity(record.get('humidity')),
+        )
+    return observations
+
+
+############# Store
+
+def _city_file(city):
+    # 'israel/tel-aviv' -> 'israel__tel-aviv.obs'
+    return city.strip('/').replace('/', '__') + '.obs'
+
+
+class ObservationStore:
+    """
+    Append-only store of numeric weather observations, one binary file per city.
+
+    Args:
+    - root (str): Directory of the city files.
+    """
+
+    def __init__(self, root=STORE_DIR):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+        self._lock = threading.Lock()
+
+    def _path(self, city):
+        return os.path.join(self.root, _city_file(city))
+
+    def append(self, records):
+        """
+        Stores weather records (as returned by WeatherPoller.poll_once, each with its city and observed_at).
+        Records of a city have to be appended in time order.
+        """
+        by_city = {}
+        for record in records:
+            by_city.setdefault(record['city'], []).append(record)
+        with self._lock:
+            for city, city_records in by_city.items():
+                with open(self._path(city), 'ab') as f:
+                    to_observations(city_records).tofile(f)
+
+    def cities(self):
+        names = [name for name in os.listdir(self.root) if name.endswith('.obs')]
+        return sorted(name[:-len('.obs')].replace('__', '/') for name in names)
+
+    def load(self, city, start=None, end=None):
+        """
+        Returns the observations of a city as a read-only memory-mapped structured array (OBSERVATION_DTYPE).
+
+        Args:
+        - city (str): The city slug.
+        - start, end (datetime or Unix seconds, optional): Keep the observations with start <= time < end.
+        """
+        path = self._path(city)
+        if not os.path.exists(path) or os.path.getsize(path) < OBSERVATION_DTYPE.itemsize:
+            return np.zeros(0, dtype=OBSERVATION_DTYPE)
+        n_rows = os.path.getsize(path) // OBSERVATION_DTYPE.itemsize  # A row being written is left out
+        observations = np.memmap(path, dtype=OBSERVATION_DTYPE, mode='r', shape=(n_rows,))
+
+        # Rows are in time order, the range is found with a binary search
+        times = observations['time']
+        first = 0 if start is None else np.searchsorted(times, _timestamp(start), side='left')
+        last = n_rows if end is None else np.searchsorted(times, _timestamp(end), side='left')
+        return observations[first:last]
+
+    def to_frame(self, city, start=None, end=None):
+        """
+        Returns the observations of a city as a DataFrame indexed by time (UTC), missing humidity as <NA>.
+        """
+        observations = self.load(city, start, end)
+        df = pd.DataFrame({name: observations[name] for name in OBSERVATION_DTYPE.names if name != 'time'},
+                          index=pd.to_datetime(observations['time'], unit='s', utc=True).rename('time'))
+        df['humidity'] = pd.array(observations['humidity'], dtype='UInt8')
+        df.loc[observations['humidity'] == MISSING_HUMIDITY, 'humidity'] = pd.NA
+        return df
+
+    def downsample(self, city, freq='hourly', start=None, end=None):
+        """
+        Aggregates the observations of a city per time bucket. The buckets are tumbling windows: fixed and
+        non-overlapping, aligned on multiples of the bucket size since the Unix epoch (whole UTC hours and days),
+        each observation counted in exactly one bucket. Buckets without observations are left out.
+
+        Args:
+        - city (str): The city slug.
+        - freq (str or int): 'hourly', 'daily' or the bucket size in seconds.
+        - start, end (datetime or Unix seconds, optional): Time range of the observations.
+
+        Returns:
+        - pd.DataFrame: One row per bucket (indexed by the bucket start) with the count of observations,
+          <column>_min, <column>_max and <column>_mean for temperature, feels_like, wind_speed and humidity
+          (missing values ignored), and wind_direction_mean (the circular mean of the directions).
+        """
+        return downsample(self.load(city, start, end), freq)
+
+
+def downsample(observations, freq='hourly'):
+    """
+    Vectorized min/max/mean of a structured array of observations (OBSERVATION_DTYPE, in time order)
+    per tumbling time bucket (not a rolling window), see ObservationStore.downsample.
+    """
+    seconds = FREQUENCIES.get(freq, freq)
+    buckets = observations['time'] // seconds
+    starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]]) if len(buckets) else np.zeros(0, dtype=int)
+    index = pd.to_datetime(buckets[starts] * seconds, unit='s', utc=True).rename('time')
+    result = {'count': np.diff(np.r_[starts, len(buckets)])}
+    if not len(starts):
+        columns = [f'{column}_{stat}' for column in AGGREGATED_COLUMNS for stat in ('min', 'max', 'mean')]
+        return pd.DataFrame(result, index=index, columns=['count'] + columns + ['wind_direction_mean'])
+
+    for column in AGGREGATED_COLUMNS:
+        values = observations[column].astype(np.float64)
+        if column == 'humidity':
+            values[observations[column] == MISSING_HUMIDITY] = np.nan
+        present = ~np.isnan(values)
+        counts = np.add.reduceat(present, starts)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            # fmin/fmax skip NaNs (a bucket with no value at all stays NaN)
+            result[f'{column}_min'] = np.fmin.reduceat(values, starts)
+            result[f'{column}_max'] = np.fmax.reduceat(values, starts)
+            result[f'{column}_mean'] = np.add.reduceat(np.where(present, values, 0), starts) / counts
+
+    # Directions are averaged as unit vectors, so 350° and 10° average to 0° and not 180°
+    radians = np.deg2rad(observations['wind_direction'].astype(np.float64))
+    present = ~np.isnan(radians)
+    sin_sum = np.add.reduceat(np.where(present, np.sin(radians), 0), starts)
+    cos_sum = np.add.reduceat(np.where(present, np.cos(radians), 0), starts)
+    direction = np.rad2deg(np.arctan2(sin_sum, cos_sum)) % 360
+    result['wind_direction_mean'] = np.where(np.add.reduceat(present, starts) > 0, direction, np.nan)
+    return pd.DataFrame(result, index=index)
@@ -1,20 +1,32 @@
-import requests
-from bs4 import BeautifulSoup
+from datetime import datetime, timezone
 
+from scraping import http_cache
+from scraping.scraper import fetch_html
+from weather import weather_page_parser
 
-# Function to fetch the HTML content of the page
-def fetch_weather_page(url):
-    # Send a GET request to the specified URL
-    response = requests.get(url)
+# Current conditions change quickly, so cached pages are only reused for a few minutes
+WEATHER_CACHE_TTL = 10 * 60
+
+WEATHER_BASE_URL = 'https://www.timeanddate.com/weather/'
+
+# Fields of a weather record (besides the city and the time it was fetched)
+WEATHER_FIELDS = weather_page_parser.FIELDS
+
+
+def get_city_url(city):
+    # city is the timeanddate.com slug, e.g. 'israel/tel-aviv'
+    return WEATHER_BASE_URL + city.strip('/')
 
-    # If the request was successful (status code 200)
-    if response.status_code == 200:
-        # Parse the HTML content using BeautifulSoup and return it
-        return BeautifulSoup(response.text, 'html.parser')
-    else:
-        # Print an error message if the request failed
-        print(f"Failed to retrieve data. Status code: {response.status_code}")
-        return None
+
+def get_city_from_url(url):
+    # Inverse of get_city_url (the last part of the path for URLs outside WEATHER_BASE_URL)
+    return url[len(WEATHER_BASE_URL):] if url.startswith(WEATHER_BASE_URL) else url.rstrip('/').split('/')[-1]
+
+
+# Function to fetch the HTML content of the page
+def fetch_weather_html(url, ttl=WEATHER_CACHE_TTL):
+    # Send a GET request to the specified URL (None if the request failed)
+    return fetch_html(url, ttl=ttl)
 
 
 # Function to extract the temperature
@@ -71,14 +83,15 @@ def extract_forecast(soup):
 # Function to extract wind speed and direction
 def extract_wind_info(soup):
     # Search for the text "Wind:" in the HTML and get its parent element
-    wind_section = soup.find(string=lambda x: "Wind:" in x).parent
+    wind_text = soup.find(string=lambda x: "Wind:" in x)
+    wind_section = wind_text.parent if wind_text else None
 
     # If the wind section is found, split the text to separate wind speed from direction
     if wind_section:
         wind_info = wind_section.text.split("Wind:")[1].strip()
 
-        # Extract the wind speed (e.g., "24 km/h")
-        wind_speed = wind_info.split(" ")[0] + " km/h"
+        # Extract the wind speed with the unit shown on the page (e.g., "24 km/h", "15 mph")
+        wind_speed = " ".join(wind_info.split(" ")[:2])
 
         # Extract the wind direction (e.g., "from Northwest")
         wind_direction = " ".join(wind_info.split(" ")[3:]).strip()
@@ -90,35 +103,46 @@ def extract_wind_info(soup):
     return "N/A", "N/A"
 
 
-# Main function to extract all weather data and print it
-def extract_weather_data(url):
-    # Fetch the parsed HTML content of the weather page
-    soup = fetch_weather_page(url)
-
-    # If the page was successfully fetched and parsed
-    if soup:
-        # Extract temperature, weather description, humidity, feels like temperature, forecast, and wind info
-        temperature = extract_temperature(soup)
-        weather_desc = extract_weather_description(soup)
-        humidity = extract_humidity(soup)
-        feels_like = extract_feels_like(soup)
-        forecast = extract_forecast(soup)
-        wind_speed, wind_direction = extract_wind_info(soup)
-
-        # Print all extracted weather data
-        print(f"Current weather in {url.split('/')[-1]}")
-        print(f"Temperature: {temperature}")
-        print(f"Weather: {weather_desc}")
-        print(f"Feels Like: {feels_like}")
-        print(f"Forecast: {forecast}")
-        print(f"Wind Speed: {wind_speed}")
-        print(f"Wind Direction: {wind_direction}")
-        print(f"Humidity: {humidity}")
-
-
-# URL of the weather page  for Tel Aviv
-url = 'https://www.timeanddate.com/weather/israel/tel-aviv'
-url = 'https://www.timeanddate.com/weather/israel/petah-tikva'
-
-# Call the main function to extract and print weather data
-extract_weather_data(url)
+# Parses a weather page once into a record (a page revalidated with a 304 is not parsed again).
+# All the fields are collected in one walk over the document (see weather_page_parser), the extract_*
+# functions above are the one-search-per-field reference it is checked against.
+@http_cache.memoize_parse
+def parse_weather_page(html_content, backend=weather_page_parser.DEFAULT_BACKEND):
+    return weather_page_parser.parse_weather(html_content, backend=backend)
+
+
+def print_weather_record(city, record):
+    # Print all extracted weather data
+    print(f"Current weather in {city.split('/')[-1]}")
+    print(f"Temperature: {record['temperature']}")
+    print(f"Weather: {record['description']}")
+    print(f"Feels Like: {record['feels_like']}")
+    print(f"Forecast: {record['forecast']}")
+    print(f"Wind Speed: {record['wind_speed']}")
+    print(f"Wind Direction: {record['wind_direction']}")
+    print(f"Humidity: {record['humidity']}")
+
+
+# Main function to extract all weather data and print it (and keep it in store, e.g. an ObservationStore)
+def extract_weather_data(url, store=None):
+    # Fetch the HTML content of the weather page
+    html_content = fetch_weather_html(url)
+
+    # If the page was successfully fetched, parse it into a record
+    if html_content:
+        record = parse_weather_page(html_content)
+        print_weather_record(url, record)
+        if store is not None:
+            store.append([dict(record, city=get_city_from_url(url), observed_at=datetime.now(timezone.utc))])
+        return record
+    return None
+
+
+if __name__ == "__main__":
+    # URLs of the weather pages for Tel Aviv and Petah Tikva
+    urls = [get_city_url('israel/tel-aviv'), get_city_url('israel/petah-tikva')]
+
+    # Call the main function to extract and print weather data
+    for url in urls:
+        extract_weather_data(url)
+    http_cache.print_stats()
@@ -0,0 +1,178 @@
+from bs4 import BeautifulSoup, Tag
+
+from scraping.extract import DEFAULT_BACKEND, Field, HTMLParser, Spec, get_backend, has_class, lxml_html
+
+
+### Single-pass extractor for timeanddate.com weather pages.
+### One walk over the document in order collects the temperature (first div.h2), the description (first p),
+### "Feels Like" and "Wind:" (text of the quick look paragraph), the forecast (span with the forecast title)
+### and the humidity (the cell after the "Humidity" header) together, and stops once every field is found,
+### instead of one full-tree search per field. Fields that are not on the page are "N/A".
+
+TEMPERATURE_CLASS = 'h2'
+FORECAST_TITLE = "High and low forecasted temperature today"
+FEELS_LIKE_LABEL = "Feels Like"
+WIND_LABEL = "Wind:"
+HUMIDITY_LABEL = "Humidity"
+MISSING = "N/A"
+
+FIELDS = ['temperature', 'description', 'feels_like', 'forecast', 'wind_speed', 'wind_direction', 'humidity']
+
+
+class _WeatherCollector:
+    # Receives the elements of interest in document order, the first match of each field wins
+    def __init__(self):
+        self.fields = {}
+
+    def done(self):
+        return len(self.fields) == len(FIELDS)
+
+    def _set(self, field, value):
+        self.fields.setdefault(field, value)
+
+    def temperature(self, text):
+        self._set('temperature', text.strip())
+
+    def paragraph(self, own_texts, full_text):
+        # own_texts: the text nodes directly in the p, full_text: the whole text of the p
+        self._set('description', full_text.strip())
+        for text in own_texts:
+            if FEELS_LIKE_LABEL in text and 'feels_like' not in self.fields:
+                self._set('feels_like', text.split(":")[1].strip())
+            if WIND_LABEL in text and 'wind_speed' not in self.fields:
+                # "Wind: 24 km/h ↑ from Northwest" -> "24 km/h", "from Northwest" (the unit as shown, km/h or mph)
+                words = full_text.split(WIND_LABEL)[1].strip().split(" ")
+                self._set('wind_speed', " ".join(words[:2]))
+                self._set('wind_direction', " ".join(words[3:]).strip())
+
+    def forecast(self, text):
+        self._set('forecast', text.replace("Forecast:", "").strip())
+
+    def humidity(self, text):
+        self._set('humidity', text.strip())
+
+    def record(self):
+        return {field: self.fields.get(field, MISSING) for field in FIELDS}
+
+
+############# BeautifulSoup
+
+def _bs4_weather(html_content):
+    soup = BeautifulSoup(html_content, 'html.parser')
+    collector = _WeatherCollector()
+    for element in soup.descendants:
+        if not isinstance(element, Tag):
+            continue
+        if element.name == 'div' and TEMPERATURE_CLASS in (element.get('class') or []):
+            collector.temperature(element.text)
+        elif element.name == 'p':
+            collector.paragraph(element.find_all(string=True, recursive=False), element.text)
+        elif element.name == 'span' and element.get('title') == FORECAST_TITLE:
+            collector.forecast(element.text)
+        elif element.name == 'th' and HUMIDITY_LABEL in element.text and 'humidity' not in collector.fields:
+            value_tag = element.find_next_sibling()
+            if value_tag:
+                collector.humidity(value_tag.text)
+        if collector.done():
+            break
+    return collector.record()
+
+
+############# lxml
+
+def _lxml_weather(html_content):
+    root = lxml_html.fromstring(html_content)
+    collector = _WeatherCollector()
+    for element in root.iter('div', 'p', 'span', 'th'):
+        if element.tag == 'div':
+            if TEMPERATURE_CLASS in (element.get('class') or '').split():
+                collector.temperature(element.text_content())
+        elif element.tag == 'p':
+            own_texts = [element.text or ''] + [child.tail for child in element if child.tail]
+            collector.paragraph(own_texts, element.text_content())
+        elif element.tag == 'span':
+            if element.get('title') == FORECAST_TITLE:
+                collector.forecast(element.text_content())
+        elif HUMIDITY_LABEL in element.text_content() and 'humidity' not in collector.fields:
+            value_tag = element.getnext()
+            if value_tag is not None:
+                collector.humidity(value_tag.text_content())
+        if collector.done():
+            break
+    return collector.record()
+
+
+############# selectolax (lexbor): one selector list, matches come back in document order
+
+def _selectolax_weather(html_content):
+    tree = HTMLParser(html_content)
+    collector = _WeatherCollector()
+    for node in tree.css(f'div.{TEMPERATURE_CLASS}, p, span[title], th'):
+        if node.tag == 'div':
+            collector.temperature(node.text(deep=True))
+        elif node.tag == 'p':
+            own_texts = [child.text_content for child in node.iter(include_text=True)
+                         if child.tag == '-text' and child.text_content]
+            collector.paragraph(own_texts, node.text(deep=True))
+        elif node.tag == 'span':
+            if node.attributes.get('title') == FORECAST_TITLE:
+                collector.forecast(node.text(deep=True))
+        elif HUMIDITY_LABEL in node.text(deep=True) and 'humidity' not in collector.fields:
+            value_tag = node.next
+            while value_tag is not None and value_tag.tag == '-text':
+                value_tag = value_tag.next
+            if value_tag is not None:
+                collector.humidity(value_tag.text(deep=True))
+        if collector.done():
+            break
+    return collector.record()
+
+
+############# Declarative spec (scraping.extract): the same fields as XPaths
+
+def _wind_words(text):
+    # "Wind: 24 km/h ↑ from Northwest" -> ['24', 'km/h', '↑', 'from', 'Northwest']
+    return text.split(WIND_LABEL)[1].strip().split(" ")
+
+
+WEATHER_SPEC = Spec({
+    'temperature': Field(f"(//div[{has_class(TEMPERATURE_CLASS)}])[1]", default=MISSING),
+    'description': Field("(//p)[1]", default=MISSING),
+    'feels_like': Field(f"(//p/text()[contains(., '{FEELS_LIKE_LABEL}')])[1]",
+                        type=lambda text: text.split(":")[1].strip(), default=MISSING),
+    'forecast': Field(f"(//span[@title='{FORECAST_TITLE}'])[1]",
+                      type=lambda text: text.replace("Forecast:", "").strip(), default=MISSING),
+    'wind_speed': Field(f"(//p[text()[contains(., '{WIND_LABEL}')]])[1]",
+                        type=lambda text: " ".join(_wind_words(text)[:2]), default=MISSING),
+    'wind_direction': Field(f"(//p[text()[contains(., '{WIND_LABEL}')]])[1]",
+                            type=lambda text: " ".join(_wind_words(text)[3:]).strip(), default=MISSING),
+    'humidity': Field(f"(//th[contains(., '{HUMIDITY_LABEL}')])[1]/following-sibling::*[1]", default=MISSING),
+})
+
+
+def _spec_weather(html_content):
+    record = WEATHER_SPEC.extract(html_content)
+    return {field: record[field] for field in FIELDS}
+
+
+_BACKENDS = {
+    'bs4': _bs4_weather,
+    'lxml': _lxml_weather,
+    'selectolax': _selectolax_weather,
+    'spec': _spec_weather,
+}
+
+
+def parse_weather(html_content, backend=DEFAULT_BACKEND):
+    """
+    Extracts the current weather of a timeanddate.com weather page in one pass.
+
+    Args:
+    - html_content (str): The HTML content of the weather page.
+    - backend (str): 'bs4', 'lxml', 'selectolax' or 'spec'.
+
+    Returns:
+    - dict: temperature, description, feels_like, forecast, wind_speed, wind_direction and humidity
+      as shown on the page (e.g. "24 °C", "13 km/h", "from Northwest", "61%"), "N/A" when not found.
+    """
+    return get_backend(_BACKENDS, backend)(html_content)
@@ -0,0 +1,125 @@
+import csv
+import os
+import time
+from datetime import datetime, timezone
+
+from scraping import http_cache
+from scraping.scraper import Scraper
+from weather import time_and_date
+from weather.observation_store import ObservationStore
+
+### Polls the timeanddate.com weather pages of many cities on a schedule:
+### - every round fetches all the cities concurrently (bounded per host) and revalidates the cached pages
+### - each page is parsed once into a record (pages that did not change are not parsed again)
+### - the records of a round are appended to a store: ObservationStore (compact numeric time series per city)
+###   or ObservationLog (the text records as CSV rows)
+
+POLL_INTERVAL = 5 * 60  # Seconds between the starts of two rounds
+MAX_WORKERS = 32  # Pages fetched at the same time
+PER_HOST_LIMIT = 8  # Concurrent requests to timeanddate.com
+LOG_COLUMNS = ['observed_at', 'city'] + time_and_date.WEATHER_FIELDS
+
+
+class ObservationLog:
+    """
+    Append-only CSV log of weather records.
+
+    Args:
+    - path (str): Path of the CSV file (created with a header if it doesn't exist).
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.count = 0  # Records appended by this log
+        new_file = not os.path.exists(path) or os.path.getsize(path) == 0
+        self._file = open(path, 'a', newline='', encoding='utf-8')
+        self._writer = csv.DictWriter(self._file, fieldnames=LOG_COLUMNS, extrasaction='ignore')
+        if new_file:
+            self._writer.writeheader()
+
+    def append(self, records):
+        self._writer.writerows(records)
+        self._file.flush()  # A round is on disk before the next one starts
+        self.count += len(records)
+
+    def close(self):
+        self._file.close()
+
+
+class WeatherPoller:
+    """
+    Fetches the weather of a list of cities every interval seconds and appends the records to a store.
+
+    Args:
+    - cities (list of str): timeanddate.com city slugs (e.g. ['israel/tel-aviv', 'usa/new-york']).
+    - store: Object with an append(records) method (ObservationStore or ObservationLog), None to only return
+      the records.
+    - interval (float): Seconds between the starts of two rounds.
+    - max_workers (int): Pages fetched at the same time.
+    - per_host (int): Maximum number of concurrent requests to timeanddate.com.
+    - rate (float, optional): Requests per second allowed to timeanddate.com (None for no rate limit).
+    """
+
+    def __init__(self, cities, store=None, interval=POLL_INTERVAL, max_workers=MAX_WORKERS,
+                 per_host=PER_HOST_LIMIT, rate=None):
+        self.cities = list(dict.fromkeys(cities))  # Each city once, in order
+        self.urls = [time_and_date.get_city_url(city) for city in self.cities]  # The per-host limits key on these
+        self.store = store
+        self.interval = interval
+        # ttl=0: the cached pages are always revalidated, an unchanged page costs a 304 and no parsing
+        self.scraper = Scraper(time_and_date.parse_weather_page, max_workers=max_workers, per_host=per_host,
+                               rate=rate, ttl=0)
+        self.rounds = 0
+        self.failed = []  # Cities that failed in the last round
+
+    def poll_once(self):
+        """
+        Fetches all the cities once and appends their records to the store.
+
+        Returns:
+        - list of dict: The records of the round (cities that failed are left out and listed in self.failed).
+        """
+        results = self.scraper.scrape(self.urls)
+        observed_at = datetime.now(timezone.utc).isoformat(timespec='seconds')
+        records = [dict(result, city=city, observed_at=observed_at)
+                   for city, result in zip(self.cities, results) if result is not None]
+        self.failed = [city for city, result in zip(self.cities, results) if result is None]
+        if self.store is not None and records:
+            self.store.append(records)
+        self.rounds += 1
+        return records
+
+    def run(self, rounds=None):
+        """
+        Polls on a fixed schedule until rounds rounds are done (forever if None).
+        Rounds start every interval seconds; a round that takes longer than the interval skips the missed starts.
+        """
+        next_start = time.monotonic()
+        done = 0
+        while rounds is None or done < rounds:
+            started = time.monotonic()
+            records = self.poll_once()
+            done += 1
+            print(f"Round {self.rounds}: {len(records)}/{len(self.cities)} cities in "
+                  f"{time.monotonic() - started:.1f}s" + (f", failed: {self.failed}" if self.failed else ""))
+            if rounds is not None and done >= rounds:
+                break
+
+            next_start += self.interval
+            now = time.monotonic()
+            if next_start < now:
+                next_start += ((now - next_start) // self.interval + 1) * self.interval
+            time.sleep(next_start - now)
+
+
+if __name__ == "__main__":
+    cities = ['israel/tel-aviv', 'israel/petah-tikva', 'israel/jerusalem', 'israel/haifa']
+    store = ObservationStore()
+    poller = WeatherPoller(cities, store=store, interval=POLL_INTERVAL)
+    poller.run(rounds=3)
+    http_cache.print_stats()
+
+    # Hourly min/max/mean of what was collected so far
+    for city in cities:
+        print(city)
+        print(store.downsample(city, 'hourly').tail())